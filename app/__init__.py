@@ -2,6 +2,8 @@ from flask import Flask
 from dotenv import load_dotenv
 import os
 
+from utils.log import configure_logging
+
 # Load environment variables
 load_dotenv()
 
@@ -11,7 +13,8 @@ def create_app(test_config=None):
     app.config.from_mapping(
         SECRET_KEY=os.environ.get('SECRET_KEY', 'dev'),
         UPLOAD_FOLDER=os.path.join(app.instance_path, 'uploads'),
-        MAX_CONTENT_LENGTH=5 * 1024 * 1024  # Max upload size of 5MB
+        MAX_CONTENT_LENGTH=5 * 1024 * 1024,  # Max upload size of 5MB
+        ADMIN_TOKEN=os.environ.get('ADMIN_TOKEN')  # Bearer token of the /api/data and /api/cache endpoints
     )
 
     if test_config is None:
@@ -28,6 +31,9 @@ def create_app(test_config=None):
     except OSError:
         pass
 
+    # Structured logs through a background queue (levels from LOG_LEVEL / LOG_LEVELS)
+    configure_logging()
+
     # Register blueprints
     from app.routes import main
     app.register_blueprint(main)
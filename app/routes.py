@@ -1,14 +1,77 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, session
+from flask import (
+    Blueprint, render_template, request, jsonify, redirect, url_for, flash, session,
+    Response, stream_with_context, current_app
+)
 from werkzeug.utils import secure_filename
+from functools import wraps
+import hmac
 import os
 from services.internship_service import InternshipService
+from services.resume_jobs import ResumeJobQueue, RESUME_EXTENSIONS
+from utils.metrics import METRICS
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Create blueprint
 main = Blueprint('main', __name__)
 
 # Initialize service
-service = InternshipService(data_dir='data')
+# Parsed resumes are also kept on disk when RESUME_CACHE_DIR is set
+service = InternshipService(data_dir='data', resume_cache_dir=os.environ.get('RESUME_CACHE_DIR'))
+
+# Resume parsing runs in worker processes, off the request threads
+resume_jobs = ResumeJobQueue(service)
+
+# Default number of search results returned per query
+SEARCH_RESULTS_LIMIT = 50
+
+# Largest top_n accepted by the batch recommendation endpoint
+BATCH_TOP_N_LIMIT = 50
+
+# Seconds between the resume progress page's polls of its job
+RESUME_POLL_INTERVAL = 1
+
+# Seconds clients are told to wait before retrying when the resume queue is full
+RESUME_RETRY_AFTER = 5
+
+def _admin_required(view):
+    """
+    Serve an admin endpoint only to requests carrying the configured
+    ADMIN_TOKEN as "Authorization: Bearer <token>". Admin endpoints are
+    disabled (403) while no token is configured.
+    """
+    @wraps(view)
+    def guarded(*args, **kwargs):
+        token = current_app.config.get('ADMIN_TOKEN')
+        if not token:
+            return jsonify({'error': 'Admin endpoints are disabled; set ADMIN_TOKEN to enable them'}), 403
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode('utf-8'), f'Bearer {token}'.encode('utf-8')):
+            return jsonify({'error': 'A valid admin token is required'}), 401
+        return view(*args, **kwargs)
+    return guarded
+
+def _format_recommendation(rec):
+    """JSON-serializable view of a recommendation for the API endpoints"""
+    return {
+        'id': rec['internship'].get('ID', ''),
+        'title': rec['internship'].get('Title', ''),
+        'organization': rec['internship'].get('Organization', ''),
+        'sector': rec['internship'].get('Sector', ''),
+        'location': rec['internship'].get('Location', ''),
+        'duration': rec['internship'].get('Duration', ''),
+        'stipend': rec['internship'].get('Stipend', ''),
+        'description': rec['internship'].get('Description', ''),
+        'skills_required': rec['internship'].get('Skills_Required', ''),
+        'apply_url': rec['internship'].get('Apply_URL', '#'),
+        'score': rec.get('total_score', 0),
+        'reason': rec.get('reason', ''),
+        'missing_skills': rec.get('missing_skills', []),
+        'career_path': rec.get('career_path'),
+        'learning_resources': rec.get('learning_resources', [])
+    }
 
 @main.route('/', methods=['GET'])
 def index():
@@ -46,7 +109,7 @@ def form_submit():
             'education': request.form.get('education')
         }
         
-        print(f"Form data received: sector='{form_data['sector']}', skills={form_data['skills']}, location='{form_data['location']}'")
+        logger.debug("Form data received: sector='%s', skills=%s, location='%s'", form_data['sector'], form_data['skills'], form_data['location'])
         
         # Validate form data
         if not form_data['skills'] and not form_data['sector'] and not form_data['location']:
@@ -82,10 +145,10 @@ def form_submit():
             for rec in recommendations
         ]
         
-        print(f"Form submission processed, {len(recommendations)} recommendations found")
+        logger.debug("Form submission processed, %d recommendations found", len(recommendations))
         return redirect(url_for('main.recommendations'))
     except Exception as e:
-        print(f"Error processing form submission: {e}")
+        logger.exception("Error processing form submission: %s", e)
         flash('An error occurred while processing your preferences. Please try again.', 'error')
         return redirect(url_for('main.index'))
 
@@ -116,63 +179,149 @@ def resume_submit():
         # Validate file type
         if file and allowed_file(file.filename):
             try:
-                # Process the resume
-                resume_data = service.process_resume(file)
-                
-                if not resume_data or not isinstance(resume_data, dict):
-                    flash('Error processing resume. Please try again or fill out the form manually.', 'error')
+                # Parse the resume in the worker processes; the progress page polls the job
+                job = resume_jobs.submit(secure_filename(file.filename), file.read())
+                if job is None:
+                    flash('The resume analyzer is busy. Please try again in a moment.', 'warning')
                     return redirect(url_for('main.index'))
-                
-                # Store resume data in session for later use
-                session['resume_data'] = {
-                    'skills': resume_data.get('skills', []),
-                    'education': resume_data.get('education', ''),
-                    'locations': resume_data.get('locations', [])
-                }
-                
-                # Use integrated recommendation process
-                print(f"Resume data before recommendation: skills={len(resume_data.get('skills', []))}, locations={resume_data.get('locations', [])}")
-                recommendations = service.integrated_recommendation_process(resume_data, input_type='resume')
-                print(f"Recommendations returned: {len(recommendations) if recommendations else 0}")
-                
-                if not recommendations:
-                    print("No recommendations found, redirecting to index with warning")
-                    flash('No matching internships found. Try uploading a different resume or filling out the form.', 'warning')
-                    return redirect(url_for('main.index'))
-                
-                # Format recommendations for the session
-                session['recommendations'] = [
-                    {
-                        'id': rec['internship'].get('ID', ''),
-                        'title': rec['internship'].get('Title', 'Internship'),
-                        'sector': rec['internship'].get('Sector', ''),
-                        'location': rec['internship'].get('Location', ''),
-                        'duration': rec['internship'].get('Duration', ''),
-                        'stipend': rec['internship'].get('Stipend', ''),
-                        'description': rec['internship'].get('Description', ''),
-                        'apply_url': rec['internship'].get('Apply_URL', '#'),
-                        'reason': rec.get('reason', 'This internship matches your profile'),
-                        'missing_skills': rec.get('missing_skills', []),
-                        'learning_resources': rec.get('learning_resources', []),
-                        'career_path': rec.get('career_path', None)
-                    }
-                    for rec in recommendations
-                ]
-                
-                print(f"Resume processed successfully, found {len(recommendations)} recommendations")
-                return redirect(url_for('main.recommendations'))
+                return redirect(url_for('main.resume_progress', job_id=job.id))
             except Exception as e:
-                print(f"Error processing resume: {e}")
+                logger.exception("Error processing resume: %s", e)
                 flash('Error analyzing resume. Please try again or fill out the form manually.', 'error')
                 return redirect(url_for('main.index'))
         
         flash('Invalid file type. Please upload a PDF or DOCX file.', 'error')
         return redirect(url_for('main.index'))
     except Exception as e:
-        print(f"Unexpected error in resume submission: {e}")
+        logger.exception("Unexpected error in resume submission: %s", e)
         flash('An unexpected error occurred. Please try again or contact support.', 'error')
         return redirect(url_for('main.index'))
 
+@main.route('/resume-progress/<job_id>', methods=['GET'])
+def resume_progress(job_id):
+    """
+    Render the page shown while a resume job runs. It polls
+    /resume-jobs/<job_id> and opens /resume-result/<job_id> once the job
+    has finished (or refreshes into it when JavaScript is disabled).
+    """
+    if resume_jobs.get(job_id) is None:
+        flash('Your resume analysis has expired. Please upload your resume again.', 'warning')
+        return redirect(url_for('main.index'))
+    
+    return render_template(
+        'resume_progress.html',
+        status_url=url_for('main.resume_job_status', job_id=job_id),
+        result_url=url_for('main.resume_result', job_id=job_id),
+        poll_interval=RESUME_POLL_INTERVAL
+    )
+
+@main.route('/resume-result/<job_id>', methods=['GET'])
+def resume_result(job_id):
+    """
+    Store the results of a finished resume job in the session and show the
+    recommendations. Unfinished jobs are sent back to the progress page.
+    """
+    try:
+        job = resume_jobs.get(job_id)
+        if job is None:
+            flash('Your resume analysis has expired. Please upload your resume again.', 'warning')
+            return redirect(url_for('main.index'))
+        if not job.finished:
+            return redirect(url_for('main.resume_progress', job_id=job_id))
+        if job.status != 'done':
+            flash('Error processing resume. Please try again or fill out the form manually.', 'error')
+            return redirect(url_for('main.index'))
+        resume_data = job.profile
+        
+        # Store resume data in session for later use
+        session['resume_data'] = {
+            'skills': resume_data.get('skills', []),
+            'education': resume_data.get('education', ''),
+            'locations': resume_data.get('locations', [])
+        }
+        
+        # Recommendations were computed by the job with the integrated recommendation process
+        recommendations = job.recommendations
+        logger.debug("Recommendations returned: %d", len(recommendations) if recommendations else 0)
+        
+        if not recommendations:
+            logger.info("No recommendations found, redirecting to index with warning")
+            flash('No matching internships found. Try uploading a different resume or filling out the form.', 'warning')
+            return redirect(url_for('main.index'))
+        
+        # Format recommendations for the session
+        session['recommendations'] = [
+            {
+                'id': rec['internship'].get('ID', ''),
+                'title': rec['internship'].get('Title', 'Internship'),
+                'sector': rec['internship'].get('Sector', ''),
+                'location': rec['internship'].get('Location', ''),
+                'duration': rec['internship'].get('Duration', ''),
+                'stipend': rec['internship'].get('Stipend', ''),
+                'description': rec['internship'].get('Description', ''),
+                'apply_url': rec['internship'].get('Apply_URL', '#'),
+                'reason': rec.get('reason', 'This internship matches your profile'),
+                'missing_skills': rec.get('missing_skills', []),
+                'learning_resources': rec.get('learning_resources', []),
+                'career_path': rec.get('career_path', None)
+            }
+            for rec in recommendations
+        ]
+        
+        logger.debug("Resume processed successfully, found %d recommendations", len(recommendations))
+        return redirect(url_for('main.recommendations'))
+    except Exception as e:
+        logger.exception("Error processing resume: %s", e)
+        flash('Error analyzing resume. Please try again or fill out the form manually.', 'error')
+        return redirect(url_for('main.index'))
+
+@main.route('/resume-jobs', methods=['POST'])
+def submit_resume_job():
+    """
+    Queue a resume for parsing and recommendation (JSON API).
+    Returns 202 with the job id at once; poll /resume-jobs/<job_id> for the
+    result. Returns 503 with Retry-After when the queue is full.
+    """
+    try:
+        file = request.files.get('resume')
+        if file is None or file.filename == '':
+            return jsonify({'error': 'No resume file provided'}), 400
+        if not file.filename.lower().endswith(RESUME_EXTENSIONS):
+            return jsonify({'error': 'Invalid file type. Please upload a PDF or DOCX file.'}), 400
+        
+        try:
+            top_n = int(request.form.get('top_n', request.args.get('top_n', 5)))
+        except ValueError:
+            return jsonify({'error': 'top_n must be an integer'}), 400
+        top_n = max(1, min(top_n, BATCH_TOP_N_LIMIT))
+        
+        job = resume_jobs.submit(secure_filename(file.filename), file.read(), top_n=top_n)
+        if job is None:
+            response = jsonify({'error': 'Resume queue is full, please retry later', **resume_jobs.stats()})
+            response.headers['Retry-After'] = str(RESUME_RETRY_AFTER)
+            return response, 503
+        
+        response = jsonify({**job.to_dict(), 'status_url': url_for('main.resume_job_status', job_id=job.id)})
+        response.headers['Location'] = url_for('main.resume_job_status', job_id=job.id)
+        return response, 202
+    except Exception as e:
+        logger.exception("Error queuing resume job: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@main.route('/resume-jobs/<job_id>', methods=['GET'])
+def resume_job_status(job_id):
+    """
+    Status of a resume job, with its recommendations once it is done.
+    """
+    job = resume_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    
+    payload = job.to_dict()
+    if job.status == 'done':
+        payload['recommendations'] = [_format_recommendation(rec) for rec in job.recommendations or []]
+    return jsonify(payload)
+
 @main.route('/recommendations', methods=['GET'])
 def recommendations():
     """
@@ -201,12 +350,12 @@ def recommendations():
             flash('Invalid recommendation data. Please try again.', 'warning')
             return redirect(url_for('main.index'))
         
-        print(f"Displaying {len(valid_recommendations)} recommendations")
+        logger.debug("Displaying %d recommendations", len(valid_recommendations))
         
         # Render template with recommendations
         return render_template('recommendations.html', recommendations=valid_recommendations)
     except Exception as e:
-        print(f"Error displaying recommendations: {e}")
+        logger.exception("Error displaying recommendations: %s", e)
         flash('Error displaying recommendations. Please try again.', 'error')
         return redirect(url_for('main.index'))
 
@@ -236,43 +385,81 @@ def recommend():
         if not any([data.get('skills'), data.get('sector'), data.get('location'), data.get('education')]):
             return jsonify({'error': 'Please provide at least one preference (skills, sector, location, or education)'}), 400
         
-        # Get recommendations using the service
-        recommendations = service.get_top_matches(data, top_n=5)
+        # Get recommendations using the service, all from one catalog snapshot
+        snapshot = service.snapshot
+        recommendations = service.get_top_matches(data, top_n=5, snapshot=snapshot)
         
         if not recommendations:
-            return jsonify({'message': 'No matching internships found', 'recommendations': []}), 200
+            return jsonify({
+                'message': 'No matching internships found',
+                'recommendations': [],
+                'catalog_version': snapshot.version
+            }), 200
         
         # Format response
         response_data = {
-            'recommendations': [
-                {
-                    'id': rec['internship'].get('ID', ''),
-                    'title': rec['internship'].get('Title', ''),
-                    'organization': rec['internship'].get('Organization', ''),
-                    'sector': rec['internship'].get('Sector', ''),
-                    'location': rec['internship'].get('Location', ''),
-                    'duration': rec['internship'].get('Duration', ''),
-                    'stipend': rec['internship'].get('Stipend', ''),
-                    'description': rec['internship'].get('Description', ''),
-                    'skills_required': rec['internship'].get('Skills_Required', ''),
-                    'apply_url': rec['internship'].get('Apply_URL', '#'),
-                    'score': rec.get('score', 0),
-                    'reason': rec.get('reason', ''),
-                    'missing_skills': rec.get('missing_skills', []),
-                    'career_path': rec.get('career_path'),
-                    'learning_resources': rec.get('learning_resources', [])
-                }
-                for rec in recommendations
-            ],
-            'total_found': len(recommendations)
+            'recommendations': [_format_recommendation(rec) for rec in recommendations],
+            'total_found': len(recommendations),
+            'catalog_version': snapshot.version
         }
         
         return jsonify(response_data)
         
     except Exception as e:
-        print(f"Error in recommend endpoint: {e}")
+        logger.exception("Error in recommend endpoint: %s", e)
         return jsonify({'error': 'An error occurred while processing your request'}), 500
 
+@main.route('/recommend/batch', methods=['POST'])
+def recommend_batch():
+    """
+    Batch recommendation endpoint for API calls.
+    Accepts {"profiles": [...], "top_n": 5} as JSON, or one profile per line
+    as NDJSON (application/x-ndjson), and streams one JSON line per profile
+    back as NDJSON: {"index", "recommendations"} or {"index", "error"}.
+    The X-Catalog-Version header is the catalog version the batch is scored on.
+    """
+    top_n = request.args.get('top_n', 5, type=int)
+    if request.mimetype == 'application/x-ndjson':
+        # Read the body lazily so large cohorts are never held in memory at once
+        profiles = _iter_ndjson(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            top_n = data.get('top_n', top_n)
+            data = data.get('profiles')
+        if not isinstance(data, list):
+            return jsonify({'error': 'Expected a list of profiles or NDJSON input'}), 400
+        profiles = data
+
+    if isinstance(top_n, bool) or not isinstance(top_n, int) or not 0 < top_n <= BATCH_TOP_N_LIMIT:
+        return jsonify({'error': f'top_n must be between 1 and {BATCH_TOP_N_LIMIT}'}), 400
+
+    snapshot = service.snapshot
+
+    def generate():
+        for result in service.batch_recommend(profiles, top_n=top_n, snapshot=snapshot):
+            if 'recommendations' in result:
+                result = {
+                    'index': result['index'],
+                    'recommendations': [_format_recommendation(rec) for rec in result['recommendations']]
+                }
+            yield json.dumps(result, default=str) + '\n'
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['X-Catalog-Version'] = str(snapshot.version)
+    return response
+
+def _iter_ndjson(stream):
+    """Yield one parsed JSON value per non-empty line, None for lines that are not valid JSON"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
 @main.route('/debug/resume-test', methods=['GET', 'POST'])
 def debug_resume_test():
     """Debug endpoint to test resume processing"""
@@ -306,6 +493,7 @@ def debug_resume_test():
     </form>
     '''
 
+@main.route('/search', methods=['GET', 'POST'])
 def search():
     """
     Search internships by query and filters.
@@ -320,6 +508,10 @@ def search():
             data = request.args.to_dict()
         
         query = data.get('query', '')
+        try:
+            limit = int(data.get('limit', SEARCH_RESULTS_LIMIT))
+        except (TypeError, ValueError):
+            limit = SEARCH_RESULTS_LIMIT
         filters = {
             'sector': data.get('sector', ''),
             'location': data.get('location', ''),
@@ -330,14 +522,16 @@ def search():
         filters = {k: v for k, v in filters.items() if v}
         
         # Search internships
-        results = service.search_internships(query, filters)
+        snapshot = service.snapshot
+        results = service.search_internships(query, filters, top_k=limit, snapshot=snapshot)
         
-        if request.is_json or request.method == 'POST':
+        if request.is_json:
             return jsonify({
                 'results': results,
                 'total_found': len(results),
                 'query': query,
-                'filters': filters
+                'filters': filters,
+                'catalog_version': snapshot.version
             })
         else:
             # Render search results page
@@ -350,7 +544,7 @@ def search():
                                  education=service.get_all_education())
     
     except Exception as e:
-        print(f"Error in search endpoint: {e}")
+        logger.exception("Error in search endpoint: %s", e)
         if request.is_json:
             return jsonify({'error': str(e)}), 500
         else:
@@ -378,7 +572,7 @@ def internship_details(internship_id):
             return render_template('internship_details.html', internship=internship)
     
     except Exception as e:
-        print(f"Error getting internship details: {e}")
+        logger.exception("Error getting internship details: %s", e)
         if request.is_json:
             return jsonify({'error': str(e)}), 500
         else:
@@ -406,7 +600,7 @@ def feedback():
             return redirect(url_for('main.recommendations'))
     
     except Exception as e:
-        print(f"Error handling feedback: {e}")
+        logger.exception("Error handling feedback: %s", e)
         if request.is_json:
             return jsonify({'error': str(e)}), 500
         else:
@@ -414,16 +608,119 @@ def feedback():
             return redirect(url_for('main.recommendations'))
 
 @main.route('/api/data/reload', methods=['POST'])
+@_admin_required
 def reload_data():
     """
-    Reload internship data from CSV files (admin endpoint).
+    Reload every catalog table from the data directory (admin endpoint).
+    The new catalog is built in the background and swapped in atomically
+    once validated; pass ?wait=true to wait until it is published.
+    """
+    try:
+        if request.args.get('wait', '').lower() in ('1', 'true', 'yes'):
+            success = service.load_internship_data()
+            return jsonify({
+                'success': success,
+                'message': 'Data reloaded successfully' if success else 'Failed to reload data',
+                **service.get_catalog_status()
+            })
+        
+        started = service.start_reload()
+        return jsonify({
+            'success': started,
+            'message': 'Reload started' if started else 'A reload is already running',
+            **service.get_catalog_status()
+        }), 202 if started else 409
+    except Exception as e:
+        logger.exception("Error reloading data: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@main.route('/api/data/delta', methods=['POST'])
+@_admin_required
+def apply_data_delta():
+    """
+    Add, update or retire individual postings without a full reload (admin endpoint).
+    Body: {"upserts": [posting, ...], "deletes": [id, ...]}; an upsert is a
+    full posting and replaces the live posting with the same ID.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Expected a JSON object with upserts and/or deletes'}), 400
+        upserts = data.get('upserts') or []
+        deletes = data.get('deletes') or []
+        if not isinstance(upserts, list) or not isinstance(deletes, list):
+            return jsonify({'error': 'upserts and deletes must be lists'}), 400
+
+        summary = service.apply_delta(upserts, deletes)
+        if summary is None:
+            return jsonify({
+                'success': False,
+                'message': 'A catalog update is already running',
+                **service.get_catalog_status()
+            }), 409
+        return jsonify({'success': True, **summary})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.exception("Error applying catalog delta: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@main.route('/api/data/compact', methods=['POST'])
+@_admin_required
+def compact_data():
+    """
+    Rebuild the catalog from its live postings, dropping the rows retired by
+    deltas (admin endpoint). Runs in the background; pass ?wait=true to wait.
     """
     try:
-        success = service.load_internship_data()
+        if request.args.get('wait', '').lower() in ('1', 'true', 'yes'):
+            success = service.compact()
+            return jsonify({
+                'success': success,
+                'message': 'Catalog compacted' if success else 'Failed to compact catalog',
+                **service.get_catalog_status()
+            })
+
+        started = service.start_compaction()
         return jsonify({
-            'success': success,
-            'message': 'Data reloaded successfully' if success else 'Failed to reload data'
-        })
+            'success': started,
+            'message': 'Compaction started' if started else 'A catalog update is already running',
+            **service.get_catalog_status()
+        }), 202 if started else 409
+    except Exception as e:
+        logger.exception("Error compacting catalog: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@main.route('/api/data/status', methods=['GET'])
+@_admin_required
+def data_status():
+    """
+    Version and size of the served catalog, and whether a reload is running (admin endpoint).
+    """
+    try:
+        return jsonify(service.get_catalog_status())
+    except Exception as e:
+        logger.exception("Error getting data status: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@main.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Prometheus metrics: latency quantiles per pipeline stage, postings scored
+    per request, cache hit rates, resume queue depth and catalog version.
+    """
+    samples = service.get_metric_samples()
+    samples.append(('resume_jobs_pending', 'gauge', 'Resume jobs queued or running', resume_jobs.stats()['pending']))
+    return Response(METRICS.render(samples), mimetype='text/plain; version=0.0.4')
+
+@main.route('/api/cache/stats', methods=['GET'])
+@_admin_required
+def cache_stats():
+    """
+    Recommendation cache counters (admin endpoint).
+    """
+    try:
+        return jsonify(service.get_cache_stats())
     except Exception as e:
-        print(f"Error reloading data: {e}")
+        logger.exception("Error getting cache stats: %s", e)
         return jsonify({'error': str(e)}), 500
@@ -0,0 +1,100 @@
+"""
+ANN candidate generation vs. exact full-catalog scoring.
+
+For synthetic catalogs of growing size, compares:
+- exact: CatalogScorer over every posting, then top-k
+- ann: InternshipANNIndex pool of ANN_CANDIDATE_POOL postings, re-ranked by
+  the same CatalogScorer
+
+and reports recall@k (tie-aware: an ANN result counts as a hit when its
+total score reaches the exact k-th best score), index build time, and
+median/p99 latency per query.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ann
+"""
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from models.ann_index import InternshipANNIndex
+from models.recommender import ANN_CANDIDATE_POOL, _top_k_indices
+from models.scoring import CatalogScorer
+
+CATALOG_SIZES = [5000, 20000, 50000, 100000]
+N_QUERIES = 200
+K = 10
+SEED = 0
+
+
+def synthetic_catalog(internships_df, skills, cities, size, rng):
+    """Postings with random skills, sectors, cities and descriptions drawn from the real data"""
+    sectors = internships_df['Sector'].dropna().unique().tolist()
+    descriptions = internships_df['Description'].dropna().tolist()
+    rows = []
+    for i in range(size):
+        posting_skills = rng.sample(skills, rng.randint(2, 6))
+        rows.append({
+            'ID': i + 1,
+            'Title': f'{posting_skills[0]} Intern',
+            'Sector': rng.choice(sectors),
+            'Skills_Required': ', '.join(posting_skills),
+            'Location': rng.choice(cities),
+            'Description': f"{rng.choice(descriptions)} Work with {' and '.join(posting_skills[:2])}.",
+        })
+    return pd.DataFrame(rows)
+
+
+def random_profile(internships_df, skills, cities, rng):
+    return {
+        'skills': rng.sample(skills, rng.randint(1, 5)),
+        'sector': rng.choice(internships_df['Sector'].dropna().unique().tolist()) if rng.random() < 0.5 else '',
+        'location': rng.choice(cities) if rng.random() < 0.5 else '',
+        'full_text': ''
+    }
+
+
+def main():
+    rng = random.Random(SEED)
+    internships_df = pd.read_csv('data/internships.csv')
+    location_df = pd.read_csv('data/locations.csv')
+    skills = pd.read_csv('data/skills.csv')['Skill'].dropna().tolist()
+    cities = location_df['City'].dropna().tolist()
+
+    print(f"{'postings':>9} {'build (s)':>10} {'recall@' + str(K):>10} "
+          f"{'exact p50/p99 (ms)':>19} {'ann p50/p99 (ms)':>17}")
+    for size in CATALOG_SIZES:
+        catalog = synthetic_catalog(internships_df, skills, cities, size, rng)
+        scorer = CatalogScorer(catalog, location_df)
+        start = time.perf_counter()
+        index = InternshipANNIndex(catalog, location_df)
+        build_s = time.perf_counter() - start
+
+        exact_ms, ann_ms, hits = [], [], 0
+        for _ in range(N_QUERIES):
+            profile = random_profile(internships_df, skills, cities, rng)
+
+            start = time.perf_counter()
+            total = scorer.score(profile)['total_score']
+            exact = _top_k_indices(total, K)
+            exact_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            pool = index.search(profile, ANN_CANDIDATE_POOL)
+            pool_total = scorer.score(profile, pool)['total_score']
+            approximate = pool[_top_k_indices(pool_total, K)]
+            ann_ms.append((time.perf_counter() - start) * 1000)
+
+            hits += int(np.sum(total[approximate] >= total[exact[-1]] - 1e-9))
+
+        recall = hits / (N_QUERIES * K)
+        print(f"{size:>9} {build_s:>10.1f} {recall:>10.3f} "
+              f"{np.percentile(exact_ms, 50):>9.2f}/{np.percentile(exact_ms, 99):<9.2f}"
+              f"{np.percentile(ann_ms, 50):>8.2f}/{np.percentile(ann_ms, 99):<8.2f}")
+
+
+if __name__ == '__main__':
+    main()
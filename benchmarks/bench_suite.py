@@ -0,0 +1,264 @@
+"""
+Benchmark suite for the recommender, resume parser and search hot paths.
+
+For synthetic catalogs of each size (see benchmarks.synthetic), times:
+- catalog_load: InternshipService startup on the catalog (one sample)
+- get_recommendations: scoring and ranking of random profiles
+- search_internships: BM25 search of skill and title queries, half filtered by sector
+- recommend_endpoint: POST /recommend through the Flask test client, with
+  the result cache cleared before every request
+
+and, independently of the catalog size:
+- calculate_skill_match / calculate_location_match / calculate_text_similarity
+  on random profile-posting pairs
+- extract_skills / extract_education / extract_location on synthetic
+  resumes of RESUME_PAGES pages (plain text: PDF and DOCX text extraction
+  depends on the optional parser libraries and is not timed)
+
+Each group runs in a fresh worker process, so its peak RSS is its own.
+Every benchmark reports calls, throughput and p50/p95/p99 latency. Catalogs,
+profiles, queries and resumes come from a fixed seed, so two runs on the
+same machine time the same work.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_suite                                   # 1k, 10k and 100k postings
+    python -m benchmarks.bench_suite --sizes 1000 10000 100000 1000000
+    python -m benchmarks.bench_suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_suite --baseline benchmarks/baseline.json
+
+With --baseline, results are compared to a stored run: a benchmark whose
+p50 latency or peak RSS grew, or whose throughput dropped, by more than
+--tolerance is reported as a regression and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Keep the app's request logging out of the timings
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import ResumeWriter, synthetic_internships, write_catalog
+
+CATALOG_SIZES = [1000, 10000, 100000]
+RESUME_PAGES = [1, 2, 5, 10]
+N_QUERIES = 200
+N_PAIRS = 2000
+N_RESUMES = 20
+WARMUP = 5
+SEED = 0
+
+# Relative slowdown (or RSS growth) tolerated before a benchmark counts as a regression
+TOLERANCE = 0.25
+
+
+def summarize(latencies, elapsed):
+    """Calls, throughput (calls/s) and latency percentiles (ms) of one benchmark"""
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'calls': len(latencies),
+        'throughput': len(latencies) / elapsed if elapsed else float('inf'),
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'p99_ms': float(np.percentile(latencies_ms, 99))
+    }
+
+
+def measure(function, inputs):
+    """Call function once per input (after WARMUP untimed calls) and summarize the latencies"""
+    for arguments in inputs[:WARMUP]:
+        function(*arguments)
+    latencies = []
+    start = time.perf_counter()
+    for arguments in inputs:
+        call_start = time.perf_counter()
+        function(*arguments)
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def random_profiles(internships_df, rng, count):
+    """Profiles with real skills, and a sector and location half of the time"""
+    skills = internships_df['Skills_Required'].str.split(', ').explode().unique()
+    sectors = internships_df['Sector'].unique()
+    cities = internships_df['Location'].unique()
+    return [{
+        'skills': rng.choice(skills, size=rng.integers(1, 6), replace=False).tolist(),
+        'sector': str(rng.choice(sectors)) if rng.random() < 0.5 else '',
+        'location': str(rng.choice(cities)) if rng.random() < 0.5 else '',
+        'education': ''
+    } for _ in range(count)]
+
+
+def run_catalog_benchmarks(size, queries, seed):
+    """Benchmarks of one catalog size (in a worker process)"""
+    from app import create_app
+    import app.routes as routes
+    from models.recommender import get_recommendations
+    from services.internship_service import InternshipService
+
+    rng = np.random.default_rng(seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_catalog(data_dir, size, rng)
+
+        start = time.perf_counter()
+        service = InternshipService(data_dir=data_dir)
+        results['catalog_load'] = summarize([time.perf_counter() - start], time.perf_counter() - start)
+        snapshot = service.snapshot
+        profiles = random_profiles(snapshot.internships_df, rng, queries)
+
+        def recommend(profile):
+            get_recommendations(dict(profile), snapshot.internships_df, snapshot.locations_df,
+                                scorer=snapshot.scorer, top_n=5, ann_index=snapshot.ann_index)
+
+        results['get_recommendations'] = measure(recommend, [(profile,) for profile in profiles])
+
+        titles = snapshot.internships_df['Title'].unique()
+        searches = []
+        for profile in profiles:
+            query = ' '.join(profile['skills'][:2]) if rng.random() < 0.5 else str(rng.choice(titles))
+            searches.append((query, {'sector': profile['sector']} if profile['sector'] else None))
+        results['search_internships'] = measure(
+            lambda query, filters: service.search_internships(query, filters, top_k=routes.SEARCH_RESULTS_LIMIT),
+            searches
+        )
+
+        app = create_app({'TESTING': True})
+        routes.service = service
+        client = app.test_client()
+
+        def post_recommend(profile):
+            service.recommendation_cache.clear()
+            response = client.post('/recommend', json=profile)
+            assert response.status_code == 200, response.status_code
+
+        results['recommend_endpoint'] = measure(post_recommend, [(profile,) for profile in profiles])
+    return results, peak_rss_mb()
+
+
+def run_function_benchmarks(pairs, resumes, seed):
+    """Scoring functions and resume extractors (in a worker process)"""
+    from models.recommender import calculate_location_match, calculate_skill_match, calculate_text_similarity
+    from utils.resume_parser import extract_education, extract_location, extract_skills
+
+    rng = np.random.default_rng(seed)
+    postings = synthetic_internships(pairs, rng)
+    profiles = random_profiles(postings, rng, pairs)
+    locations_df = pd.read_csv('data/locations.csv')
+    skills_df = pd.read_csv('data/skills.csv')
+    education_df = pd.read_csv('data/education.csv')
+    writer = ResumeWriter(rng)
+
+    results = {
+        'calculate_skill_match': measure(calculate_skill_match, [
+            (profile['skills'], skills) for profile, skills in zip(profiles, postings['Skills_Required'])
+        ]),
+        'calculate_location_match': measure(calculate_location_match, [
+            (profile['location'], location, locations_df) for profile, location in zip(profiles, postings['Location'])
+        ]),
+        'calculate_text_similarity': measure(calculate_text_similarity, [
+            (' '.join(profile['skills']), description) for profile, description in zip(profiles, postings['Description'])
+        ])
+    }
+    for pages in RESUME_PAGES:
+        texts = [writer.resume(pages) for _ in range(resumes)]
+        results[f'extract_skills@{pages}p'] = measure(extract_skills, [(text, skills_df) for text in texts])
+        results[f'extract_education@{pages}p'] = measure(extract_education, [(text, education_df) for text in texts])
+        results[f'extract_location@{pages}p'] = measure(extract_location, [(text, locations_df) for text in texts])
+    return results, peak_rss_mb()
+
+
+def in_worker(function, *args):
+    """Run a benchmark group in a fresh process, so its peak RSS is measured alone"""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(function, *args).result()
+
+
+def compare(results, baseline, tolerance):
+    """Regressions of results against a baseline run, as printable lines"""
+    regressions = []
+    for name, stats in results['benchmarks'].items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if base is None:
+            continue
+        if stats['p50_ms'] > base['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {base['p50_ms']:.3f} -> {stats['p50_ms']:.3f} ms")
+        if stats['throughput'] < base['throughput'] / (1 + tolerance):
+            regressions.append(f"{name}: throughput {base['throughput']:.1f} -> {stats['throughput']:.1f}/s")
+    for group, rss in results['peak_rss_mb'].items():
+        base = baseline.get('peak_rss_mb', {}).get(group)
+        if base is not None and rss > base * (1 + tolerance):
+            regressions.append(f"{group}: peak RSS {base:.0f} -> {rss:.0f} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the recommender, resume parser and search hot paths.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=CATALOG_SIZES, help='Catalog sizes (postings)')
+    parser.add_argument('--queries', type=int, default=N_QUERIES, help='Profiles / queries per catalog benchmark')
+    parser.add_argument('--pairs', type=int, default=N_PAIRS, help='Profile-posting pairs per scoring function')
+    parser.add_argument('--resumes', type=int, default=N_RESUMES, help='Resumes per page count')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--save-baseline', metavar='PATH', help='Write the results as the baseline to compare later runs to')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare the results to this baseline JSON')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='Relative change tolerated before flagging')
+    args = parser.parse_args(argv)
+
+    if min(args.sizes + [args.queries, args.pairs, args.resumes]) <= 0:
+        parser.error('--sizes, --queries, --pairs and --resumes must be positive')
+
+    results = {
+        'python': platform.python_version(),
+        'machine': f'{platform.machine()} {os.cpu_count()} CPUs',
+        'seed': SEED,
+        'benchmarks': {},
+        'peak_rss_mb': {}
+    }
+    groups = [('functions', run_function_benchmarks, (args.pairs, args.resumes, SEED))]
+    groups += [(f'catalog@{size}', run_catalog_benchmarks, (size, args.queries, SEED)) for size in args.sizes]
+
+    print(f"{'benchmark':<34} {'calls':>6} {'calls/s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    for group, function, group_args in groups:
+        benchmarks, rss = in_worker(function, *group_args)
+        suffix = group.partition('@')[2]
+        for name, stats in benchmarks.items():
+            key = f'{name}@{suffix}' if suffix else name
+            results['benchmarks'][key] = stats
+            print(f"{key:<34} {stats['calls']:>6} {stats['throughput']:>10.1f} "
+                  f"{stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f}")
+        results['peak_rss_mb'][group] = rss
+        print(f"{group + ' peak RSS':<34} {rss:>6.0f} MB")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s) against {args.baseline} (tolerance {args.tolerance:.0%})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+TF-IDF ranking cost per request: refitting the vectorizer on every request
+(the previous recommend_jobs_tfidf approach) vs. the precomputed TfidfEngine,
+which only transforms the candidate text and does one sparse product.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tfidf
+"""
+import time
+
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from models.tfidf_engine import TfidfEngine, VECTORIZER_PARAMS, catalog_documents, profile_text
+
+# Catalog sizes, as multiples of data/internships.csv
+SCALES = [1, 10, 100, 400]
+
+PROFILES = [
+    {'skills': ['Python', 'SQL', 'Machine Learning'], 'sector': 'Information Technology', 'location': 'Bengaluru'},
+    {'skills': 'Graphic Design, Photoshop, Illustrator', 'education': 'B.Des'},
+    {'skills': ['Marketing'], 'full_text': 'Social media campaigns, content writing and market research'},
+]
+
+
+def scaled_catalog(internships_df, scale):
+    """Replicate the catalog, tagging each copy so the vocabulary grows with it"""
+    copies = []
+    for copy in range(scale):
+        df = internships_df.copy()
+        df['Description'] = df['Description'] + f' batch{copy} region{copy % 37}'
+        copies.append(df)
+    return pd.concat(copies, ignore_index=True)
+
+
+def per_request_ms(function, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        function(PROFILES[i % len(PROFILES)])
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    internships_df = pd.read_csv('data/internships.csv')
+    print(f"{'postings':>9} {'fit once (ms)':>14} {'refit/request (ms)':>19} {'engine/request (ms)':>20}")
+    for scale in SCALES:
+        catalog = scaled_catalog(internships_df, scale)
+        documents = catalog_documents(catalog)
+
+        start = time.perf_counter()
+        engine = TfidfEngine(catalog)
+        fit_ms = (time.perf_counter() - start) * 1000
+
+        def refit(profile):
+            matrix = TfidfVectorizer(**VECTORIZER_PARAMS).fit_transform([profile_text(profile)] + documents)
+            return (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+        refit_ms = per_request_ms(refit, repeat=3)
+        engine_ms = per_request_ms(engine.score, repeat=50)
+        print(f"{len(catalog):>9} {fit_ms:>14.1f} {refit_ms:>19.2f} {engine_ms:>20.3f}")
+
+
+if __name__ == '__main__':
+    main()
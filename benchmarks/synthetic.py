@@ -0,0 +1,161 @@
+"""
+Synthetic catalogs and resumes for the benchmarks.
+
+synthetic_internships scales data/internships.csv to any number of
+postings while keeping the shape of the real data: sectors occur as often
+as in the catalog, and each posting draws 2-6 skills from its sector's pool
+(the skills table category plus the skills of real postings of the sector)
+with Zipf weights, so a few skills are everywhere and most are rare.
+Locations favour the cities of real postings. write_catalog writes such a
+catalog next to copies of the other tables, as a data directory
+InternshipService can load.
+
+ResumeWriter.resume writes plain resume text of a given number of pages,
+mentioning skills, degrees and cities in prose among filler words taken
+from the real descriptions.
+"""
+import os
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from services.catalog_store import CATALOG_TABLES
+
+# Skill popularity within a sector's pool: weight of the r-th skill is 1 / r**SKILL_ZIPF_EXPONENT
+SKILL_ZIPF_EXPONENT = 1.1
+
+# Real posting cities are this many times likelier than the other cities
+POSTING_CITY_WEIGHT = 20
+
+# Postings generated at a time (bounds the memory of the skill draw)
+GENERATION_CHUNK = 50000
+
+# Words per resume page
+WORDS_PER_PAGE = 450
+
+
+def _skill_pools(internships_df, skills_df):
+    """Sector -> (skills, Zipf weights), most popular first"""
+    by_category = skills_df.groupby('Category')['Skill'].apply(list).to_dict()
+    all_skills = skills_df['Skill'].dropna().tolist()
+    pools = {}
+    for sector, postings in internships_df.groupby('Sector'):
+        posting_skills = [skill.strip() for skills in postings['Skills_Required'].dropna() for skill in skills.split(',')]
+        pool = list(dict.fromkeys(posting_skills + by_category.get(sector, all_skills)))
+        # The real postings' skills stay the most popular ones
+        ranks = np.arange(1, len(pool) + 1)
+        pools[sector] = (np.array(pool, dtype=object), 1.0 / ranks ** SKILL_ZIPF_EXPONENT)
+    return pools
+
+
+def synthetic_internships(size, rng, data_dir='data'):
+    """
+    A catalog of `size` postings shaped like data/internships.csv.
+
+    Args:
+        size (int): Number of postings
+        rng (numpy.random.Generator): Source of randomness (seed it for reproducible catalogs)
+        data_dir (str): Directory of the real catalog tables
+
+    Returns:
+        DataFrame: Postings with the columns of internships.csv
+    """
+    internships_df = pd.read_csv(os.path.join(data_dir, 'internships.csv'))
+    skills_df = pd.read_csv(os.path.join(data_dir, 'skills.csv'))
+    cities = pd.read_csv(os.path.join(data_dir, 'locations.csv'))['City'].dropna().unique()
+
+    sector_counts = internships_df['Sector'].value_counts()
+    sectors = sector_counts.index.to_numpy(dtype=object)
+    sector_weights = sector_counts.to_numpy() / sector_counts.sum()
+    pools = _skill_pools(internships_df, skills_df)
+    titles = internships_df.groupby('Sector')['Title'].apply(lambda t: np.array(t, dtype=object)).to_dict()
+    descriptions = internships_df.groupby('Sector')['Description'].apply(lambda d: np.array(d, dtype=object)).to_dict()
+    posting_cities = set(internships_df['Location'].dropna())
+    city_weights = np.array([POSTING_CITY_WEIGHT if city in posting_cities else 1 for city in cities], dtype=float)
+    city_weights /= city_weights.sum()
+
+    chunks = []
+    for start in range(0, size, GENERATION_CHUNK):
+        n = min(GENERATION_CHUNK, size - start)
+        chunk_sectors = rng.choice(sectors, size=n, p=sector_weights)
+        counts = rng.integers(2, 7, size=n)
+        skills = np.empty(n, dtype=object)
+        title = np.empty(n, dtype=object)
+        description = np.empty(n, dtype=object)
+        for sector in np.unique(chunk_sectors):
+            rows = np.flatnonzero(chunk_sectors == sector)
+            pool, weights = pools[sector]
+            # Weighted sampling without replacement: top keys of log(weight) + Gumbel noise
+            keys = np.log(weights) + rng.gumbel(size=(len(rows), len(pool)))
+            drawn = np.argsort(-keys, axis=1)[:, :6]
+            for row, picks, count in zip(rows, drawn, counts[rows]):
+                skills[row] = ', '.join(pool[picks[:count]])
+            title[rows] = rng.choice(titles[sector], size=len(rows))
+            description[rows] = rng.choice(descriptions[sector], size=len(rows))
+        ids = np.arange(start + 1, start + n + 1)
+        chunks.append(pd.DataFrame({
+            'ID': ids,
+            'Title': title,
+            'Sector': chunk_sectors,
+            'Skills_Required': skills,
+            'Location': rng.choice(cities, size=n, p=city_weights),
+            'Duration': rng.choice(internships_df['Duration'].unique(), size=n),
+            'Stipend': rng.choice(internships_df['Stipend'].unique(), size=n),
+            'Description': description,
+            'Apply_URL': [f'https://example.com/apply/{i}' for i in ids]
+        }))
+    return pd.concat(chunks, ignore_index=True)
+
+
+def write_catalog(target_dir, size, rng, data_dir='data'):
+    """Write a synthetic internships.csv of `size` postings and copies of the other tables to target_dir"""
+    os.makedirs(target_dir, exist_ok=True)
+    for name in CATALOG_TABLES:
+        if name != 'internships':
+            shutil.copy(os.path.join(data_dir, f'{name}.csv'), os.path.join(target_dir, f'{name}.csv'))
+    synthetic_internships(size, rng, data_dir).to_csv(os.path.join(target_dir, 'internships.csv'), index=False)
+    return target_dir
+
+
+class ResumeWriter:
+    """
+    Plain-text resumes built from the real catalog vocabulary.
+
+    Args:
+        rng (numpy.random.Generator): Source of randomness
+        data_dir (str): Directory of the real catalog tables
+    """
+    def __init__(self, rng, data_dir='data'):
+        self.rng = rng
+        self.skills = pd.read_csv(os.path.join(data_dir, 'skills.csv'))['Skill'].dropna().to_numpy(dtype=object)
+        self.degrees = pd.read_csv(os.path.join(data_dir, 'education.csv'))['Category'].dropna().to_numpy(dtype=object)
+        self.cities = pd.read_csv(os.path.join(data_dir, 'locations.csv'))['City'].dropna().to_numpy(dtype=object)
+        descriptions = ' '.join(pd.read_csv(os.path.join(data_dir, 'internships.csv'))['Description'].dropna())
+        self.words = np.array(re.findall(r'[a-z]+', descriptions.lower()), dtype=object)
+
+    def _sentence(self, mention):
+        filler = ' '.join(self.rng.choice(self.words, size=self.rng.integers(8, 16)))
+        return f'{filler.capitalize()} using {mention}.'
+
+    def resume(self, pages):
+        """Resume text of about `pages` pages"""
+        rng = self.rng
+        lines = [
+            f'Candidate {rng.integers(1, 10 ** 6)}',
+            f'Location: {rng.choice(self.cities)}',
+            'Education',
+            f'{rng.choice(self.degrees)}, {rng.choice(self.cities)} University',
+            'Skills',
+            ', '.join(rng.choice(self.skills, size=rng.integers(5, 12), replace=False)),
+            'Experience'
+        ]
+        words = sum(len(line.split()) for line in lines)
+        while words < pages * WORDS_PER_PAGE:
+            sentence = self._sentence(rng.choice(self.skills))
+            if rng.random() < 0.05:
+                sentence += f' Based in {rng.choice(self.cities)}.'
+            lines.append(sentence)
+            words += len(sentence.split())
+        return '\n'.join(lines)
@@ -0,0 +1,31 @@
+"""
+Compile the catalog CSV files into the columnar binary bundle.
+
+The app and the bulk matcher load the bundle (memory-mapped) instead of
+parsing the CSV files when it is up to date; rerun this after editing them:
+
+    python compile_catalog.py --data-dir data
+"""
+import argparse
+import sys
+import time
+
+from services.catalog_store import compile_bundle
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Compile the catalog CSV files into a memory-mappable binary bundle.'
+    )
+    parser.add_argument('--data-dir', default='data', help='Directory holding the catalog CSV files')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    bundle_path = compile_bundle(args.data_dir)
+    elapsed = time.perf_counter() - start
+    print(f"Compiled catalog bundle in {elapsed:.1f}s -> {bundle_path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
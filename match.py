@@ -0,0 +1,42 @@
+"""
+Offline bulk matcher.
+
+Reads candidate profiles from a CSV or JSONL file and writes the ranked
+internship matches to a CSV or JSONL file, without starting the web app:
+
+    python match.py profiles.csv matches.jsonl --top-n 5 --workers 4
+"""
+import argparse
+import sys
+import time
+
+from services.bulk_matcher import run_bulk_match
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Match candidate profiles against the internship catalog in bulk.'
+    )
+    parser.add_argument('input', help='Profiles file (.csv or .jsonl) with skills, sector, location, education')
+    parser.add_argument('output', help='Results file (.csv: one row per match, .jsonl: one line per profile)')
+    parser.add_argument('--data-dir', default='data', help='Directory holding the catalog CSV files')
+    parser.add_argument('--top-n', type=int, default=5, help='Matches per profile')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (1 runs in this process)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Profiles sent to a worker at a time')
+    args = parser.parse_args(argv)
+
+    if args.top_n <= 0 or args.workers <= 0 or args.chunk_size <= 0:
+        parser.error('--top-n, --workers and --chunk-size must be positive')
+
+    start = time.perf_counter()
+    matched = run_bulk_match(
+        args.input, args.output,
+        data_dir=args.data_dir, top_n=args.top_n, workers=args.workers, chunk_size=args.chunk_size
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Matched {matched} profiles in {elapsed:.1f}s -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
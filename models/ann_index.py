@@ -0,0 +1,250 @@
+"""
+Approximate nearest-neighbour candidate generation for large catalogs.
+
+Every posting is embedded offline into a small dense vector by feature
+hashing its skills (plus their alias groups and long skill words), sector,
+location (place and state) and description words. Each block is
+L2-normalized and weighted like the rule-based scores, so the inner product
+of a candidate and a posting roughly follows the total score. The vectors
+are clustered with spherical k-means into an inverted file (IVF): a query
+only scans the postings of the few clusters closest to it, and the best few
+hundred of those are handed to the exact rule-based scoring for re-ranking.
+Postings added later are kept outside the clusters and always scanned.
+"""
+import copy
+import math
+import zlib
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from models.skill_index import SKILL_INDEX, PARTIAL_MATCH_MIN_LENGTH
+from models.recommender import preprocess_skills
+from models.location_resolver import LocationResolver
+from models.text_features import extract_text_features
+
+# Dimension of the hashed embedding
+EMBEDDING_DIM = 256
+
+# Block weights, matching SCORE_WEIGHTS in models.scoring
+BLOCK_WEIGHTS = {
+    'skill': 2.5,
+    'sector': 2,
+    'location': 1.5,
+    'text': 1
+}
+
+# k-means settings for the inverted file: about LISTS_PER_SQRT_SIZE * sqrt(size) clusters
+LISTS_PER_SQRT_SIZE = 4
+KMEANS_ITERATIONS = 10
+KMEANS_TRAIN_SIZE = 20000
+KMEANS_SEED = 0
+
+# Clusters scanned per query: about PROBES_PER_SQRT_LISTS * sqrt(number of clusters),
+# so the share of the catalog scanned shrinks as the catalog grows
+PROBES_PER_SQRT_LISTS = 3
+
+
+class FeatureHasher:
+    """Signed feature hashing of string tokens into a fixed number of dimensions"""
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+        self._buckets = {}
+
+    def bucket(self, token):
+        """(dimension, sign) of a token; crc32 keeps it stable across processes"""
+        cached = self._buckets.get(token)
+        if cached is None:
+            digest = zlib.crc32(token.encode('utf-8'))
+            cached = (digest % self.dim, 1.0 if (digest >> 31) & 1 else -1.0)
+            self._buckets[token] = cached
+        return cached
+
+    def embed(self, blocks):
+        """Weighted sum of the L2-normalized hashed vectors of each token block"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for name, tokens in blocks.items():
+            if not tokens:
+                continue
+            block = np.zeros(self.dim, dtype=np.float32)
+            for token in tokens:
+                index, sign = self.bucket(token)
+                block[index] += sign
+            norm = np.linalg.norm(block)
+            if norm > 0:
+                vector += block * (BLOCK_WEIGHTS[name] / norm)
+        return vector
+
+
+def _skill_tokens(skills):
+    """Skill, alias group and long-word tokens of a list of skills"""
+    tokens = set()
+    for skill in skills:
+        if not skill:
+            continue
+        skill = str(skill).lower().strip()
+        tokens.add('skill:' + skill)
+        for canonical_id in SKILL_INDEX.groups(skill):
+            tokens.add(f'group:{canonical_id}')
+        for word in skill.split():
+            if len(word) > PARTIAL_MATCH_MIN_LENGTH:
+                tokens.add('skillword:' + word)
+    return tokens
+
+
+def _text_tokens(text):
+    features = extract_text_features(text, cache=False)
+    return {'text:' + word for word in features.words} if features is not None else set()
+
+
+class InternshipANNIndex:
+    """
+    Hashed embeddings of a catalog plus an IVF index over them.
+
+    Args:
+        internships_df (DataFrame): Internship catalog
+        location_df (DataFrame): Locations (State, City) used for state tokens
+        n_lists (int): Number of k-means clusters (LISTS_PER_SQRT_SIZE * sqrt(catalog size) by default)
+    """
+    def __init__(self, internships_df, location_df, n_lists=None):
+        self.hasher = FeatureHasher()
+        self.location_resolver = LocationResolver.for_dataframe(location_df)
+        self.size = len(internships_df)
+
+        vectors = self._embed_rows(internships_df)
+        self._build_lists(vectors, n_lists or max(1, int(round(LISTS_PER_SQRT_SIZE * math.sqrt(self.size)))))
+        self.n_probe = max(1, int(math.ceil(PROBES_PER_SQRT_LISTS * math.sqrt(len(self.centroids)))))
+
+        # Postings appended since the lists were built, scanned by every query
+        self.extra_ids = np.zeros(0, dtype=np.int64)
+        self.extra_vectors = np.zeros((0, self.hasher.dim), dtype=np.float32)
+
+    def with_rows(self, new_rows_df):
+        """
+        New index with postings appended, leaving this one unchanged.
+
+        The appended postings are embedded and scanned exhaustively by every
+        query until the index is rebuilt; the clusters are not retrained.
+        Retired postings are excluded by the caller through search's allowed mask.
+        """
+        index = copy.copy(self)
+        index.extra_ids = np.concatenate([self.extra_ids, np.arange(self.size, self.size + len(new_rows_df))])
+        index.extra_vectors = np.concatenate([self.extra_vectors, self._embed_rows(new_rows_df)])
+        index.size = self.size + len(new_rows_df)
+        return index
+
+    def _embed_rows(self, internships_df):
+        """Embedding of every posting of a DataFrame"""
+        columns = [internships_df[column].tolist() for column in ('Skills_Required', 'Sector', 'Location', 'Description')]
+        vectors = np.zeros((len(internships_df), self.hasher.dim), dtype=np.float32)
+        for i, (skills, sector, location, description) in enumerate(zip(*columns)):
+            vectors[i] = self.hasher.embed(self._blocks(preprocess_skills(skills), sector, location, description))
+        return vectors
+
+    def _blocks(self, skills, sector, location, text):
+        """Token blocks of a posting or a candidate"""
+        blocks = {'skill': _skill_tokens(skills), 'sector': set(), 'location': set(), 'text': _text_tokens(text)}
+        if sector is not None and not pd.isna(sector) and str(sector).strip():
+            blocks['sector'].add('sector:' + str(sector).strip().lower())
+        if location is not None and not pd.isna(location) and str(location).strip():
+            blocks['location'].add('place:' + str(location).strip().lower())
+            state = self.location_resolver.resolve_state(location)
+            if state is not None:
+                blocks['location'].add('state:' + str(state).lower())
+        return blocks
+
+    def _build_lists(self, vectors, n_lists):
+        """Cluster the vectors with spherical k-means and store them grouped by cluster"""
+        rng = np.random.default_rng(KMEANS_SEED)
+        n_lists = min(n_lists, self.size) if self.size else 1
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        unit = vectors / np.where(norms > 0, norms, 1)
+
+        sample = unit if self.size <= KMEANS_TRAIN_SIZE else unit[rng.choice(self.size, KMEANS_TRAIN_SIZE, replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)] if len(sample) else \
+            np.zeros((1, self.hasher.dim), dtype=np.float32)
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            membership = sparse.csr_matrix(
+                (np.ones(len(sample), dtype=np.float32), (assignment, np.arange(len(sample)))),
+                shape=(len(centroids), len(sample))
+            )
+            sums = np.asarray(membership @ sample)
+            # Empty clusters are re-seeded from random vectors
+            empty = np.flatnonzero(np.asarray(membership.sum(axis=1)).ravel() == 0)
+            sums[empty] = sample[rng.integers(len(sample), size=len(empty))]
+            sum_norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = (sums / np.where(sum_norms > 0, sum_norms, 1)).astype(np.float32)
+
+        assignment = np.concatenate([
+            np.argmax(unit[start:start + KMEANS_TRAIN_SIZE] @ centroids.T, axis=1)
+            for start in range(0, self.size, KMEANS_TRAIN_SIZE)
+        ]) if self.size else np.zeros(0, dtype=np.int64)
+
+        # Postings grouped by cluster so a probed cluster is one contiguous slice
+        self.centroids = centroids
+        self.list_ids = np.argsort(assignment, kind='stable')
+        self.list_vectors = vectors[self.list_ids]
+        self.list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=len(centroids)))])
+
+    def embed_candidate(self, candidate):
+        """Query vector of a candidate profile"""
+        skills = preprocess_skills(candidate.get('skills', []))
+        return self.hasher.embed(self._blocks(
+            skills, candidate.get('sector'), candidate.get('location'), candidate.get('full_text')
+        ))
+
+    def search(self, candidate, k, allowed=None, n_probe=None):
+        """
+        Approximate top-k postings for a candidate.
+
+        Args:
+            candidate (dict): Candidate profile with skills, sector, location and full_text
+            k (int): Number of postings to return
+            allowed (array): Optional boolean mask of postings that may be returned
+            n_probe (int): Number of closest clusters scanned first (self.n_probe by default)
+
+        Returns:
+            array: Catalog positions of up to k postings, in catalog order
+        """
+        query = self.embed_candidate(candidate)
+        cluster_order = np.argsort(-(self.centroids @ query), kind='stable')
+
+        # Appended postings are always scanned
+        ids, scores = [], []
+        found = 0
+        if len(self.extra_ids):
+            extra_ids, extra_scores = self.extra_ids, self.extra_vectors @ query
+            if allowed is not None:
+                keep = allowed[extra_ids]
+                extra_ids, extra_scores = extra_ids[keep], extra_scores[keep]
+            ids.append(extra_ids)
+            scores.append(extra_scores)
+            found += len(extra_ids)
+
+        # Probe more clusters until k allowed postings are found (or all were scanned)
+        n_probe = max(1, n_probe or self.n_probe)
+        probed = 0
+        while probed < len(cluster_order):
+            for cluster in cluster_order[probed:n_probe]:
+                start, end = self.list_offsets[cluster], self.list_offsets[cluster + 1]
+                cluster_ids = self.list_ids[start:end]
+                cluster_scores = self.list_vectors[start:end] @ query
+                if allowed is not None:
+                    keep = allowed[cluster_ids]
+                    cluster_ids, cluster_scores = cluster_ids[keep], cluster_scores[keep]
+                ids.append(cluster_ids)
+                scores.append(cluster_scores)
+                found += len(cluster_ids)
+            probed = min(n_probe, len(cluster_order))
+            if found >= k:
+                break
+            n_probe *= 2
+
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        ids = np.concatenate(ids)
+        if len(ids) > k:
+            ids = ids[np.argpartition(-np.concatenate(scores), k - 1)[:k]]
+        return np.sort(ids)
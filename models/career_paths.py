@@ -0,0 +1,98 @@
+"""
+Career paths by sector, chosen by skill overlap.
+
+CareerPathIndex groups the career paths table by sector once per catalog
+snapshot and tokenizes the roles of every path into word stems (generic
+seniority words dropped). A candidate's skills are tokenized the same way,
+together with the canonical skill of every alias they belong to (so 'py'
+counts as 'python' and 'data analytics' as 'data analysis'), and the path
+of a sector sharing the most stems with them is chosen with set
+intersections; ties keep the table order. Results are memoized per
+(sector, skill signature), so the recommendations of one request share a
+single lookup per sector.
+"""
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+from models.skill_index import SKILL_INDEX
+
+# Role words saying nothing about the skills a path needs
+GENERIC_ROLE_WORDS = {
+    'junior', 'senior', 'chief', 'head', 'lead', 'manager', 'director', 'officer',
+    'executive', 'assistant', 'associate', 'coordinator', 'specialist', 'and', 'of'
+}
+
+# Words are compared by their first STEM_LENGTH characters ('analyst' ~ 'analysis')
+STEM_LENGTH = 5
+
+# (sector, skill signature) pairs memoized per index, and skill lists memoized overall
+CAREER_PATH_CACHE_SIZE = 4096
+SKILL_SIGNATURE_CACHE_SIZE = 4096
+
+_WORD = re.compile(r'[a-z0-9+#]+')
+
+
+def _stems(text):
+    """Stems of the words of a text"""
+    return {word[:STEM_LENGTH] for word in _WORD.findall(str(text).lower()) if len(word) > 1}
+
+
+_GENERIC_STEMS = frozenset(stem for word in GENERIC_ROLE_WORDS for stem in _stems(word))
+
+
+@lru_cache(maxsize=SKILL_SIGNATURE_CACHE_SIZE)
+def _skill_signature(skills):
+    """Stems of a tuple of skills and of the canonical skills they are aliases of"""
+    stems = set()
+    for skill in skills:
+        skill = skill.lower().strip()
+        stems |= _stems(skill)
+        for canonical_id in SKILL_INDEX.groups(skill):
+            stems |= _stems(SKILL_INDEX.canonical_skills[canonical_id])
+    return frozenset(stems - _GENERIC_STEMS)
+
+
+def skill_signature(skills):
+    """Hashable stem set of a candidate's skills (a list or a comma-separated string)"""
+    if skills is None or isinstance(skills, float) and pd.isna(skills):
+        return frozenset()
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    return _skill_signature(tuple(str(skill) for skill in skills if skill is not None and not pd.isna(skill)))
+
+
+class CareerPathIndex:
+    """
+    Career paths grouped by sector with the role stems of each path.
+
+    Args:
+        career_paths_df (DataFrame): Career paths (Sector, Role_1, Role_2, ...)
+    """
+    def __init__(self, career_paths_df):
+        role_columns = [column for column in career_paths_df.columns if column != 'Sector']
+        self.paths = {}
+        for record in career_paths_df.to_dict('records'):
+            stems = set()
+            for column in role_columns:
+                role = record[column]
+                if role is not None and not pd.isna(role):
+                    stems |= _stems(role)
+            self.paths.setdefault(record['Sector'], []).append((record, frozenset(stems - _GENERIC_STEMS)))
+        self._best_path = lru_cache(maxsize=CAREER_PATH_CACHE_SIZE)(self._find_best_path)
+
+    def best_path(self, sector, skills):
+        """Career path of a sector best matching the skills (the first one without overlap), or None"""
+        if sector is None or pd.isna(sector) or sector == "":
+            return None
+        record = self._best_path(sector, skill_signature(skills))
+        return dict(record) if record is not None else None
+
+    def _find_best_path(self, sector, signature):
+        best, best_overlap = None, -1
+        for record, stems in self.paths.get(sector, ()):
+            overlap = len(stems & signature)
+            if overlap > best_overlap:
+                best, best_overlap = record, overlap
+        return best
@@ -0,0 +1,67 @@
+"""
+Learning resources by skill.
+
+LearningResourceIndex maps every case-normalized skill of the learning
+resources table to its first RESOURCES_PER_SKILL resources. It is built
+once per catalog snapshot, so the resources of all recommendations of a
+request come from one batched lookup of the union of their missing skills.
+"""
+import pandas as pd
+
+# Resources suggested per missing skill, in table order
+RESOURCES_PER_SKILL = 2
+
+
+def _skill_key(skill):
+    """Normalized form of a skill, or None for a missing one"""
+    if skill is None or pd.isna(skill) or skill == "":
+        return None
+    return str(skill).lower().strip()
+
+
+class LearningResourceIndex:
+    """
+    Skill -> (name, url) of its first resources.
+
+    Args:
+        learning_resources_df (DataFrame): Learning resources (Skill, Resource_Name, Resource_URL)
+    """
+    def __init__(self, learning_resources_df):
+        self.resources = {}
+        columns = [learning_resources_df[column].tolist() for column in ('Skill', 'Resource_Name', 'Resource_URL')]
+        for skill, name, url in zip(*columns):
+            key = _skill_key(skill)
+            if key is None:
+                continue
+            entries = self.resources.setdefault(key, [])
+            if len(entries) < RESOURCES_PER_SKILL:
+                entries.append((name, url))
+
+    def lookup(self, skills):
+        """Resources of each distinct skill: normalized skill -> list of (name, url)"""
+        found = {}
+        for skill in skills:
+            key = _skill_key(skill)
+            if key is not None and key not in found:
+                found[key] = self.resources.get(key, [])
+        return found
+
+    def batch(self, missing_skill_lists):
+        """
+        Learning resources of several lists of missing skills at once.
+
+        The union of the skills is looked up once, so a skill missing from
+        several recommendations costs a single lookup.
+
+        Returns:
+            list: For each list, a list of {'skill', 'name', 'url'} dicts
+        """
+        found = self.lookup(skill for skills in missing_skill_lists for skill in skills)
+        results = []
+        for skills in missing_skill_lists:
+            resources = []
+            for skill in skills:
+                for name, url in found.get(_skill_key(skill), ()):
+                    resources.append({'skill': skill, 'name': name, 'url': url})
+            results.append(resources)
+        return results
@@ -0,0 +1,90 @@
+"""
+City -> state resolution for location matching.
+
+Built once from locations.csv so calculate_location_match no longer scans the
+whole locations table (four times) per candidate-internship pair. Resolved
+states are also exposed as integer codes for the vectorized scorer.
+"""
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Number of resolvers kept for distinct locations DataFrames
+_RESOLVER_CACHE_SIZE = 4
+
+_resolver_cache = OrderedDict()
+_resolver_cache_lock = threading.Lock()
+
+
+class LocationResolver:
+    """
+    O(1) lookups of the state a city or state name belongs to.
+
+    Args:
+        location_df (DataFrame): Locations with State and City columns
+    """
+    def __init__(self, location_df):
+        self.states = set()
+        self.state_ids = {}
+        self.city_states = {}
+
+        for state, city in zip(location_df['State'].tolist(), location_df['City'].tolist()):
+            if state is None or pd.isna(state):
+                continue
+            self.states.add(state)
+            self.state_ids.setdefault(state, len(self.state_ids))
+            if city is None or pd.isna(city):
+                continue
+            # The first row wins when a city name appears under several states
+            self.city_states.setdefault(str(city).lower(), state)
+
+    @classmethod
+    def for_dataframe(cls, location_df):
+        """Return the shared resolver for a locations DataFrame, building it on first use"""
+        key = id(location_df)
+        with _resolver_cache_lock:
+            cached = _resolver_cache.get(key)
+            # The DataFrame is kept in the cache entry so its id cannot be reused
+            if cached is not None and cached[0] is location_df:
+                _resolver_cache.move_to_end(key)
+                return cached[1]
+
+        resolver = cls(location_df)
+        with _resolver_cache_lock:
+            _resolver_cache[key] = (location_df, resolver)
+            _resolver_cache.move_to_end(key)
+            while len(_resolver_cache) > _RESOLVER_CACHE_SIZE:
+                _resolver_cache.popitem(last=False)
+        return resolver
+
+    def resolve_state(self, location):
+        """State for a city (case-insensitive) or an exact state name, else None"""
+        if location is None or pd.isna(location):
+            return None
+        state = self.city_states.get(str(location).lower())
+        if state is None and location in self.states:
+            state = location
+        return state
+
+    def state_code(self, location):
+        """Integer code of the location's state, -1 when it cannot be resolved"""
+        state = self.resolve_state(location)
+        return self.state_ids[state] if state is not None else -1
+
+    def match(self, candidate_location, internship_location):
+        """Location match score: 1 for the same place, 0.5 for the same state, else 0"""
+        if pd.isna(candidate_location) or pd.isna(internship_location):
+            return 0
+
+        # Exact city match
+        if candidate_location.lower() == internship_location.lower():
+            return 1
+
+        # Check if in same state
+        candidate_state = self.resolve_state(candidate_location)
+        internship_state = self.resolve_state(internship_location)
+        if candidate_state and internship_state and candidate_state == internship_state:
+            return 0.5
+
+        return 0
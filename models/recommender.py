@@ -1,26 +1,35 @@
 import pandas as pd
 import numpy as np
-# Temporarily commenting out sklearn imports for basic functionality
-# from sklearn.feature_extraction.text import TfidfVectorizer
-# from sklearn.metrics.pairwise import cosine_similarity
 import re
+import logging
+from models.skill_index import SKILL_SIMILARITY_MAP, SKILL_INDEX
+from models.location_resolver import LocationResolver
+from models.text_features import extract_text_features, text_similarity
+from models.sector_normalizer import normalize_sector, calculate_sector_match
+from models.learning_resources import LearningResourceIndex
+from models.career_paths import CareerPathIndex
+from utils.metrics import METRICS
+from utils.log import log_sampled
+
+logger = logging.getLogger(__name__)
+
 
 def preprocess_skills(skills_text):
     """Convert skills list to a standardized format"""
+    # If it's already a list (checked first, pd.isna on a list returns an array)
+    if isinstance(skills_text, list):
+        return [skill.strip() for skill in skills_text if skill and not pd.isna(skill)]
+
     # Handle None, NaN, or empty strings
     if skills_text is None or pd.isna(skills_text) or skills_text == "":
         return []
-    
-    # If it's already a list
-    if isinstance(skills_text, list):
-        return [skill.strip() for skill in skills_text if skill and not pd.isna(skill)]
-    
+
     # If it's a string, split by commas
     try:
         skills = [skill.strip() for skill in skills_text.split(',') if skill.strip()]
         return skills
     except (AttributeError, TypeError):
-        print(f"Error processing skills: {skills_text} (type: {type(skills_text)})")
+        log_sampled(logger, logging.WARNING, 'preprocess_skills', "Error processing skills: %s (type: %s)", skills_text, type(skills_text))
         return []
 
 def calculate_skill_match(candidate_skills, internship_skills):
@@ -48,68 +57,13 @@ def calculate_skill_match(candidate_skills, internship_skills):
         common_skills = set(candidate_skills_processed).intersection(set(internship_skills_processed))
         exact_match_score = len(common_skills) / len(internship_skills_processed)
         
-        # Method 2: Fuzzy matching for similar skills
+        # Method 2: Fuzzy matching for similar skills via the canonical skill index
         fuzzy_matches = 0
-        skill_similarity_map = {
-            # Programming languages
-            'python': ['py', 'python3', 'python2'],
-            'javascript': ['js', 'node.js', 'nodejs', 'ecmascript'],
-            'java': ['openjdk', 'oracle java'],
-            'c++': ['cpp', 'c plus plus'],
-            'c#': ['csharp', 'c sharp', 'dotnet'],
-            
-            # Web technologies
-            'html': ['html5', 'hyper text markup language'],
-            'css': ['css3', 'cascading style sheets'],
-            'react': ['reactjs', 'react.js'],
-            'angular': ['angularjs'],
-            'vue': ['vuejs', 'vue.js'],
-            
-            # Databases
-            'sql': ['mysql', 'postgresql', 'sqlite', 'mssql'],
-            'mongodb': ['mongo', 'nosql'],
-            
-            # Tools and frameworks
-            'git': ['github', 'gitlab', 'version control'],
-            'docker': ['containerization'],
-            'kubernetes': ['k8s', 'orchestration'],
-            
-            # Data science
-            'machine learning': ['ml', 'artificial intelligence', 'ai'],
-            'data analysis': ['data analytics', 'data science'],
-            'tensorflow': ['tf'],
-            'pytorch': ['torch'],
-            
-            # Design
-            'photoshop': ['adobe photoshop', 'ps'],
-            'illustrator': ['adobe illustrator', 'ai'],
-            'figma': ['ui design', 'ux design'],
-        }
-        
+        unmatched_candidate_skills = [skill for skill in candidate_skills_processed if skill not in common_skills]
         for internship_skill in internship_skills_processed:
             if internship_skill in common_skills:
                 continue  # Already counted in exact matches
-                
-            for candidate_skill in candidate_skills_processed:
-                if candidate_skill in common_skills:
-                    continue  # Already counted
-                
-                # Check similarity mappings
-                skill_matched = False
-                for base_skill, variations in skill_similarity_map.items():
-                    if (base_skill == internship_skill or internship_skill in variations) and \
-                       (base_skill == candidate_skill or candidate_skill in variations):
-                        fuzzy_matches += 1
-                        skill_matched = True
-                        break
-                
-                if skill_matched:
-                    break
-                
-                # Simple substring matching for longer skills
-                if len(internship_skill) > 4 and len(candidate_skill) > 4:
-                    if internship_skill in candidate_skill or candidate_skill in internship_skill:
-                        fuzzy_matches += 0.5  # Partial credit for substring matches
+            fuzzy_matches += SKILL_INDEX.fuzzy_credit(internship_skill, unmatched_candidate_skills)
         
         # Method 3: Calculate weighted score
         fuzzy_match_score = min(fuzzy_matches / len(internship_skills_processed), 1.0)
@@ -120,255 +74,36 @@ def calculate_skill_match(candidate_skills, internship_skills):
         return min(total_score, 1.0)  # Cap at 1.0
         
     except Exception as e:
-        print(f"Error in enhanced skill matching: {e}")
+        log_sampled(logger, logging.WARNING, 'skill_match', "Error in enhanced skill matching: %s", e)
         return 0
 
-def normalize_sector(user_sector):
-    """Normalize user input sector to match dataset sectors"""
-    if not user_sector or pd.isna(user_sector):
-        return ""
-    
-    user_lower = user_sector.lower().strip()
-    
-    # Mapping user input to actual sectors in dataset
-    sector_normalizations = {
-        'pharmacy': 'Healthcare',
-        'pharmaceutical': 'Healthcare', 
-        'medical': 'Healthcare',
-        'health': 'Healthcare',
-        'healthcare': 'Healthcare',
-        'hospital': 'Healthcare',
-        'medicine': 'Healthcare',
-        'pharma': 'Healthcare',
-        
-        'it': 'IT',
-        'software': 'IT',
-        'technology': 'IT',
-        'computer': 'IT',
-        'programming': 'IT',
-        'tech': 'IT',
-        'information technology': 'IT',
-        
-        'business': 'Business',
-        'marketing': 'Business',
-        'sales': 'Business',
-        'management': 'Business',
-        'commerce': 'Business',
-        'mba': 'Business',
-        
-        'finance': 'Finance',
-        'banking': 'Finance',
-        'financial': 'Finance',
-        'accounting': 'Finance',
-        'investment': 'Finance',
-        
-        'engineering': 'Engineering',
-        'mechanical': 'Engineering',
-        'civil': 'Engineering',
-        'electrical': 'Engineering',
-        'chemical': 'Engineering',
-        'automotive': 'Engineering',
-        
-        'education': 'Education',
-        'teaching': 'Education',
-        'academic': 'Education',
-        'training': 'Education',
-        'learning': 'Education',
-        
-        'design': 'Creative',
-        'creative': 'Creative',
-        'art': 'Creative',
-        'graphic': 'Creative',
-        'ui': 'Creative',
-        'ux': 'Creative',
-        
-        'social': 'Social Work',
-        'ngo': 'Social Work',
-        'community': 'Social Work',
-        'social work': 'Social Work',
-        
-        'media': 'Media',
-        'journalism': 'Media',
-        'communication': 'Media',
-        'content': 'Media'
-    }
-    
-    # Direct match
-    if user_lower in sector_normalizations:
-        return sector_normalizations[user_lower]
-    
-    # Partial match
-    for key, value in sector_normalizations.items():
-        if key in user_lower or user_lower in key:
-            return value
-    
-    # Return original if no mapping found
-    return user_sector.title()
-
-def calculate_sector_match(candidate_sector, internship_sector):
-    """Enhanced sector match between candidate and internship with fuzzy matching"""
-    if pd.isna(candidate_sector) or pd.isna(internship_sector):
-        return 0
-    
-    candidate_lower = candidate_sector.lower().strip()
-    internship_lower = internship_sector.lower().strip()
-    
-    # Exact match
-    if candidate_lower == internship_lower:
-        return 1
-    
-    # Handle common sector variations and related fields
-    sector_mappings = {
-        'pharmacy': ['healthcare', 'pharmaceutical', 'medical', 'health'],
-        'healthcare': ['pharmacy', 'pharmaceutical', 'medical', 'health', 'hospital'],
-        'pharmaceutical': ['pharmacy', 'healthcare', 'medical', 'health'],
-        'medical': ['healthcare', 'pharmacy', 'pharmaceutical', 'health'],
-        'it': ['information technology', 'software', 'technology', 'computer science', 'tech'],
-        'software': ['it', 'information technology', 'technology', 'computer science', 'tech'],
-        'technology': ['it', 'software', 'information technology', 'tech'],
-        'business': ['marketing', 'management', 'finance', 'sales', 'commerce'],
-        'marketing': ['business', 'digital marketing', 'advertising', 'sales'],
-        'finance': ['business', 'banking', 'accounting', 'financial'],
-        'engineering': ['mechanical', 'civil', 'electrical', 'chemical', 'automotive'],
-        'education': ['teaching', 'academic', 'training', 'learning'],
-        'design': ['graphic design', 'ui/ux', 'creative', 'art']
-    }
-    
-    # Check if candidate sector maps to internship sector
-    if candidate_lower in sector_mappings:
-        for related_sector in sector_mappings[candidate_lower]:
-            if related_sector in internship_lower:
-                return 0.8  # High but not perfect match for related sectors
-    
-    # Check if internship sector maps to candidate sector
-    if internship_lower in sector_mappings:
-        for related_sector in sector_mappings[internship_lower]:
-            if related_sector in candidate_lower:
-                return 0.8
-    
-    # Partial string matching for longer sector names
-    if len(candidate_lower) > 3 and len(internship_lower) > 3:
-        if candidate_lower in internship_lower or internship_lower in candidate_lower:
-            return 0.6
-    
-    return 0
-
 def calculate_location_match(candidate_location, internship_location, location_df):
-    """Calculate location match between candidate and internship"""
-    if pd.isna(candidate_location) or pd.isna(internship_location):
-        return 0
-    
-    # Exact city match
-    if candidate_location.lower() == internship_location.lower():
-        return 1
+    """Calculate location match between candidate and internship
     
-    # Check if in same state
-    candidate_state = None
-    internship_state = None
-    
-    # Find state for candidate location (if it's a city)
-    candidate_city_match = location_df[location_df['City'].str.lower() == candidate_location.lower()]
-    if not candidate_city_match.empty:
-        candidate_state = candidate_city_match['State'].iloc[0]
-    else:
-        # Check if the candidate location is directly a state
-        if candidate_location in location_df['State'].values:
-            candidate_state = candidate_location
-    
-    # Find state for internship location (if it's a city)
-    internship_city_match = location_df[location_df['City'].str.lower() == internship_location.lower()]
-    if not internship_city_match.empty:
-        internship_state = internship_city_match['State'].iloc[0]
+    location_df may be the locations DataFrame or a prebuilt LocationResolver;
+    city -> state lookups are O(1) either way.
+    """
+    if isinstance(location_df, LocationResolver):
+        resolver = location_df
     else:
-        # Check if the internship location is directly a state
-        if internship_location in location_df['State'].values:
-            internship_state = internship_location
-    
-    # If both are in the same state
-    if candidate_state and internship_state and candidate_state == internship_state:
-        return 0.5
-    
-    return 0
+        resolver = LocationResolver.for_dataframe(location_df)
+    return resolver.match(candidate_location, internship_location)
 
 def calculate_text_similarity(candidate_text, internship_description):
-    """Enhanced text similarity between resume and internship description"""
-    if pd.isna(candidate_text) or pd.isna(internship_description):
-        return 0
-    
-    # Convert to string if not already
-    candidate_text = str(candidate_text).lower()
-    internship_description = str(internship_description).lower()
-    
-    if not candidate_text.strip() or not internship_description.strip():
-        return 0
-    
+    """Enhanced text similarity between resume and internship description
+
+    Both texts go through extract_text_features, which keeps the tokens,
+    bigrams and keyword bitmask of recently seen texts, so comparing one
+    resume with a whole catalog tokenizes it once. See text_similarity for
+    the formula.
+    """
     try:
-        # Method 1: Common word similarity (basic)
-        candidate_words = set(re.findall(r'\b\w+\b', candidate_text))
-        internship_words = set(re.findall(r'\b\w+\b', internship_description))
-        
-        # Remove common stop words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'}
-        
-        candidate_words = candidate_words - stop_words
-        internship_words = internship_words - stop_words
-        
-        if not candidate_words or not internship_words:
-            return 0
-        
-        # Basic Jaccard similarity
-        common_words = candidate_words.intersection(internship_words)
-        union_words = candidate_words.union(internship_words)
-        basic_similarity = len(common_words) / len(union_words) if union_words else 0
-        
-        # Method 2: Keyword importance weighting
-        # Important keywords that should have higher weight
-        important_keywords = {
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node',
-            'machine learning', 'data science', 'artificial intelligence',
-            'web development', 'mobile development', 'software engineering',
-            'database', 'sql', 'mongodb', 'postgresql',
-            'cloud', 'aws', 'azure', 'gcp',
-            'devops', 'docker', 'kubernetes',
-            'frontend', 'backend', 'fullstack',
-            'api', 'rest', 'graphql',
-            'testing', 'automation', 'ci/cd',
-            'agile', 'scrum', 'project management'
-        }
-        
-        # Count important keyword matches
-        important_matches = 0
-        total_important_in_internship = 0
-        
-        for keyword in important_keywords:
-            if keyword in internship_description:
-                total_important_in_internship += 1
-                if keyword in candidate_text:
-                    important_matches += 1
-        
-        keyword_similarity = important_matches / total_important_in_internship if total_important_in_internship > 0 else 0
-        
-        # Method 3: N-gram similarity for phrases
-        def get_bigrams(text):
-            words = re.findall(r'\b\w+\b', text)
-            return set(zip(words[:-1], words[1:]))
-        
-        candidate_bigrams = get_bigrams(candidate_text)
-        internship_bigrams = get_bigrams(internship_description)
-        
-        if candidate_bigrams and internship_bigrams:
-            common_bigrams = candidate_bigrams.intersection(internship_bigrams)
-            bigram_similarity = len(common_bigrams) / len(candidate_bigrams.union(internship_bigrams))
-        else:
-            bigram_similarity = 0
-        
-        # Weighted combination of similarities
-        final_similarity = (basic_similarity * 0.4) + (keyword_similarity * 0.4) + (bigram_similarity * 0.2)
-        
-        return min(final_similarity, 1.0)  # Cap at 1.0
-        
+        return text_similarity(
+            extract_text_features(candidate_text),
+            extract_text_features(internship_description)
+        )
     except Exception as e:
-        print(f"Error calculating enhanced text similarity: {e}")
+        log_sampled(logger, logging.WARNING, 'text_similarity', "Error calculating enhanced text similarity: %s", e)
         return 0
 
 def generate_reason(candidate, internship, scores):
@@ -422,24 +157,57 @@ def find_missing_skills(candidate_skills, internship_skills):
                         if skill.lower() not in [s.lower() for s in candidate_skills_processed]]
         return missing_skills
     except Exception as e:
-        print(f"Error finding missing skills: {e}")
+        log_sampled(logger, logging.WARNING, 'missing_skills', "Error finding missing skills: %s", e)
         return []
 
-def get_recommendations(candidate, internships_df, location_df):
-    """Get internship recommendations for a candidate based on the system flow diagram
-    
-    1. Process user inputs (skills, sector, location, text)
-    2. Calculate matches with available internships
-    3. Score and rank internships
-    4. Generate personalized recommendations with explanations
-    5. Identify skill gaps and growth opportunities
-    """
-    recommendations = []
-    
-    # Step 1: Process user inputs
+# Postings retrieved by the ANN stage and re-ranked by the rule-based scores
+ANN_CANDIDATE_POOL = 300
+
+# Minimum calculate_sector_match for the related-sector fallback of the pre-filter
+RELATED_SECTOR_THRESHOLD = 0.8
+
+def _top_k_indices(total_scores, k):
+    """Indices of the k highest scores, best first; ties keep catalog order"""
+    n = len(total_scores)
+    if k >= n:
+        return np.argsort(-total_scores, kind='stable')
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    
+    # k-th largest score, then everything above it plus the earliest ties
+    threshold = np.partition(total_scores, n - k)[n - k]
+    above = np.flatnonzero(total_scores > threshold)
+    ties = np.flatnonzero(total_scores == threshold)[:k - len(above)]
+    selected = np.concatenate([above, ties])
+    return selected[np.argsort(-total_scores[selected], kind='stable')]
+
+def _iter_ranked(total_scores, k):
+    """Yield indices best first: the top k, then (only if still consumed) the rest"""
+    top = _top_k_indices(total_scores, k)
+    for i in top:
+        yield i
+    if len(top) < len(total_scores):
+        seen = set(top.tolist())
+        for i in np.argsort(-total_scores, kind='stable'):
+            if i not in seen:
+                yield i
+
+def _ann_positions(candidate, positions, size, ann_index, top_n):
+    """Candidate-generation stage: narrow positions to the ANN pool for re-ranking"""
+    pool_size = max(ANN_CANDIDATE_POOL, top_n)
+    if len(positions) <= pool_size:
+        return positions
+    allowed = None
+    if len(positions) < size:
+        allowed = np.zeros(size, dtype=bool)
+        allowed[positions] = True
+    return ann_index.search(candidate, pool_size, allowed=allowed)
+
+def _prepare_candidate(candidate):
+    """Fill in missing candidate keys and normalize the sector"""
     # Ensure candidate dictionary has required keys
     if not isinstance(candidate, dict):
-        print(f"Error: candidate must be a dictionary, got {type(candidate)}")
+        logger.error("Candidate must be a dictionary, got %s", type(candidate))
         candidate = {}
     
     # Set default values for missing keys
@@ -460,53 +228,53 @@ def get_recommendations(candidate, internships_df, location_df):
     if candidate['sector']:
         original_sector = candidate['sector']
         candidate['sector'] = normalize_sector(candidate['sector'])
-        print(f"Normalized sector '{original_sector}' to '{candidate['sector']}'")
-            
-    # Step 2: Calculate matches with available internships
+        logger.debug("Normalized sector '%s' to '%s'", original_sector, candidate['sector'])
+    
+    return candidate
+
+def _filter_positions(candidate, scorer):
+    """Row positions of the internships kept by the sector pre-filter"""
     # Pre-filter internships by sector if specified
-    filtered_internships = internships_df
-    if candidate.get('sector') and candidate['sector'].strip():
-        print(f"Filtering internships by sector: {candidate['sector']}")
-        # Filter for exact sector matches and related sectors
-        sector_matches = []
-        for _, internship in internships_df.iterrows():
-            # For strict filtering, we want high sector match
-            if internship['Sector'] == candidate['sector']:
-                sector_matches.append(internship)
-        
-        if sector_matches:
-            filtered_internships = pd.DataFrame(sector_matches)
-            print(f"Found {len(filtered_internships)} internships exactly matching sector '{candidate['sector']}'")
-        else:
-            # If no exact matches, try related sectors
-            for _, internship in internships_df.iterrows():
-                sector_score = calculate_sector_match(candidate['sector'], internship['Sector'])
-                if sector_score >= 0.8:  # High threshold for related sectors
-                    sector_matches.append(internship)
-            
-            if sector_matches:
-                filtered_internships = pd.DataFrame(sector_matches)
-                print(f"Found {len(filtered_internships)} internships with related sectors to '{candidate['sector']}'")
-            else:
-                print(f"No internships found for sector '{candidate['sector']}', showing all internships")
-                filtered_internships = internships_df
-    
-    for _, internship in filtered_internships.iterrows():
+    if not (candidate.get('sector') and candidate['sector'].strip()):
+        return scorer.live_positions
+    
+    logger.debug("Filtering internships by sector: %s", candidate['sector'])
+    # Exact sector matches come straight from the scorer's sector partitions
+    positions = scorer.sector_positions(candidate['sector'])
+    if len(positions):
+        logger.debug("Found %d internships exactly matching sector '%s'", len(positions), candidate['sector'])
+        return positions
+    
+    # If no exact matches, try related sectors
+    positions = scorer.sector_positions(candidate['sector'], min_score=RELATED_SECTOR_THRESHOLD)
+    if len(positions):
+        logger.debug("Found %d internships with related sectors to '%s'", len(positions), candidate['sector'])
+        return positions
+    
+    logger.debug("No internships found for sector '%s', showing all internships", candidate['sector'])
+    return scorer.live_positions
+
+def _build_recommendations(candidate, scorer, positions, all_scores, top_n):
+    """Build result dicts for the top_n best scored internships, best first"""
+    recommendations = []
+    
+    # Select the best top_n by total score without sorting the whole catalog
+    for i in _iter_ranked(all_scores['total_score'], top_n):
+        if len(recommendations) >= top_n:
+            break
+        internship = scorer.row(positions[i])
         try:
             # Calculate different match scores
             scores = {
-                'skill_match': calculate_skill_match(candidate['skills'], internship['Skills_Required']),
-                'sector_match': calculate_sector_match(candidate.get('sector', ''), internship['Sector']),
-                'location_match': calculate_location_match(candidate.get('location', ''), internship['Location'], location_df),
-                'text_similarity': calculate_text_similarity(candidate.get('full_text', ''), internship['Description'])
+                'skill_match': float(all_scores['skill_match'][i]),
+                'sector_match': float(all_scores['sector_match'][i]),
+                'location_match': float(all_scores['location_match'][i]),
+                'text_similarity': float(all_scores['text_similarity'][i])
             }
             
             # Step 3: Score and rank internships
-            # Calculate total score using weighted formula based on importance
-            total_score = (scores['skill_match'] * 2.5) + \
-                        (scores['sector_match'] * 2) + \
-                        (scores['location_match'] * 1.5) + \
-                        (scores['text_similarity'] * 1)
+            # Total score is weighted by importance (skills 2.5, sector 2, location 1.5, text 1)
+            total_score = float(all_scores['total_score'][i])
             
             # Step 4: Generate personalized recommendations with explanations
             reason = generate_reason(candidate, internship, scores)
@@ -514,7 +282,7 @@ def get_recommendations(candidate, internships_df, location_df):
             # Step 5: Identify skill gaps and growth opportunities
             missing_skills = find_missing_skills(candidate['skills'], internship['Skills_Required'])
         except Exception as e:
-            print(f"Error processing internship {internship.get('ID', 'unknown')}: {e}")
+            log_sampled(logger, logging.WARNING, 'score_internship', "Error processing internship %s: %s", internship.get('ID', 'unknown'), e)
             continue
         
         # Add to recommendations list with all calculated data
@@ -527,208 +295,227 @@ def get_recommendations(candidate, internships_df, location_df):
             'education_fit': True if candidate['education'] else False  # Simple education fit check
         })
     
-    # Sort recommendations by total score
-    recommendations.sort(key=lambda x: x['total_score'], reverse=True)
+    return recommendations
+
+def get_recommendations(candidate, internships_df, location_df, scorer=None, top_n=5, ann_index=None):
+    """Get internship recommendations for a candidate based on the system flow diagram
     
-    # Return top recommendations (max 5)
-    return recommendations[:5]
+    1. Process user inputs (skills, sector, location, text)
+    2. Calculate matches with available internships
+    3. Score and rank internships
+    4. Generate personalized recommendations with explanations
+    5. Identify skill gaps and growth opportunities
+
+    Scoring is done in one vectorized pass by a CatalogScorer. Pass a scorer
+    prebuilt from internships_df to avoid compiling the catalog per call.
+    Only the top_n best scored internships get reasons, missing skills and
+    a result dict built.
 
-def get_career_path(sector, skills, career_paths_df):
-    """Get career path based on sector and skills"""
+    For large catalogs, pass an InternshipANNIndex built from internships_df:
+    only the ANN_CANDIDATE_POOL postings it retrieves are then scored and
+    re-ranked, instead of the whole catalog.
+    """
+    # Step 1: Process user inputs
+    candidate = _prepare_candidate(candidate)
+    
+    if scorer is None:
+        from models.scoring import CatalogScorer
+        scorer = CatalogScorer(internships_df, location_df)
+    
+    # Step 2: Calculate matches with available internships
+    with METRICS.timer('sector_filter'):
+        positions = _filter_positions(candidate, scorer)
+    if ann_index is not None:
+        with METRICS.timer('ann_candidates'):
+            positions = _ann_positions(candidate, positions, scorer.size, ann_index, top_n)
+    METRICS.observe('postings_scored', len(positions), 'single')
+    
+    # Score every remaining internship in one vectorized pass
+    with METRICS.timer('scoring'):
+        all_scores = scorer.score(candidate, positions)
+    
+    # Steps 3-5 for the best top_n only, already ordered by total score
+    with METRICS.timer('reasons'):
+        return _build_recommendations(candidate, scorer, positions, all_scores, top_n)
+
+def get_batch_recommendations(candidates, internships_df, location_df, scorer=None, top_n=5):
+    """Get recommendations for several candidates at once
+    
+    The candidates are scored together with CatalogScorer.score_batch, so the
+    catalog side of the skill and text matching is shared by the whole batch.
+    Each result is the same list get_recommendations returns for that candidate.
+    
+    Args:
+        candidates (list): Candidate profile dicts
+        internships_df (DataFrame): Internship catalog
+        location_df (DataFrame): Locations used for location matching
+        scorer (CatalogScorer): Optional scorer prebuilt from internships_df
+        top_n (int): Number of recommendations per candidate
+    
+    Returns:
+        list: One list of recommendations per candidate, in input order
+    """
+    candidates = [_prepare_candidate(candidate) for candidate in candidates]
+    if not candidates:
+        return []
+    
+    if scorer is None:
+        from models.scoring import CatalogScorer
+        scorer = CatalogScorer(internships_df, location_df)
+    
+    with METRICS.timer('batch_scoring'):
+        batch_scores = scorer.score_batch(candidates)
+    results = []
+    for row, candidate in enumerate(candidates):
+        with METRICS.timer('sector_filter'):
+            positions = _filter_positions(candidate, scorer)
+        METRICS.observe('postings_scored', len(positions), 'batch')
+        all_scores = {name: values[row][positions] for name, values in batch_scores.items()}
+        with METRICS.timer('reasons'):
+            results.append(_build_recommendations(candidate, scorer, positions, all_scores, top_n))
+    return results
+
+def get_career_path(sector, skills, career_paths_df, index=None):
+    """
+    Get career path based on sector and skills.
+    
+    Among the paths of the sector, the one whose roles share the most skill
+    stems with the candidate's skills is returned (the first path when none
+    do); see CareerPathIndex. Pass the catalog's prebuilt index to avoid
+    building one per call.
+    """
     # Handle invalid inputs
     if sector is None or pd.isna(sector) or sector == "":
         return None
     
     try:
-        # Filter career paths by sector
-        sector_paths = career_paths_df[career_paths_df['Sector'] == sector]
-        
-        if sector_paths.empty:
-            return None
-        
-        # For now, just return the first matching path
-        # In a more advanced system, we could match based on skills too
-        try:
-            return sector_paths.iloc[0].to_dict()
-        except Exception as e:
-            print(f"Error converting career path to dict: {e}")
-            return None
+        if index is None:
+            index = CareerPathIndex(career_paths_df)
+        return index.best_path(sector, skills)
     except Exception as e:
-        print(f"Error retrieving career path for sector '{sector}': {e}")
+        log_sampled(logger, logging.WARNING, 'career_path', "Error retrieving career path for sector '%s': %s", sector, e)
         return None
 
-def get_learning_resources(missing_skills, learning_resources_df):
-    """Get learning resources for missing skills"""
-    resources = []
-    
-    # Handle case where missing_skills is None or not a list
+def _as_skill_list(missing_skills):
+    """missing_skills as a list, or None when it cannot be converted"""
     if missing_skills is None:
-        return resources
-    
-    if not isinstance(missing_skills, list):
-        try:
-            # Try to convert to list if it's something else
-            missing_skills = list(missing_skills)
-        except:
-            print(f"Error: missing_skills is not a list and cannot be converted to a list: {missing_skills}")
-            return resources
-    
+        return []
+    if isinstance(missing_skills, list):
+        return missing_skills
     try:
-        for skill in missing_skills:
-            if skill is None or pd.isna(skill) or skill == "":
-                continue
-                
-            # Find resources for this skill
-            try:
-                skill_resources = learning_resources_df[learning_resources_df['Skill'] == skill]
-                
-                if not skill_resources.empty:
-                    # Add up to 2 resources per skill
-                    for _, resource in skill_resources.head(2).iterrows():
-                        try:
-                            resources.append({
-                                'skill': skill,
-                                'name': resource['Resource_Name'],
-                                'url': resource['Resource_URL']
-                            })
-                        except Exception as e:
-                            print(f"Error adding resource for skill {skill}: {e}")
-            except Exception as e:
-                print(f"Error finding resources for skill {skill}: {e}")
-    except Exception as e:
-        print(f"Error in get_learning_resources: {e}")
-    
-    return resources
+        # Try to convert to list if it's something else
+        return list(missing_skills)
+    except TypeError:
+        logger.warning("missing_skills is not a list and cannot be converted to a list: %s", missing_skills)
+        return None
 
-# Temporarily disabled TF-IDF functionality for basic app startup
-def recommend_jobs_tfidf(user_profile, internships, top_n=5):
+def get_learning_resources(missing_skills, learning_resources_df, index=None):
     """
-    Advanced TF-IDF based recommendation system - TEMPORARILY DISABLED
+    Get learning resources for missing skills (up to 2 per skill).
+    
+    Skills are matched case-insensitively through a LearningResourceIndex;
+    pass the catalog's prebuilt index to avoid building one per call.
     """
-    print("TF-IDF functionality temporarily disabled")
-    return []
+    return get_batch_learning_resources([missing_skills], learning_resources_df, index)[0]
 
-def hybrid_recommendation(user_profile, internships_df, locations_df=None, top_n=5, use_tfidf=False):
+def get_batch_learning_resources(missing_skill_lists, learning_resources_df, index=None):
     """
-    Hybrid recommendation system - using rule-based only for now
+    Learning resources for the missing skills of several recommendations.
+    
+    The union of the skills is looked up once in the index.
+    
+    Args:
+        missing_skill_lists (list): Missing skills of each recommendation
+        learning_resources_df (DataFrame): Learning resources (used when no index is given)
+        index (LearningResourceIndex): Prebuilt index of learning_resources_df
+        
+    Returns:
+        list: Learning resources of each recommendation
     """
-    # Fallback to rule-based recommendations only
-    return get_recommendations(user_profile, internships_df, locations_df, top_n=top_n)
+    skill_lists = [_as_skill_list(missing_skills) for missing_skills in missing_skill_lists]
+    try:
+        if index is None:
+            index = LearningResourceIndex(learning_resources_df)
+        resources = index.batch([skills for skills in skill_lists if skills])
+    except Exception as e:
+        logger.exception("Error in get_learning_resources: %s", e)
+        return [[] for _ in skill_lists]
+    
+    resources = iter(resources)
+    return [next(resources) if skills else [] for skills in skill_lists]
+
+def recommend_jobs_tfidf(user_profile, internships, top_n=5, engine=None):
     """
     Advanced TF-IDF based recommendation system.
     
+    The vectorizer is fitted once per catalog (see models.tfidf_engine), so a
+    request only transforms the user's text and does one sparse product.
+    
     Args:
         user_profile (dict): User profile with skills, education, etc.
-        internships (list): List of internship dictionaries
+        internships (DataFrame): Internships dataframe (a list of internship dicts also works)
         top_n (int): Number of top recommendations to return
+        engine (TfidfEngine): Optional engine prebuilt for internships
         
     Returns:
         list: Ranked internships with similarity scores
     """
     try:
-        if not internships:
-            print("No internships provided for TF-IDF recommendation")
-            return []
-        
-        # Prepare user profile text
-        user_skills = user_profile.get('skills', [])
-        user_education = user_profile.get('education', '')
-        user_sector = user_profile.get('sector', '')
-        user_location = user_profile.get('location', '')
-        user_text = user_profile.get('full_text', '')
-        
-        # Create user profile text
-        if isinstance(user_skills, list):
-            skills_text = ' '.join(user_skills)
-        else:
-            skills_text = str(user_skills)
-            
-        user_profile_text = f"{skills_text} {user_education} {user_sector} {user_location} {user_text}".strip()
-        
-        # Create internship descriptions
-        internship_texts = []
-        for internship in internships:
-            description = internship.get('Description', '')
-            skills_required = internship.get('Skills_Required', '')
-            title = internship.get('Title', '')
-            sector = internship.get('Sector', '')
-            education_req = internship.get('Education_Required', '')
-            
-            # Combine all relevant text fields
-            internship_text = f"{title} {description} {skills_required} {sector} {education_req}".strip()
-            internship_texts.append(internship_text)
-        
-        # Prepare documents for TF-IDF
-        documents = [user_profile_text] + internship_texts
-        
-        # Remove empty documents
-        if not any(doc.strip() for doc in documents):
-            print("No valid text content for TF-IDF analysis")
-            return []
-        
-        # Create TF-IDF vectorizer
-        vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=1000,
-            ngram_range=(1, 2),  # Include both unigrams and bigrams
-            min_df=1,  # Minimum document frequency
-            lowercase=True
-        )
+        from models.tfidf_engine import TfidfEngine
         
-        # Fit and transform documents
-        try:
-            tfidf_matrix = vectorizer.fit_transform(documents)
-        except ValueError as e:
-            print(f"TF-IDF vectorization error: {e}")
+        if not isinstance(internships, pd.DataFrame):
+            internships = pd.DataFrame(list(internships))
+        if internships.empty:
+            logger.warning("No internships provided for TF-IDF recommendation")
             return []
         
-        # Calculate cosine similarity between user profile and internships
-        user_vector = tfidf_matrix[0:1]  # First document is user profile
-        internship_vectors = tfidf_matrix[1:]  # Rest are internships
-        
-        similarities = cosine_similarity(user_vector, internship_vectors).flatten()
+        if engine is None:
+            engine = TfidfEngine.for_dataframe(internships)
+        similarities = engine.score(user_profile)
         
         # Create ranked results
         ranked_internships = []
-        for i, similarity in enumerate(similarities):
-            if i < len(internships):  # Safety check
-                ranked_internships.append({
-                    'internship': internships[i],
-                    'similarity_score': float(similarity),
-                    'rank': i + 1
-                })
-        
-        # Sort by similarity score in descending order
-        ranked_internships.sort(key=lambda x: x['similarity_score'], reverse=True)
-        
-        # Return top N recommendations
-        top_recommendations = ranked_internships[:top_n]
+        for rank, i in enumerate(_top_k_indices(similarities, top_n), 1):
+            ranked_internships.append({
+                'internship': internships.iloc[i],
+                'similarity_score': float(similarities[i]),
+                'rank': rank
+            })
         
-        print(f"TF-IDF recommendation completed. Top similarity scores: {[r['similarity_score'] for r in top_recommendations[:3]]}")
+        logger.debug("TF-IDF recommendation completed. Top similarity scores: %s", [r['similarity_score'] for r in ranked_internships[:3]])
         
-        return top_recommendations
+        return ranked_internships
         
     except Exception as e:
-        print(f"Error in TF-IDF recommendation: {e}")
+        logger.exception("Error in TF-IDF recommendation: %s", e)
         return []
 
-def hybrid_recommendation(user_profile, internships_df, locations_df=None, top_n=5, use_tfidf=True):
+def hybrid_recommendation(user_profile, internships_df, locations_df=None, top_n=5, use_tfidf=True,
+                          scorer=None, engine=None):
     """
     Hybrid recommendation system combining rule-based and TF-IDF approaches.
     
+    The top 2 * top_n rule-based recommendations are re-ranked by a weighted
+    average of their rule-based score (total_score scaled to 0-1) and their
+    TF-IDF cosine similarity.
+    
     Args:
         user_profile (dict): User profile
         internships_df (DataFrame): Internships dataframe
         locations_df (DataFrame): Locations dataframe
         top_n (int): Number of recommendations
         use_tfidf (bool): Whether to use TF-IDF for enhanced scoring
+        scorer (CatalogScorer): Optional scorer prebuilt from internships_df
+        engine (TfidfEngine): Optional TF-IDF engine prebuilt from internships_df
         
     Returns:
         list: Hybrid recommendations with combined scores
     """
     try:
         # Get traditional rule-based recommendations
-        rule_based_recs = get_recommendations(user_profile, internships_df, locations_df, top_n=top_n*2)
+        rule_based_recs = get_recommendations(
+            user_profile, internships_df, locations_df, scorer=scorer, top_n=top_n*2
+        )
         
         if not rule_based_recs:
             return []
@@ -737,48 +524,40 @@ def hybrid_recommendation(user_profile, internships_df, locations_df=None, top_n
         if not use_tfidf:
             return rule_based_recs[:top_n]
         
-        # Convert to list of dictionaries for TF-IDF
-        internships_list = [rec['internship'] for rec in rule_based_recs]
+        from models.scoring import SCORE_WEIGHTS
+        from models.tfidf_engine import TfidfEngine
         
-        # Get TF-IDF recommendations
-        tfidf_recs = recommend_jobs_tfidf(user_profile, internships_list, top_n=len(internships_list))
+        if engine is None:
+            engine = TfidfEngine.for_dataframe(internships_df)
         
-        if not tfidf_recs:
-            print("TF-IDF failed, using rule-based recommendations")
-            return rule_based_recs[:top_n]
+        # TF-IDF similarity of the shortlisted internships only
+        positions = internships_df.index.get_indexer([rec['internship'].name for rec in rule_based_recs])
+        tfidf_scores = engine.score(user_profile, positions)
+        max_rule_score = sum(SCORE_WEIGHTS.values())
         
         # Combine scores (weighted average)
         combined_recs = []
-        for rule_rec in rule_based_recs:
-            # Find corresponding TF-IDF recommendation
-            internship_id = rule_rec['internship'].get('ID', '')
-            tfidf_score = 0
-            
-            for tfidf_rec in tfidf_recs:
-                if tfidf_rec['internship'].get('ID', '') == internship_id:
-                    tfidf_score = tfidf_rec['similarity_score']
-                    break
+        for rule_rec, tfidf_score in zip(rule_based_recs, tfidf_scores):
+            rule_score = rule_rec['total_score'] / max_rule_score
             
             # Combine scores (70% rule-based, 30% TF-IDF)
-            combined_score = (0.7 * rule_rec['score']) + (0.3 * tfidf_score)
+            combined_score = (0.7 * rule_score) + (0.3 * float(tfidf_score))
             
-            combined_rec = {
-                'internship': rule_rec['internship'],
+            combined_rec = dict(rule_rec)
+            combined_rec.update({
                 'score': combined_score,
-                'rule_score': rule_rec['score'],
-                'tfidf_score': tfidf_score,
-                'reason': rule_rec['reason'],
-                'missing_skills': rule_rec.get('missing_skills', [])
-            }
+                'rule_score': rule_score,
+                'tfidf_score': float(tfidf_score)
+            })
             combined_recs.append(combined_rec)
         
-        # Sort by combined score
+        # Sort by combined score (stable, so ties keep the rule-based order)
         combined_recs.sort(key=lambda x: x['score'], reverse=True)
         
-        print(f"Hybrid recommendation completed with {len(combined_recs)} results")
+        logger.debug("Hybrid recommendation completed with %d results", len(combined_recs))
         return combined_recs[:top_n]
         
     except Exception as e:
-        print(f"Error in hybrid recommendation: {e}")
+        logger.exception("Error in hybrid recommendation: %s", e)
         # Fallback to rule-based recommendations
-        return get_recommendations(user_profile, internships_df, locations_df, top_n=top_n)
+        return get_recommendations(user_profile, internships_df, locations_df, scorer=scorer, top_n=top_n)
@@ -0,0 +1,438 @@
+"""
+Vectorized scoring engine for the internship catalog.
+
+The catalog is compiled once into NumPy/SciPy structures (a sparse skill
+incidence matrix, sector and location codes, and a TextFeatureStore for the
+descriptions) so a candidate can be scored against every internship in one
+pass instead of calling the calculate_* functions row by row. The scores are
+identical to the per-row functions in models.recommender.
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from models.skill_index import SKILL_SIMILARITY_MAP, SkillIndex
+from models.recommender import preprocess_skills
+from models.sector_normalizer import sector_match_table
+from models.location_resolver import LocationResolver
+from models.text_features import TextFeatureStore
+
+# Weights used to combine the individual scores into total_score
+SCORE_WEIGHTS = {
+    'skill_match': 2.5,
+    'sector_match': 2,
+    'location_match': 1.5,
+    'text_similarity': 1
+}
+
+
+def _incidence_matrix(rows, n_cols, dtype=np.float64):
+    """Build a CSR matrix from a list of {column_id: value} dicts"""
+    indptr = [0]
+    indices = []
+    data = []
+    for row in rows:
+        indices.extend(row.keys())
+        data.extend(row.values())
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=dtype), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(rows), n_cols)
+    )
+
+
+def _encode(values):
+    """Encode a column as integer codes (-1 for missing) plus the unique values"""
+    codes = np.full(len(values), -1, dtype=np.int64)
+    uniques = []
+    lookup = {}
+    for i, value in enumerate(values):
+        if value is None or pd.isna(value):
+            continue
+        if value not in lookup:
+            lookup[value] = len(uniques)
+            uniques.append(value)
+        codes[i] = lookup[value]
+    return codes, uniques
+
+
+class CatalogScorer:
+    """
+    Precomputed representation of an internships DataFrame that scores a
+    candidate against all postings at once.
+
+    Args:
+        internships_df (DataFrame): Internship catalog
+        location_df (DataFrame): Locations (State, City) used for location matching
+    """
+    def __init__(self, internships_df, location_df):
+        self.location_df = location_df
+        self.columns = internships_df.columns
+        self.index = internships_df.index
+        self._row_values = internships_df.values
+        self.size = len(internships_df)
+        # Retired rows stay in place (so positions are stable) until the catalog is rebuilt
+        self.live = np.ones(self.size, dtype=bool)
+        self.live_positions = np.arange(self.size)
+
+        self._build_skills(internships_df['Skills_Required'].tolist())
+        self._build_sectors(internships_df['Sector'].tolist())
+        self._build_locations(internships_df['Location'].tolist())
+        self.text_features = TextFeatureStore(internships_df['Description'].tolist())
+
+    def with_delta(self, new_rows_df, retired_positions=()):
+        """
+        New scorer with rows appended and rows retired, leaving this one unchanged.
+
+        Only the appended rows are parsed and tokenized; the other structures
+        are extended or shared. Retired rows keep their position but are left
+        out of live_positions and the sector partitions.
+
+        Args:
+            new_rows_df (DataFrame): Postings to append, with this catalog's columns and
+                                     index labels continuing its index
+            retired_positions (array): Positions of the rows to retire
+
+        Returns:
+            CatalogScorer: Scorer of the updated catalog
+        """
+        scorer = copy.copy(self)
+        start = self.size
+        scorer.index = self.index.append(new_rows_df.index)
+        scorer._row_values = np.concatenate([self._row_values, new_rows_df[self.columns].values])
+        scorer.size = start + len(new_rows_df)
+        retired_positions = np.asarray(retired_positions, dtype=np.int64)
+        scorer.live = np.concatenate([self.live, np.ones(len(new_rows_df), dtype=bool)])
+        scorer.live[retired_positions] = False
+        scorer.live_positions = np.flatnonzero(scorer.live)
+
+        scorer._append_skills(new_rows_df['Skills_Required'].tolist())
+        scorer._append_sectors(new_rows_df['Sector'].tolist(), start, retired_positions)
+        scorer._append_locations(new_rows_df['Location'].tolist())
+        scorer.text_features = self.text_features.with_rows(new_rows_df['Description'].tolist())
+        return scorer
+
+    def _skill_rows(self, skills_column):
+        """{skill id: count} per row, adding unseen skills to the vocabulary"""
+        rows = []
+        for skills in skills_column:
+            counts = {}
+            for skill in preprocess_skills(skills):
+                if not skill:
+                    continue
+                skill_id = self.skill_vocab.setdefault(skill.lower().strip(), len(self.skill_vocab))
+                counts[skill_id] = counts.get(skill_id, 0) + 1
+            rows.append(counts)
+        return rows
+
+    def _build_skills(self, skills_column):
+        """Build the skill vocabulary and the sparse skill incidence matrix"""
+        self.skill_vocab = {}
+        rows = self._skill_rows(skills_column)
+
+        self.skill_terms = list(self.skill_vocab)
+        # Counts keep duplicate skills, since the per-row function iterates the raw list
+        self.skill_counts = _incidence_matrix(rows, len(self.skill_vocab))
+        self._finish_skills()
+
+        # Intern the vocabulary in a skill index of this catalog's own, for fuzzy matching;
+        # it is shared with the scorers derived by with_delta and released with them
+        self.skill_index = SkillIndex(SKILL_SIMILARITY_MAP)
+        term_ids = self.skill_index.add_terms(self.skill_terms)
+        self._skill_columns = {term_id: column for column, term_id in enumerate(term_ids)}
+
+    def _append_skills(self, skills_column):
+        """Add the skill rows of appended postings (the vocabulary only grows)"""
+        vocab_size = len(self.skill_vocab)
+        self.skill_vocab = dict(self.skill_vocab)
+        rows = self._skill_rows(skills_column)
+        new_terms = list(self.skill_vocab)[vocab_size:]
+
+        self.skill_terms = self.skill_terms + new_terms
+        counts = self.skill_counts
+        widened = sparse.csr_matrix(
+            (counts.data, counts.indices, counts.indptr), shape=(counts.shape[0], len(self.skill_vocab))
+        )
+        self.skill_counts = sparse.vstack([widened, _incidence_matrix(rows, len(self.skill_vocab))], format='csr')
+        self._finish_skills()
+
+        if new_terms:
+            term_ids = self.skill_index.add_terms(new_terms)
+            self._skill_columns = dict(self._skill_columns)
+            self._skill_columns.update({term_id: vocab_size + i for i, term_id in enumerate(term_ids)})
+
+    def _finish_skills(self):
+        """Structures derived from the skill count matrix"""
+        self.skill_binary = self.skill_counts.copy()
+        self.skill_binary.data[:] = 1
+        self.skill_lengths = np.asarray(self.skill_counts.sum(axis=1)).ravel()
+        self._skill_counts_csc = self.skill_counts.tocsc()
+
+    def _build_sectors(self, sectors):
+        """Encode sectors, partition the rows by sector and precompute sector relatedness"""
+        self.sector_codes, self.sector_values = _encode(sectors)
+        self.sector_ids = {sector: code for code, sector in enumerate(self.sector_values)}
+
+        # Row positions of every sector, in catalog order
+        order = np.argsort(self.sector_codes, kind='stable')
+        counts = np.bincount(self.sector_codes[self.sector_codes >= 0], minlength=len(self.sector_values))
+        offsets = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(self.sector_codes < 0)
+        self.sector_partitions = [order[offsets[code]:offsets[code + 1]] for code in range(len(self.sector_values))]
+
+        # relatedness[a, b] = calculate_sector_match(sector a, sector b)
+        self.sector_relatedness = sector_match_table(self.sector_values, self.sector_values)
+
+    def _append_sectors(self, sectors, start, retired_positions):
+        """Encode the sectors of postings appended at start, and drop retired rows from the partitions"""
+        n_values = len(self.sector_values)
+        self.sector_ids = dict(self.sector_ids)
+        self.sector_values = list(self.sector_values)
+        codes = np.full(len(sectors), -1, dtype=np.int64)
+        for i, sector in enumerate(sectors):
+            if sector is None or pd.isna(sector):
+                continue
+            code = self.sector_ids.get(sector)
+            if code is None:
+                code = self.sector_ids[sector] = len(self.sector_values)
+                self.sector_values.append(sector)
+            codes[i] = code
+        retired_codes = self.sector_codes[retired_positions]
+        self.sector_codes = np.concatenate([self.sector_codes, codes])
+
+        if len(self.sector_values) > n_values:
+            # Only the pairs involving a new sector are scored
+            new_values = self.sector_values[n_values:]
+            relatedness = np.zeros((len(self.sector_values), len(self.sector_values)), dtype=np.float64)
+            relatedness[:n_values, :n_values] = self.sector_relatedness
+            relatedness[n_values:, :] = sector_match_table(new_values, self.sector_values)
+            relatedness[:n_values, n_values:] = sector_match_table(self.sector_values[:n_values], new_values)
+            self.sector_relatedness = relatedness
+
+        # Partitions of untouched sectors are shared with the previous scorer
+        partitions = list(self.sector_partitions) + [np.zeros(0, dtype=np.int64)] * (len(self.sector_values) - n_values)
+        touched = set(retired_codes[retired_codes >= 0].tolist()) | set(codes[codes >= 0].tolist())
+        for code in touched:
+            kept = partitions[code][self.live[partitions[code]]]
+            partitions[code] = np.concatenate([kept, start + np.flatnonzero(codes == code)])
+        self.sector_partitions = partitions
+
+    def sector_match_row(self, candidate_sector):
+        """calculate_sector_match of a candidate sector with every distinct catalog sector"""
+        code = self.sector_ids.get(candidate_sector)
+        if code is not None:
+            return self.sector_relatedness[code]
+        return sector_match_table([candidate_sector], self.sector_values)[0]
+
+    def sector_positions(self, candidate_sector, min_score=None):
+        """
+        Row positions of the internships in a sector, in catalog order.
+
+        With min_score, rows of every sector whose calculate_sector_match with
+        candidate_sector is at least min_score are returned instead.
+        """
+        if min_score is None:
+            code = self.sector_ids.get(candidate_sector)
+            return self.sector_partitions[code] if code is not None else np.zeros(0, dtype=np.int64)
+
+        related = np.flatnonzero(self.sector_match_row(candidate_sector) >= min_score)
+        if not len(related):
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(np.concatenate([self.sector_partitions[code] for code in related]))
+
+    def _build_locations(self, locations):
+        """Pre-resolve every internship location to a lowercased place code and a state code"""
+        self.location_resolver = LocationResolver.for_dataframe(self.location_df)
+        self.place_ids = {}
+        self.place_codes, self.state_codes = self._location_codes(locations)
+
+    def _append_locations(self, locations):
+        """Resolve the locations of appended postings"""
+        self.place_ids = dict(self.place_ids)
+        place_codes, state_codes = self._location_codes(locations)
+        self.place_codes = np.concatenate([self.place_codes, place_codes])
+        self.state_codes = np.concatenate([self.state_codes, state_codes])
+
+    def _location_codes(self, locations):
+        """Place and state codes of locations, adding unseen places to place_ids"""
+        place_codes = np.full(len(locations), -1, dtype=np.int64)
+        state_codes = np.full(len(locations), -1, dtype=np.int64)
+        for i, location in enumerate(locations):
+            if location is None or pd.isna(location):
+                continue
+            place_codes[i] = self.place_ids.setdefault(location.lower(), len(self.place_ids))
+            state_codes[i] = self.location_resolver.state_code(location)
+        return place_codes, state_codes
+
+    def _candidate_skills(self, candidate_skills):
+        """Lowercased, stripped candidate skills in their original order"""
+        if not candidate_skills:
+            return []
+        return [skill.lower().strip() for skill in preprocess_skills(candidate_skills) if skill]
+
+    def _fuzzy_matches(self, candidate):
+        """Fuzzy credit per internship for one candidate's (lowercased) skills"""
+        candidate_set = set(candidate)
+
+        # Only vocabulary skills related to a candidate skill can earn fuzzy credit.
+        # related[column] lists (candidate skill, is alias match) in candidate order.
+        related = {}
+        for candidate_skill in candidate:
+            alias_ids = self.skill_index.alias_term_ids(candidate_skill)
+            for term_id in alias_ids | self.skill_index.partial_term_ids(candidate_skill):
+                column = self._skill_columns.get(term_id)
+                if column is None or self.skill_terms[column] in candidate_set:
+                    continue  # Not in this catalog, or counted as an exact match
+                related.setdefault(column, []).append((candidate_skill, term_id in alias_ids))
+
+        fuzzy_matches = np.zeros(self.size, dtype=np.float64)
+        for skill_id, matches in related.items():
+            start, end = self._skill_counts_csc.indptr[skill_id:skill_id + 2]
+            rows = self._skill_counts_csc.indices[start:end]
+            multiplicity = self._skill_counts_csc.data[start:end]
+
+            # Candidate skills that are also required by the posting are skipped
+            active = np.ones((len(rows), len(matches)), dtype=bool)
+            for j, (candidate_skill, _) in enumerate(matches):
+                candidate_id = self.skill_vocab.get(candidate_skill)
+                if candidate_id is not None:
+                    active[:, j] = self.skill_binary[rows, candidate_id].toarray().ravel() == 0
+
+            is_map = np.array([is_map for _, is_map in matches])
+            map_hits = active & is_map
+            substring_hits = active & ~is_map
+            has_map = map_hits.any(axis=1)
+            first_map = np.where(has_map, map_hits.argmax(axis=1), len(matches))
+            before_first = np.arange(len(matches)) < first_map[:, None]
+            partial = (substring_hits & before_first).sum(axis=1)
+
+            np.add.at(fuzzy_matches, rows, (partial * 0.5 + has_map) * multiplicity)
+        return fuzzy_matches
+
+    def score_skills(self, candidate_skills, positions=None):
+        """Vectorized equivalent of calculate_skill_match for every internship"""
+        return self.score_skills_batch([candidate_skills], positions)[0]
+
+    def score_skills_batch(self, skills_lists, positions=None):
+        """
+        Skill scores for several candidates, one row per candidate.
+
+        Exact matches for the whole batch come from a single product of the
+        candidates' skill incidence matrix with the catalog's. With positions,
+        only those catalog rows are scored (one column per position).
+        """
+        candidates = [self._candidate_skills(skills) for skills in skills_lists]
+        skill_binary = self.skill_binary if positions is None else self.skill_binary[positions]
+        skill_lengths = self.skill_lengths if positions is None else self.skill_lengths[positions]
+        result = np.zeros((len(candidates), len(skill_lengths)), dtype=np.float64)
+
+        # Method 1: Direct exact matches
+        candidate_rows = [
+            {self.skill_vocab[skill]: 1 for skill in candidate if skill in self.skill_vocab}
+            for candidate in candidates
+        ]
+        candidate_matrix = _incidence_matrix(candidate_rows, len(self.skill_vocab))
+        common = (candidate_matrix @ skill_binary.T).toarray()
+        has_skills = skill_lengths > 0
+        lengths = np.where(has_skills, skill_lengths, 1)
+        exact_match_score = common / lengths
+
+        for row, candidate in enumerate(candidates):
+            if not candidate:
+                continue
+            # Method 2: Fuzzy matching
+            fuzzy_matches = self._fuzzy_matches(candidate)
+            if positions is not None:
+                fuzzy_matches = fuzzy_matches[positions]
+            fuzzy_match_score = np.minimum(fuzzy_matches / lengths, 1.0)
+
+            # Method 3: Weighted score
+            total_score = (exact_match_score[row] * 0.8) + (fuzzy_match_score * 0.2)
+            result[row, has_skills] = np.minimum(total_score, 1.0)[has_skills]
+        return result
+
+    def score_sectors(self, candidate_sector, positions=None):
+        """Vectorized equivalent of calculate_sector_match for every internship"""
+        # Missing sectors (code -1) pick the trailing 0
+        lookup = np.append(self.sector_match_row(candidate_sector), 0)
+        sector_codes = self.sector_codes if positions is None else self.sector_codes[positions]
+        return lookup[sector_codes]
+
+    def score_locations(self, candidate_location, positions=None):
+        """Vectorized equivalent of calculate_location_match for every internship"""
+        place_codes = self.place_codes if positions is None else self.place_codes[positions]
+        state_codes = self.state_codes if positions is None else self.state_codes[positions]
+        result = np.zeros(len(place_codes), dtype=np.float64)
+        if candidate_location is None or pd.isna(candidate_location):
+            return result
+
+        # Same state scores 0.5, then an exact (case-insensitive) place match scores 1
+        state_code = self.location_resolver.state_code(candidate_location)
+        if state_code >= 0:
+            result[state_codes == state_code] = 0.5
+        place_code = self.place_ids.get(candidate_location.lower())
+        if place_code is not None:
+            result[place_codes == place_code] = 1
+        return result
+
+    def score_text(self, candidate_text, positions=None):
+        """Vectorized equivalent of calculate_text_similarity for every internship"""
+        return self.score_text_batch([candidate_text], positions)[0]
+
+    def score_text_batch(self, candidate_texts, positions=None):
+        """Text similarity for several candidates, one row per candidate"""
+        return self.text_features.score_batch(candidate_texts, positions)
+
+    def score(self, candidate, positions=None):
+        """
+        Score a candidate against the catalog in one vectorized pass.
+
+        Args:
+            candidate (dict): Candidate profile with skills, sector, location and full_text
+            positions (array): Optional row positions; only those rows are scored
+
+        Returns:
+            dict: Arrays for skill_match, sector_match, location_match,
+                  text_similarity and total_score
+        """
+        return {name: values[0] for name, values in self.score_batch([candidate], positions).items()}
+
+    def score_batch(self, candidates, positions=None):
+        """
+        Score several candidates against the catalog at once.
+
+        Args:
+            candidates (list): Candidate profile dicts
+            positions (array): Optional row positions; only those rows are scored
+
+        Returns:
+            dict: 2-D arrays (one row per candidate, one column per scored
+                  internship) for skill_match, sector_match, location_match,
+                  text_similarity and total_score
+        """
+        size = self.size if positions is None else len(positions)
+        scores = {
+            'skill_match': self.score_skills_batch(
+                [candidate.get('skills', []) for candidate in candidates], positions
+            ),
+            'sector_match': np.array(
+                [self.score_sectors(candidate.get('sector', ''), positions) for candidate in candidates]
+            ).reshape(len(candidates), size),
+            'location_match': np.array(
+                [self.score_locations(candidate.get('location', ''), positions) for candidate in candidates]
+            ).reshape(len(candidates), size),
+            'text_similarity': self.score_text_batch(
+                [candidate.get('full_text', '') for candidate in candidates], positions
+            )
+        }
+
+        scores['total_score'] = (scores['skill_match'] * SCORE_WEIGHTS['skill_match']) + \
+                                (scores['sector_match'] * SCORE_WEIGHTS['sector_match']) + \
+                                (scores['location_match'] * SCORE_WEIGHTS['location_match']) + \
+                                (scores['text_similarity'] * SCORE_WEIGHTS['text_similarity'])
+        return scores
+
+    def row(self, position):
+        """Return an internship row as a Series, the same way iterrows() builds it"""
+        return pd.Series(self._row_values[position], index=self.columns, name=self.index[position])
@@ -0,0 +1,213 @@
+"""
+Sector normalization and sector relatedness.
+
+The alias tables behind normalize_sector and calculate_sector_match are
+compiled once at import: free-text sectors resolve through an exact map,
+then an Aho-Corasick automaton over the aliases (aliases contained in the
+text) and a table of every alias substring (text contained in an alias),
+keeping the priority order of SECTOR_NORMALIZATIONS. Results of both
+functions are memoized in bounded caches, and sector_match_table computes
+the full score table of two lists of sectors for catalog-wide scoring.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from utils.skill_matcher import AhoCorasick
+
+# Mapping user input to actual sectors in dataset; on partial matches the
+# first alias in this order wins
+SECTOR_NORMALIZATIONS = {
+    'pharmacy': 'Healthcare',
+    'pharmaceutical': 'Healthcare',
+    'medical': 'Healthcare',
+    'health': 'Healthcare',
+    'healthcare': 'Healthcare',
+    'hospital': 'Healthcare',
+    'medicine': 'Healthcare',
+    'pharma': 'Healthcare',
+
+    'it': 'IT',
+    'software': 'IT',
+    'technology': 'IT',
+    'computer': 'IT',
+    'programming': 'IT',
+    'tech': 'IT',
+    'information technology': 'IT',
+
+    'business': 'Business',
+    'marketing': 'Business',
+    'sales': 'Business',
+    'management': 'Business',
+    'commerce': 'Business',
+    'mba': 'Business',
+
+    'finance': 'Finance',
+    'banking': 'Finance',
+    'financial': 'Finance',
+    'accounting': 'Finance',
+    'investment': 'Finance',
+
+    'engineering': 'Engineering',
+    'mechanical': 'Engineering',
+    'civil': 'Engineering',
+    'electrical': 'Engineering',
+    'chemical': 'Engineering',
+    'automotive': 'Engineering',
+
+    'education': 'Education',
+    'teaching': 'Education',
+    'academic': 'Education',
+    'training': 'Education',
+    'learning': 'Education',
+
+    'design': 'Creative',
+    'creative': 'Creative',
+    'art': 'Creative',
+    'graphic': 'Creative',
+    'ui': 'Creative',
+    'ux': 'Creative',
+
+    'social': 'Social Work',
+    'ngo': 'Social Work',
+    'community': 'Social Work',
+    'social work': 'Social Work',
+
+    'media': 'Media',
+    'journalism': 'Media',
+    'communication': 'Media',
+    'content': 'Media'
+}
+
+# Handle common sector variations and related fields
+SECTOR_MAPPINGS = {
+    'pharmacy': ['healthcare', 'pharmaceutical', 'medical', 'health'],
+    'healthcare': ['pharmacy', 'pharmaceutical', 'medical', 'health', 'hospital'],
+    'pharmaceutical': ['pharmacy', 'healthcare', 'medical', 'health'],
+    'medical': ['healthcare', 'pharmacy', 'pharmaceutical', 'health'],
+    'it': ['information technology', 'software', 'technology', 'computer science', 'tech'],
+    'software': ['it', 'information technology', 'technology', 'computer science', 'tech'],
+    'technology': ['it', 'software', 'information technology', 'tech'],
+    'business': ['marketing', 'management', 'finance', 'sales', 'commerce'],
+    'marketing': ['business', 'digital marketing', 'advertising', 'sales'],
+    'finance': ['business', 'banking', 'accounting', 'financial'],
+    'engineering': ['mechanical', 'civil', 'electrical', 'chemical', 'automotive'],
+    'education': ['teaching', 'academic', 'training', 'learning'],
+    'design': ['graphic design', 'ui/ux', 'creative', 'art']
+}
+
+# Number of distinct sector strings / sector pairs kept by the memoized lookups
+SECTOR_CACHE_SIZE = 1024
+SECTOR_PAIR_CACHE_SIZE = 8192
+
+# Aliases in priority order
+_ALIASES = list(SECTOR_NORMALIZATIONS)
+
+# Aliases contained in a text are found in one scan
+_ALIAS_AUTOMATON = AhoCorasick(_ALIASES)
+
+
+def _substring_priorities(aliases):
+    """Every substring of every alias (the empty one included) -> index of the first alias containing it"""
+    first = {}
+    for index, alias in enumerate(aliases):
+        for start in range(len(alias) + 1):
+            for end in range(start, len(alias) + 1):
+                first.setdefault(alias[start:end], index)
+    return first
+
+
+# Texts contained in an alias resolve with one lookup
+_ALIAS_SUBSTRINGS = _substring_priorities(_ALIASES)
+
+
+@lru_cache(maxsize=SECTOR_CACHE_SIZE)
+def _normalize(user_sector):
+    user_lower = user_sector.lower().strip()
+
+    # Direct match
+    if user_lower in SECTOR_NORMALIZATIONS:
+        return SECTOR_NORMALIZATIONS[user_lower]
+
+    # Partial match: the first alias that is contained in the text or contains it
+    best = _ALIAS_SUBSTRINGS.get(user_lower, len(_ALIASES))
+    for _, _, alias_index in _ALIAS_AUTOMATON.iter_matches(user_lower):
+        best = min(best, alias_index)
+    if best < len(_ALIASES):
+        return SECTOR_NORMALIZATIONS[_ALIASES[best]]
+
+    # Return original if no mapping found
+    return user_sector.title()
+
+
+def normalize_sector(user_sector):
+    """Normalize user input sector to match dataset sectors"""
+    if not user_sector or pd.isna(user_sector):
+        return ""
+    return _normalize(user_sector)
+
+
+@lru_cache(maxsize=SECTOR_PAIR_CACHE_SIZE)
+def _sector_match(candidate_lower, internship_lower):
+    # Exact match
+    if candidate_lower == internship_lower:
+        return 1
+
+    # Check if candidate sector maps to internship sector
+    if candidate_lower in SECTOR_MAPPINGS:
+        for related_sector in SECTOR_MAPPINGS[candidate_lower]:
+            if related_sector in internship_lower:
+                return 0.8  # High but not perfect match for related sectors
+
+    # Check if internship sector maps to candidate sector
+    if internship_lower in SECTOR_MAPPINGS:
+        for related_sector in SECTOR_MAPPINGS[internship_lower]:
+            if related_sector in candidate_lower:
+                return 0.8
+
+    # Partial string matching for longer sector names
+    if len(candidate_lower) > 3 and len(internship_lower) > 3:
+        if candidate_lower in internship_lower or internship_lower in candidate_lower:
+            return 0.6
+
+    return 0
+
+
+def calculate_sector_match(candidate_sector, internship_sector):
+    """Enhanced sector match between candidate and internship with fuzzy matching"""
+    if pd.isna(candidate_sector) or pd.isna(internship_sector):
+        return 0
+    return _sector_match(candidate_sector.lower().strip(), internship_sector.lower().strip())
+
+
+def sector_match_table(candidate_sectors, internship_sectors):
+    """
+    calculate_sector_match of every pair of sectors.
+
+    Sectors differing only in case or surrounding spaces are scored once.
+
+    Args:
+        candidate_sectors (list): Sectors of the rows
+        internship_sectors (list): Sectors of the columns
+
+    Returns:
+        array: table[i, j] = calculate_sector_match(candidate_sectors[i], internship_sectors[j])
+    """
+    row_keys, row_codes = _lowered_codes(candidate_sectors)
+    column_keys, column_codes = _lowered_codes(internship_sectors)
+    # Missing sectors take the trailing zero row / column
+    table = np.zeros((len(row_keys) + 1, len(column_keys) + 1), dtype=np.float64)
+    for i, candidate_lower in enumerate(row_keys):
+        for j, internship_lower in enumerate(column_keys):
+            table[i, j] = _sector_match(candidate_lower, internship_lower)
+    return table[np.ix_(row_codes, column_codes)]
+
+
+def _lowered_codes(sectors):
+    """Distinct lowercased sectors and the code of each sector (-1 when missing)"""
+    keys = {}
+    codes = np.empty(len(sectors), dtype=np.int64)
+    for i, sector in enumerate(sectors):
+        codes[i] = -1 if pd.isna(sector) else keys.setdefault(sector.lower().strip(), len(keys))
+    return list(keys), codes
@@ -0,0 +1,189 @@
+"""
+Canonical skill index used for fuzzy skill matching.
+
+Every alias in SKILL_SIMILARITY_MAP resolves to the canonical skill ids of
+the groups it belongs to, so two skills are related when their id sets
+intersect. Known skill terms are interned to integer ids together with a
+substring-containment table for the partial-credit rule (both skills longer
+than 4 characters and one contained in the other).
+
+The shared SKILL_INDEX interns the aliases only. Each CatalogScorer interns
+its catalog's skills in a SkillIndex of its own, so the vocabulary of
+replaced catalogs is released with them and request input is never interned.
+"""
+import threading
+
+# Related skill names used for fuzzy matching in calculate_skill_match
+SKILL_SIMILARITY_MAP = {
+    # Programming languages
+    'python': ['py', 'python3', 'python2'],
+    'javascript': ['js', 'node.js', 'nodejs', 'ecmascript'],
+    'java': ['openjdk', 'oracle java'],
+    'c++': ['cpp', 'c plus plus'],
+    'c#': ['csharp', 'c sharp', 'dotnet'],
+
+    # Web technologies
+    'html': ['html5', 'hyper text markup language'],
+    'css': ['css3', 'cascading style sheets'],
+    'react': ['reactjs', 'react.js'],
+    'angular': ['angularjs'],
+    'vue': ['vuejs', 'vue.js'],
+
+    # Databases
+    'sql': ['mysql', 'postgresql', 'sqlite', 'mssql'],
+    'mongodb': ['mongo', 'nosql'],
+
+    # Tools and frameworks
+    'git': ['github', 'gitlab', 'version control'],
+    'docker': ['containerization'],
+    'kubernetes': ['k8s', 'orchestration'],
+
+    # Data science
+    'machine learning': ['ml', 'artificial intelligence', 'ai'],
+    'data analysis': ['data analytics', 'data science'],
+    'tensorflow': ['tf'],
+    'pytorch': ['torch'],
+
+    # Design
+    'photoshop': ['adobe photoshop', 'ps'],
+    'illustrator': ['adobe illustrator', 'ai'],
+    'figma': ['ui design', 'ux design'],
+}
+
+# Skills must be longer than this to earn partial credit for substring matches
+PARTIAL_MATCH_MIN_LENGTH = 4
+
+_NO_GROUPS = frozenset()
+
+
+def _substrings(term):
+    """All proper substrings of a term that are long enough for partial credit"""
+    length = len(term)
+    found = set()
+    for size in range(PARTIAL_MATCH_MIN_LENGTH + 1, length):
+        for start in range(length - size + 1):
+            found.add(term[start:start + size])
+    return found
+
+
+class SkillIndex:
+    """
+    Alias groups plus an interned vocabulary of lowercased skill terms.
+
+    Args:
+        similarity_map (dict): Canonical skill -> list of aliases
+    """
+    def __init__(self, similarity_map):
+        self.canonical_skills = list(similarity_map)
+        self.alias_groups = {}
+        for canonical_id, (base_skill, variations) in enumerate(similarity_map.items()):
+            for alias in [base_skill] + list(variations):
+                self.alias_groups[alias] = self.alias_groups.get(alias, _NO_GROUPS) | {canonical_id}
+
+        self.terms = []
+        self.term_ids = {}
+        self._partial = []
+        self._group_members = {}
+        self._containing = {}
+        self._lock = threading.Lock()
+
+    def groups(self, skill):
+        """Canonical skill ids a lowercased skill belongs to"""
+        return self.alias_groups.get(skill, _NO_GROUPS)
+
+    def is_alias_match(self, skill_a, skill_b):
+        """True when both skills are aliases of a common canonical skill"""
+        return not self.groups(skill_a).isdisjoint(self.groups(skill_b))
+
+    def is_partial_match(self, skill_a, skill_b):
+        """True when the substring partial-credit rule applies to the pair"""
+        if len(skill_a) <= PARTIAL_MATCH_MIN_LENGTH or len(skill_b) <= PARTIAL_MATCH_MIN_LENGTH:
+            return False
+        id_a = self.term_ids.get(skill_a)
+        id_b = self.term_ids.get(skill_b)
+        if id_a is not None and id_b is not None:
+            return id_b in self._partial[id_a]
+        return skill_a in skill_b or skill_b in skill_a
+
+    def fuzzy_credit(self, internship_skill, candidate_skills):
+        """
+        Fuzzy credit one internship skill earns from the candidate's skills.
+
+        Candidate skills are checked in order: each substring match adds 0.5
+        until the first alias match, which adds 1 and stops the scan.
+        """
+        internship_groups = self.groups(internship_skill)
+        credit = 0
+        for candidate_skill in candidate_skills:
+            if internship_groups and not internship_groups.isdisjoint(self.groups(candidate_skill)):
+                return credit + 1
+            if self.is_partial_match(internship_skill, candidate_skill):
+                credit += 0.5
+        return credit
+
+    def add_terms(self, terms):
+        """
+        Intern lowercased skill terms and extend the substring table.
+
+        Returns:
+            list: Term ids in the same order as terms
+        """
+        ids = []
+        with self._lock:
+            for term in terms:
+                term_id = self.term_ids.get(term)
+                if term_id is None:
+                    term_id = self._intern(term)
+                ids.append(term_id)
+        return ids
+
+    def _intern(self, term):
+        term_id = len(self.terms)
+
+        partial = set()
+        if len(term) > PARTIAL_MATCH_MIN_LENGTH:
+            partial.update(self._containing.get(term, ()))
+            for substring in _substrings(term):
+                other_id = self.term_ids.get(substring)
+                if other_id is not None:
+                    partial.add(other_id)
+                self._containing.setdefault(substring, set()).add(term_id)
+        self._partial.append(frozenset(partial))
+        self.terms.append(term)
+
+        # Per-term tables are replaced rather than mutated so lock-free readers never see a partial update
+        for other_id in partial:
+            self._partial[other_id] = self._partial[other_id] | {term_id}
+        for canonical_id in self.groups(term):
+            self._group_members[canonical_id] = self._group_members.get(canonical_id, _NO_GROUPS) | {term_id}
+
+        # Publish the id last, once every table knows about it
+        self.term_ids[term] = term_id
+        return term_id
+
+    def alias_term_ids(self, skill):
+        """Ids of interned terms that share a canonical skill with skill"""
+        members = set()
+        for canonical_id in self.groups(skill):
+            members.update(self._group_members.get(canonical_id, ()))
+        return members
+
+    def partial_term_ids(self, skill):
+        """Ids of interned terms that earn substring partial credit with skill"""
+        term_id = self.term_ids.get(skill)
+        if term_id is not None:
+            return self._partial[term_id]
+        if len(skill) <= PARTIAL_MATCH_MIN_LENGTH:
+            return _NO_GROUPS
+        with self._lock:
+            partial = set(self._containing.get(skill, ()))
+        for substring in _substrings(skill):
+            other_id = self.term_ids.get(substring)
+            if other_id is not None:
+                partial.add(other_id)
+        return partial
+
+
+# Shared index of the aliases, built once at import
+SKILL_INDEX = SkillIndex(SKILL_SIMILARITY_MAP)
+SKILL_INDEX.add_terms(SKILL_INDEX.alias_groups)
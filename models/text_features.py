@@ -0,0 +1,289 @@
+"""
+Tokenized text features for description similarity.
+
+A text is lowercased and tokenized once into its set of non stop-word
+tokens, its set of token bigrams and a bitmask of the important keywords it
+contains, so calculate_text_similarity reduces to set intersections and a
+bitmask AND. TextFeatureStore holds these features for every description of
+a catalog, built at load time, together with the sparse matrices used to
+score many postings at once.
+"""
+import copy
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Common stop words ignored by calculate_text_similarity
+TEXT_STOP_WORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'}
+
+# Important keywords that should have higher weight in text similarity
+IMPORTANT_KEYWORDS = {
+    'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node',
+    'machine learning', 'data science', 'artificial intelligence',
+    'web development', 'mobile development', 'software engineering',
+    'database', 'sql', 'mongodb', 'postgresql',
+    'cloud', 'aws', 'azure', 'gcp',
+    'devops', 'docker', 'kubernetes',
+    'frontend', 'backend', 'fullstack',
+    'api', 'rest', 'graphql',
+    'testing', 'automation', 'ci/cd',
+    'agile', 'scrum', 'project management'
+}
+
+# Keywords in a fixed order: bit k of a keyword mask is KEYWORD_LIST[k]
+KEYWORD_LIST = sorted(IMPORTANT_KEYWORDS)
+
+# Number of distinct texts whose features are kept for calculate_text_similarity
+TEXT_FEATURE_CACHE_SIZE = 4096
+
+# Cached features keyed by a hash of the text, so the (resume) texts themselves are not kept
+_feature_cache = OrderedDict()
+_feature_cache_lock = threading.Lock()
+
+# words: frozenset of tokens without stop words, bigrams: frozenset of token
+# pairs, keywords: int bitmask over KEYWORD_LIST
+TextFeatures = namedtuple('TextFeatures', ['words', 'bigrams', 'keywords'])
+
+
+def _compute_features(text):
+    """Features of an already lowercased, non-blank text (None when it has no usable words)"""
+    tokens = re.findall(r'\b\w+\b', text)
+    words = frozenset(tokens) - TEXT_STOP_WORDS
+    if not words:
+        return None
+    keywords = 0
+    for k, keyword in enumerate(KEYWORD_LIST):
+        if keyword in text:
+            keywords |= 1 << k
+    return TextFeatures(words, frozenset(zip(tokens[:-1], tokens[1:])), keywords)
+
+
+def _cached_features(text):
+    """_compute_features, cached by a hash of the text"""
+    # str hashes are keyed with a per-process random secret, so colliding texts cannot be crafted
+    key = (hash(text), len(text))
+    with _feature_cache_lock:
+        if key in _feature_cache:
+            _feature_cache.move_to_end(key)
+            return _feature_cache[key]
+
+    features = _compute_features(text)
+    with _feature_cache_lock:
+        _feature_cache[key] = features
+        _feature_cache.move_to_end(key)
+        while len(_feature_cache) > TEXT_FEATURE_CACHE_SIZE:
+            _feature_cache.popitem(last=False)
+    return features
+
+
+def extract_text_features(text, cache=True):
+    """
+    Tokenize a text for similarity scoring.
+
+    Args:
+        text (str): Resume text or internship description
+        cache (bool): Reuse the features of recently seen texts
+
+    Returns:
+        TextFeatures: Features of the text, or None when it is missing, blank
+                      or only made of stop words (similarity is then 0)
+    """
+    if text is None or pd.isna(text):
+        return None
+    text = str(text).lower()
+    if not text.strip():
+        return None
+    return _cached_features(text) if cache else _compute_features(text)
+
+
+def _popcount(mask):
+    return bin(mask).count('1')
+
+
+def text_similarity(candidate, internship):
+    """
+    Similarity of two TextFeatures, as computed by calculate_text_similarity.
+
+    40% word Jaccard, 40% share of the internship's important keywords also
+    in the candidate text, 20% bigram Jaccard; capped at 1.
+    """
+    if candidate is None or internship is None:
+        return 0
+
+    common_words = len(candidate.words & internship.words)
+    basic_similarity = common_words / (len(candidate.words) + len(internship.words) - common_words)
+
+    total_important = _popcount(internship.keywords)
+    keyword_similarity = _popcount(candidate.keywords & internship.keywords) / total_important if total_important else 0
+
+    if candidate.bigrams and internship.bigrams:
+        common_bigrams = len(candidate.bigrams & internship.bigrams)
+        bigram_similarity = common_bigrams / (len(candidate.bigrams) + len(internship.bigrams) - common_bigrams)
+    else:
+        bigram_similarity = 0
+
+    final_similarity = (basic_similarity * 0.4) + (keyword_similarity * 0.4) + (bigram_similarity * 0.2)
+    return min(final_similarity, 1.0)
+
+
+def _id_matrix(id_sets, n_cols):
+    """Sparse 0/1 matrix with one row per set of column ids"""
+    indptr = np.zeros(len(id_sets) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(ids) for ids in id_sets])
+    indices = np.fromiter((i for ids in id_sets for i in ids), dtype=np.int64, count=indptr[-1])
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(id_sets), n_cols))
+
+
+def _append_rows(matrix, rows):
+    """Stack CSR rows under a CSR matrix, widening it to the (possibly larger) column count of rows"""
+    widened = sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], rows.shape[1]))
+    return sparse.vstack([widened, rows], format='csr')
+
+
+class TextFeatureStore:
+    """
+    Text features of every description in a catalog.
+
+    Token and bigram sets are interned to integer ids per catalog and kept as
+    sparse 0/1 matrices (one row per posting); keyword presence is kept as a
+    bitmask per posting. with_rows appends postings without re-tokenizing
+    the existing ones.
+
+    Args:
+        descriptions (list): Internship descriptions in catalog order
+    """
+    def __init__(self, descriptions):
+        self.size = 0
+        self.word_vocab = {}
+        self.bigram_vocab = {}
+        self.features = []
+        self.word_ids = []
+        self.bigram_ids = []
+        self.keyword_masks = np.zeros(0, dtype=np.uint64)
+        self.valid = np.zeros(0, dtype=bool)
+        self.word_matrix = _id_matrix([], 0)
+        self.word_lengths = np.zeros(0, dtype=np.float64)
+        self.bigram_matrix = _id_matrix([], 0)
+        self.bigram_lengths = np.zeros(0, dtype=np.float64)
+        self.keyword_matrix = np.zeros((0, len(KEYWORD_LIST)), dtype=np.float64)
+        self.keyword_totals = np.zeros(0, dtype=np.float64)
+        self._append(descriptions)
+
+    def with_rows(self, descriptions):
+        """
+        New store with descriptions appended after the existing rows.
+
+        Only the new descriptions are tokenized; the vocabularies are copied so
+        this store is left unchanged.
+        """
+        store = copy.copy(self)
+        store.word_vocab = dict(self.word_vocab)
+        store.bigram_vocab = dict(self.bigram_vocab)
+        store.features = list(self.features)
+        store.word_ids = list(self.word_ids)
+        store.bigram_ids = list(self.bigram_ids)
+        store._append(descriptions)
+        return store
+
+    def _append(self, descriptions):
+        """Tokenize descriptions and add them as new rows"""
+        start = self.size
+        keyword_masks = np.zeros(len(descriptions), dtype=np.uint64)
+        valid = np.zeros(len(descriptions), dtype=bool)
+
+        for i, description in enumerate(descriptions):
+            # Not cached: catalog descriptions would only evict request texts
+            features = extract_text_features(description, cache=False)
+            self.features.append(features)
+            if features is None:
+                self.word_ids.append(frozenset())
+                self.bigram_ids.append(frozenset())
+                continue
+            valid[i] = True
+            self.word_ids.append(frozenset(
+                self.word_vocab.setdefault(word, len(self.word_vocab)) for word in features.words
+            ))
+            self.bigram_ids.append(frozenset(
+                self.bigram_vocab.setdefault(bigram, len(self.bigram_vocab)) for bigram in features.bigrams
+            ))
+            keyword_masks[i] = features.keywords
+
+        word_ids, bigram_ids = self.word_ids[start:], self.bigram_ids[start:]
+        self.size = len(self.features)
+        self.keyword_masks = np.concatenate([self.keyword_masks, keyword_masks])
+        self.valid = np.concatenate([self.valid, valid])
+        self.word_matrix = _append_rows(self.word_matrix, _id_matrix(word_ids, len(self.word_vocab)))
+        self.word_lengths = np.concatenate([self.word_lengths, [len(ids) for ids in word_ids]])
+        self.bigram_matrix = _append_rows(self.bigram_matrix, _id_matrix(bigram_ids, len(self.bigram_vocab)))
+        self.bigram_lengths = np.concatenate([self.bigram_lengths, [len(ids) for ids in bigram_ids]])
+
+        # Keyword bitmasks unpacked to a dense 0/1 matrix for batched scoring
+        bits = np.arange(len(KEYWORD_LIST), dtype=np.uint64)
+        keyword_matrix = ((keyword_masks[:, None] >> bits) & np.uint64(1)).astype(np.float64)
+        self.keyword_matrix = np.concatenate([self.keyword_matrix, keyword_matrix])
+        self.keyword_totals = np.concatenate([self.keyword_totals, keyword_matrix.sum(axis=1)])
+
+    def score_batch(self, candidate_texts, positions=None):
+        """
+        Similarity of several candidate texts with every posting.
+
+        Args:
+            candidate_texts (list): Resume texts
+            positions (array): Optional posting positions; only those are scored
+
+        Returns:
+            array: One row per candidate text, one column per (scored) posting
+        """
+        if positions is None:
+            word_matrix, word_lengths = self.word_matrix, self.word_lengths
+            bigram_matrix, bigram_lengths = self.bigram_matrix, self.bigram_lengths
+            keyword_matrix, keyword_totals, valid = self.keyword_matrix, self.keyword_totals, self.valid
+        else:
+            word_matrix, word_lengths = self.word_matrix[positions], self.word_lengths[positions]
+            bigram_matrix, bigram_lengths = self.bigram_matrix[positions], self.bigram_lengths[positions]
+            keyword_matrix, keyword_totals = self.keyword_matrix[positions], self.keyword_totals[positions]
+            valid = self.valid[positions]
+        result = np.zeros((len(candidate_texts), len(valid)), dtype=np.float64)
+
+        # Each candidate text is tokenized once per request
+        parsed = [extract_text_features(text) for text in candidate_texts]
+        rows = [row for row, features in enumerate(parsed) if features is not None]
+        if not rows:
+            return result
+        candidates = [parsed[row] for row in rows]
+
+        # Method 1: Jaccard similarity of the word sets
+        word_ids = [[self.word_vocab[w] for w in c.words if w in self.word_vocab] for c in candidates]
+        common_words = (_id_matrix(word_ids, len(self.word_vocab)) @ word_matrix.T).toarray()
+        word_counts = np.array([len(c.words) for c in candidates], dtype=np.float64)
+        union_words = word_lengths + word_counts[:, None] - common_words
+        basic_similarity = common_words / np.where(union_words > 0, union_words, 1)
+
+        # Method 2: Important keyword matches
+        bits = np.arange(len(KEYWORD_LIST), dtype=np.uint64)
+        candidate_masks = np.array([c.keywords for c in candidates], dtype=np.uint64)
+        candidate_keywords = ((candidate_masks[:, None] >> bits) & np.uint64(1)).astype(np.float64)
+        important_matches = candidate_keywords @ keyword_matrix.T
+        has_keywords = keyword_totals > 0
+        keyword_similarity = np.where(
+            has_keywords,
+            important_matches / np.where(has_keywords, keyword_totals, 1),
+            0
+        )
+
+        # Method 3: Bigram similarity (zero for candidates or postings without bigrams)
+        bigram_ids = [[self.bigram_vocab[b] for b in c.bigrams if b in self.bigram_vocab] for c in candidates]
+        common_bigrams = (_id_matrix(bigram_ids, len(self.bigram_vocab)) @ bigram_matrix.T).toarray()
+        bigram_counts = np.array([len(c.bigrams) for c in candidates], dtype=np.float64)
+        has_bigrams = (bigram_lengths > 0) & (bigram_counts[:, None] > 0)
+        union_bigrams = bigram_lengths + bigram_counts[:, None] - common_bigrams
+        bigram_similarity = np.where(has_bigrams, common_bigrams / np.where(has_bigrams, union_bigrams, 1), 0)
+
+        final_similarity = (basic_similarity * 0.4) + (keyword_similarity * 0.4) + (bigram_similarity * 0.2)
+        result[rows] = np.where(valid, np.minimum(final_similarity, 1.0), 0)
+        return result
@@ -0,0 +1,209 @@
+"""
+TF-IDF retrieval over the internship catalog.
+
+The vectorizer is fitted once per catalog, on the title, description,
+skills, sector and education of every posting, and the L2-normalized
+document matrix is kept in memory (and optionally persisted with joblib).
+Scoring a request then only transforms the candidate's text and does one
+sparse matrix-vector product: with unit-length rows, the dot product is the
+cosine similarity.
+"""
+import copy
+import hashlib
+import logging
+import os
+import threading
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+# Handle potential missing dependencies gracefully
+try:
+    import joblib
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    tfidf_available = True
+except ImportError:
+    joblib = None
+    TfidfVectorizer = None
+    tfidf_available = False
+    warnings.warn("scikit-learn not installed. TF-IDF ranking will not be available.")
+
+# Catalog fields combined into each posting's document
+DOCUMENT_FIELDS = ['Title', 'Description', 'Skills_Required', 'Sector', 'Education_Required']
+
+# Vectorizer settings (bumping ENGINE_VERSION invalidates persisted engines)
+VECTORIZER_PARAMS = {
+    'stop_words': 'english',
+    'ngram_range': (1, 2),  # Include both unigrams and bigrams
+    'min_df': 1,
+    'max_features': 50000,
+    'lowercase': True
+}
+ENGINE_VERSION = 1
+
+# Number of engines kept for distinct internships DataFrames
+_ENGINE_CACHE_SIZE = 4
+
+_engine_cache = OrderedDict()
+_engine_cache_lock = threading.Lock()
+
+
+def _field_text(value):
+    if value is None or pd.isna(value):
+        return ''
+    return str(value)
+
+
+def catalog_documents(internships_df):
+    """One text per posting combining all relevant fields"""
+    columns = [
+        internships_df[field].tolist() if field in internships_df.columns else [''] * len(internships_df)
+        for field in DOCUMENT_FIELDS
+    ]
+    return [' '.join(_field_text(value) for value in values).strip() for values in zip(*columns)]
+
+
+def profile_text(user_profile):
+    """Text of a candidate profile: skills, education, sector, location and resume text"""
+    user_skills = user_profile.get('skills') or []
+    if isinstance(user_skills, list):
+        skills_text = ' '.join(str(skill) for skill in user_skills)
+    else:
+        skills_text = str(user_skills)
+    parts = [skills_text] + [
+        _field_text(user_profile.get(key)) for key in ('education', 'sector', 'location', 'full_text')
+    ]
+    return ' '.join(parts).strip()
+
+
+def _fingerprint(documents):
+    """Hash of the documents and vectorizer settings a persisted engine was fitted on"""
+    digest = hashlib.sha1(repr((ENGINE_VERSION, sorted(VECTORIZER_PARAMS.items()))).encode('utf-8'))
+    for document in documents:
+        digest.update(document.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class TfidfEngine:
+    """
+    Fitted TF-IDF vectorizer plus the catalog's L2-normalized document matrix.
+
+    Args:
+        internships_df (DataFrame): Internship catalog
+    """
+    def __init__(self, internships_df, _state=None):
+        if not tfidf_available:
+            raise ImportError("scikit-learn is required for TF-IDF ranking")
+
+        if _state is None:
+            documents = catalog_documents(internships_df)
+            _state = {'fingerprint': _fingerprint(documents)}
+            _state['vectorizer'] = TfidfVectorizer(**VECTORIZER_PARAMS)
+            try:
+                _state['matrix'] = _state['vectorizer'].fit_transform(documents).tocsr()
+            except ValueError as e:
+                # Empty vocabulary (e.g. no text at all): every similarity is 0
+                logger.error("TF-IDF vectorization error: %s", e)
+                _state['vectorizer'] = None
+                _state['matrix'] = None
+
+        self.fingerprint = _state['fingerprint']
+        self.vectorizer = _state['vectorizer']
+        self.matrix = _state['matrix']
+        self.size = len(internships_df)
+
+    @classmethod
+    def load_or_fit(cls, internships_df, path):
+        """
+        Load the engine persisted at path if it was fitted on this catalog,
+        otherwise fit a new one and persist it there.
+        """
+        fingerprint = _fingerprint(catalog_documents(internships_df))
+        if os.path.exists(path):
+            try:
+                state = joblib.load(path)
+                if isinstance(state, dict) and state.get('fingerprint') == fingerprint:
+                    return cls(internships_df, _state=state)
+            except Exception as e:
+                logger.warning("Could not load TF-IDF engine from %s: %s", path, e)
+
+        engine = cls(internships_df)
+        engine.save(path)
+        return engine
+
+    @classmethod
+    def for_dataframe(cls, internships_df):
+        """Return the shared engine for an internships DataFrame, fitting it on first use"""
+        key = id(internships_df)
+        with _engine_cache_lock:
+            cached = _engine_cache.get(key)
+            # The DataFrame is kept in the cache entry so its id cannot be reused
+            if cached is not None and cached[0] is internships_df:
+                _engine_cache.move_to_end(key)
+                return cached[1]
+
+        engine = cls(internships_df)
+        with _engine_cache_lock:
+            _engine_cache[key] = (internships_df, engine)
+            _engine_cache.move_to_end(key)
+            while len(_engine_cache) > _ENGINE_CACHE_SIZE:
+                _engine_cache.popitem(last=False)
+        return engine
+
+    def with_rows(self, new_rows_df):
+        """
+        New engine with postings appended, leaving this one unchanged.
+
+        The appended postings are transformed with the fitted vectorizer (terms
+        it has not seen are ignored and the IDF weights are kept) until the
+        engine is refitted on the whole catalog.
+        """
+        engine = copy.copy(self)
+        engine.size = self.size + len(new_rows_df)
+        # No longer the engine fitted on the catalog files, so it is never persisted
+        engine.fingerprint = None
+        if self.vectorizer is not None and len(new_rows_df):
+            rows = self.vectorizer.transform(catalog_documents(new_rows_df))
+            engine.matrix = sparse.vstack([self.matrix, rows], format='csr')
+        return engine
+
+    def save(self, path):
+        """Persist the fitted vectorizer and matrix with joblib"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            joblib.dump(
+                {'fingerprint': self.fingerprint, 'vectorizer': self.vectorizer, 'matrix': self.matrix},
+                temp_path
+            )
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning("Could not save TF-IDF engine to %s: %s", path, e)
+
+    def score(self, user_profile, positions=None):
+        """
+        Cosine similarity of a candidate profile with every posting.
+
+        Args:
+            user_profile (dict): Candidate profile with skills, education, sector, location and full_text
+            positions (array): Optional row positions to restrict the result to
+
+        Returns:
+            array: Similarity per posting, between 0 and 1
+        """
+        size = self.size if positions is None else len(positions)
+        text = profile_text(user_profile)
+        if self.vectorizer is None or not text:
+            return np.zeros(size, dtype=np.float64)
+
+        query = self.vectorizer.transform([text])
+        matrix = self.matrix if positions is None else self.matrix[positions]
+        return (matrix @ query.T).toarray().ravel()
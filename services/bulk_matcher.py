@@ -0,0 +1,214 @@
+"""
+Offline bulk matching of candidate profiles against the internship catalog.
+
+Profiles are streamed from a CSV or JSONL file in chunks, scored with the
+same batch scoring used by get_recommendations and /recommend/batch, and
+written to a CSV or JSONL results file as soon as each chunk is done, so
+memory stays bounded however many profiles the input holds. With several
+workers the chunks are spread over a process pool; every worker loads the
+catalog and builds its CatalogScorer once, when it starts.
+"""
+import csv
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from models.recommender import get_batch_recommendations
+from models.scoring import CatalogScorer
+from services.catalog_store import load_tables
+
+# Profile columns read from the input (skills may be a list or a comma separated string)
+PROFILE_FIELDS = ['skills', 'sector', 'location', 'education', 'full_text']
+
+# Columns of a CSV results file, one row per (profile, match)
+RESULT_FIELDS = [
+    'profile_id', 'rank', 'internship_id', 'title', 'sector', 'location', 'total_score',
+    'skill_match', 'sector_match', 'location_match', 'text_similarity', 'missing_skills'
+]
+
+# Number of profiles scored together inside a chunk
+SCORING_BATCH_SIZE = 32
+
+# Catalog of the current process: (internships_df, location_df, scorer)
+_catalog = None
+
+
+def load_catalog(data_dir):
+    """Load the internship catalog and build its scorer"""
+    tables = load_tables(data_dir, ['internships', 'locations'])
+    internships_df, location_df = tables['internships'], tables['locations']
+    return internships_df, location_df, CatalogScorer(internships_df, location_df)
+
+
+def _init_worker(data_dir):
+    """Process pool initializer: load the catalog once per worker"""
+    global _catalog
+    _catalog = load_catalog(data_dir)
+
+
+def read_profiles(path):
+    """
+    Yield (profile id, profile dict) pairs from a CSV or JSONL file.
+
+    The id is the profile's 'id' field when present, else its position in
+    the file. JSONL lines that are not JSON objects are yielded as None.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            for index, row in enumerate(csv.DictReader(f)):
+                yield row.get('id') or index, row
+            return
+
+        index = 0
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                profile = json.loads(line)
+            except ValueError:
+                profile = None
+            if not isinstance(profile, dict):
+                profile = None
+            yield (profile or {}).get('id', index), profile
+            index += 1
+
+
+def _has_preferences(profile):
+    """
+    True for a profile dict with at least one of skills, sector, location or
+    education, whose fields are strings (skills may also be a list of strings)
+    """
+    if not isinstance(profile, dict) or not any(profile.get(field) for field in PROFILE_FIELDS[:4]):
+        return False
+    skills = profile.get('skills')
+    if isinstance(skills, list):
+        if not all(skill is None or isinstance(skill, str) for skill in skills):
+            return False
+    elif skills is not None and not isinstance(skills, str):
+        return False
+    return all(profile.get(field) is None or isinstance(profile.get(field), str) for field in PROFILE_FIELDS[1:])
+
+
+def _candidate(profile):
+    """Candidate dict in the shape get_recommendations expects"""
+    return {field: profile.get(field) or '' for field in PROFILE_FIELDS}
+
+
+def _match_record(rank, rec):
+    """Flat, serializable view of one recommendation"""
+    internship = rec['internship']
+    return {
+        'rank': rank,
+        'internship_id': internship.get('ID', ''),
+        'title': internship.get('Title', ''),
+        'sector': internship.get('Sector', ''),
+        'location': internship.get('Location', ''),
+        'total_score': rec['total_score'],
+        'skill_match': rec['scores']['skill_match'],
+        'sector_match': rec['scores']['sector_match'],
+        'location_match': rec['scores']['location_match'],
+        'text_similarity': rec['scores']['text_similarity'],
+        'missing_skills': rec.get('missing_skills', [])
+    }
+
+
+def match_chunk(chunk, top_n):
+    """
+    Rank internships for a chunk of profiles with the current process's catalog.
+
+    Args:
+        chunk (list): (profile id, profile dict) pairs
+        top_n (int): Number of matches per profile
+
+    Returns:
+        list: (profile id, list of match dicts) pairs in chunk order
+    """
+    internships_df, location_df, scorer = _catalog
+    matches = [[] for _ in chunk]
+    # Invalid profiles and profiles without any preference get no matches
+    scorable = [i for i, (_, profile) in enumerate(chunk) if _has_preferences(profile)]
+
+    for start in range(0, len(scorable), SCORING_BATCH_SIZE):
+        part = scorable[start:start + SCORING_BATCH_SIZE]
+        batch = get_batch_recommendations(
+            [_candidate(chunk[i][1]) for i in part],
+            internships_df, location_df, scorer=scorer, top_n=top_n
+        )
+        for i, recs in zip(part, batch):
+            matches[i] = [_match_record(rank, rec) for rank, rec in enumerate(recs, 1)]
+    return [(profile_id, profile_matches) for (profile_id, _), profile_matches in zip(chunk, matches)]
+
+
+def _chunks(items, chunk_size):
+    """Group an iterable into lists of at most chunk_size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _result_writer(output, path):
+    """Return a function writing one profile's matches to the output file"""
+    if path.lower().endswith('.csv'):
+        writer = csv.DictWriter(output, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+
+        def write(profile_id, matches):
+            for match in matches:
+                row = dict(match, profile_id=profile_id)
+                row['missing_skills'] = '; '.join(match['missing_skills'])
+                writer.writerow(row)
+        return write
+
+    def write(profile_id, matches):
+        output.write(json.dumps({'profile_id': profile_id, 'matches': matches}, default=str) + '\n')
+    return write
+
+
+def run_bulk_match(input_path, output_path, data_dir='data', top_n=5, workers=1, chunk_size=1000):
+    """
+    Match every profile of input_path and write the ranked results to output_path.
+
+    Args:
+        input_path (str): Profiles as .csv or .jsonl
+        output_path (str): Results as .csv (one row per match) or .jsonl (one line per profile)
+        data_dir (str): Directory holding internships.csv and locations.csv
+        top_n (int): Number of matches per profile
+        workers (int): Number of worker processes (1 runs in this process)
+        chunk_size (int): Number of profiles sent to a worker at a time
+
+    Returns:
+        int: Number of profiles matched
+    """
+    chunks = _chunks(read_profiles(input_path), chunk_size)
+    matched = 0
+
+    with open(output_path, 'w', newline='', encoding='utf-8') as output:
+        write = _result_writer(output, output_path)
+
+        def write_results(results):
+            for profile_id, matches in results:
+                write(profile_id, matches)
+            return len(results)
+
+        if workers <= 1:
+            _init_worker(data_dir)
+            for chunk in chunks:
+                matched += write_results(match_chunk(chunk, top_n))
+            return matched
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_dir,)) as executor:
+            # Keep a bounded number of chunks in flight and write them back in input order
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(match_chunk, chunk, top_n))
+                if len(pending) >= workers * 2:
+                    matched += write_results(pending.popleft().result())
+            while pending:
+                matched += write_results(pending.popleft().result())
+    return matched
@@ -0,0 +1,266 @@
+"""
+Versioned, immutable snapshots of the catalog.
+
+A CatalogSnapshot holds every catalog table together with everything
+derived from them (scorer, search index, TF-IDF engine, ANN index) for one
+version of the data. Snapshots are built completely and validated before
+they are published, and never modified afterwards: a request reads the
+snapshot that was current when it started for its whole duration, and a
+reload publishes a new snapshot with a single reference assignment.
+
+with_delta derives the next snapshot from the current one for a small set
+of upserted and deleted postings: new postings are appended, replaced and
+deleted ones are retired (masked out, keeping every row position stable),
+and each index is extended incrementally. compacted rebuilds everything from
+the live postings only, dropping retired rows.
+"""
+import copy
+import hashlib
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from models.scoring import CatalogScorer
+from models.ann_index import InternshipANNIndex
+from models.tfidf_engine import TfidfEngine, tfidf_available
+from models.learning_resources import LearningResourceIndex
+from models.career_paths import CareerPathIndex
+from services.search_index import InternshipSearchIndex
+from services.catalog_store import load_tables
+
+logger = logging.getLogger(__name__)
+
+# File in the data directory where the fitted TF-IDF engine is persisted
+TFIDF_ENGINE_FILE = 'tfidf_engine.joblib'
+
+# Catalogs at least this large get an ANN index for candidate generation;
+# smaller ones are scanned exactly
+ANN_MIN_CATALOG_SIZE = 20000
+
+# Columns every table must have for the snapshot to be published
+REQUIRED_COLUMNS = {
+    'internships': ['ID', 'Title', 'Sector', 'Skills_Required', 'Location', 'Description'],
+    'skills': ['Skill'],
+    'locations': ['State', 'City'],
+    'education': ['Category'],
+    'sectors': ['Sector'],
+    'career_paths': ['Sector'],
+    'learning_resources': ['Skill']
+}
+
+
+def validate_tables(tables):
+    """
+    Check that a set of catalog tables can be served.
+
+    Raises:
+        ValueError: When a table or a required column is missing, or there are no internships
+    """
+    for name, columns in REQUIRED_COLUMNS.items():
+        df = tables.get(name)
+        if df is None:
+            raise ValueError(f"Catalog table {name!r} is missing")
+        missing = [column for column in columns if column not in df.columns]
+        if missing:
+            raise ValueError(f"Catalog table {name!r} is missing columns: {', '.join(missing)}")
+    if tables['internships'].empty:
+        raise ValueError("Catalog has no internships")
+
+
+def _id_key(value):
+    """Posting IDs are compared as text, so 26, 26.0 and '26' are the same posting"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _tables_fingerprint(*dfs):
+    """Short hash of the columns and content of some tables"""
+    digest = hashlib.sha256()
+    for df in dfs:
+        digest.update('\0'.join(map(str, df.columns)).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _build_tfidf_engine(internships_df, data_dir, persist=True):
+    """Load the persisted TF-IDF engine for this catalog, or fit (and persist) it (None without scikit-learn)"""
+    if not tfidf_available:
+        return None
+    try:
+        if not persist:
+            return TfidfEngine(internships_df)
+        return TfidfEngine.load_or_fit(internships_df, os.path.join(data_dir, TFIDF_ENGINE_FILE))
+    except Exception as e:
+        logger.exception("Error building TF-IDF engine: %s", e)
+        return None
+
+
+def _build_ann_index(internships_df, locations_df):
+    """ANN index for candidate generation, only for catalogs too large to scan per request"""
+    if len(internships_df) < ANN_MIN_CATALOG_SIZE:
+        return None
+    return InternshipANNIndex(internships_df, locations_df)
+
+
+class CatalogSnapshot:
+    """
+    One version of the catalog tables and every index derived from them.
+
+    Treated as read-only once built: nothing in the service mutates the
+    DataFrames or indexes of a published snapshot.
+
+    Args:
+        version (int): Version number, increasing with every reload
+        data_dir (str): Directory the tables were loaded from
+        tables (dict): Table name -> DataFrame, as returned by load_tables
+        persist (bool): Persist the fitted TF-IDF engine in data_dir (only for
+                        tables read from the files there)
+    """
+    def __init__(self, version, data_dir, tables, persist=True):
+        validate_tables(tables)
+        self.version = version
+        self.data_dir = data_dir
+        self.internships_df = tables['internships']
+        self.skills_df = tables['skills']
+        self.locations_df = tables['locations']
+        self.education_df = tables['education']
+        self.sectors_df = tables['sectors']
+        self.career_paths_df = tables['career_paths']
+        self.learning_resources_df = tables['learning_resources']
+        # Identifies the vocabularies resumes are parsed with, for the parsed-resume cache
+        self.resume_tables_version = _tables_fingerprint(self.skills_df, self.education_df, self.locations_df)
+        # Position of the live posting of every ID
+        self.id_positions = {
+            _id_key(value): position for position, value in enumerate(self.internships_df['ID'].tolist())
+        }
+
+        # Compile the catalog once so each request is a single vectorized pass
+        self.scorer = CatalogScorer(self.internships_df, self.locations_df)
+        self.search_index = InternshipSearchIndex(self.internships_df)
+        self.tfidf_engine = _build_tfidf_engine(self.internships_df, data_dir, persist)
+        self.ann_index = _build_ann_index(self.internships_df, self.locations_df)
+        self.learning_resource_index = LearningResourceIndex(self.learning_resources_df)
+        self.career_path_index = CareerPathIndex(self.career_paths_df)
+        self.loaded_at = time.time()
+        self.built_at = self.loaded_at
+        # Postings appended or retired since the indexes were last built from scratch
+        self.pending_rows = 0
+
+    @classmethod
+    def load(cls, data_dir, version):
+        """Load every catalog table of a data directory and build a snapshot of them"""
+        return cls(version, data_dir, load_tables(data_dir))
+
+    def with_delta(self, upserts, deletes, version):
+        """
+        Next snapshot with postings upserted and deleted, built incrementally.
+
+        An upsert is a full posting with an ID: it replaces the live posting
+        with that ID, or adds a new one. Deletes are applied after upserts, so
+        an ID in both ends up deleted. Only the affected postings are parsed
+        and tokenized.
+
+        Args:
+            upserts (list): Posting dicts with the internship columns
+            deletes (list): IDs of postings to retire
+            version (int): Version number of the new snapshot
+
+        Returns:
+            tuple: (CatalogSnapshot, dict with the inserted, updated, deleted and not_found IDs)
+
+        Raises:
+            ValueError: When a posting is not an object, has no ID or has unknown fields
+        """
+        columns = self.internships_df.columns
+        postings = {}
+        for posting in upserts:
+            if not isinstance(posting, dict):
+                raise ValueError("Each upserted posting must be an object")
+            if posting.get('ID') is None or pd.isna(posting['ID']):
+                raise ValueError("Each upserted posting needs an ID")
+            unknown = [field for field in posting if field not in columns]
+            if unknown:
+                raise ValueError(f"Unknown internship fields: {', '.join(map(str, unknown))}")
+            # The last upsert of an ID wins
+            postings[_id_key(posting['ID'])] = posting
+
+        deleted, not_found = {}, {}
+        for value in deletes:
+            key = _id_key(value)
+            upserted = postings.pop(key, None) is not None
+            if key in self.id_positions:
+                deleted[key] = True
+            elif not upserted:
+                not_found[key] = True
+        summary = {
+            'inserted': [key for key in postings if key not in self.id_positions],
+            'updated': [key for key in postings if key in self.id_positions],
+            'deleted': list(deleted),
+            'not_found': list(not_found)
+        }
+
+        start = len(self.internships_df)
+        retired = np.array([self.id_positions[key] for key in summary['updated'] + summary['deleted']], dtype=np.int64)
+        new_rows_df = pd.DataFrame(list(postings.values()), columns=columns)
+        for column, dtype in self.internships_df.dtypes.items():
+            try:
+                new_rows_df[column] = new_rows_df[column].astype(dtype)
+            except (TypeError, ValueError):
+                pass  # e.g. a missing value in an integer column
+        new_rows_df.index = pd.RangeIndex(start, start + len(new_rows_df))
+
+        snapshot = copy.copy(self)
+        snapshot.version = version
+        if len(new_rows_df):
+            snapshot.internships_df = pd.concat([self.internships_df, new_rows_df])
+        snapshot.id_positions = dict(self.id_positions)
+        for key in summary['deleted']:
+            del snapshot.id_positions[key]
+        snapshot.id_positions.update({key: start + i for i, key in enumerate(postings)})
+
+        snapshot.scorer = self.scorer.with_delta(new_rows_df, retired)
+        snapshot.search_index = self.search_index.with_delta(new_rows_df, retired)
+        if self.tfidf_engine is not None:
+            snapshot.tfidf_engine = self.tfidf_engine.with_rows(new_rows_df)
+        if self.ann_index is not None:
+            snapshot.ann_index = self.ann_index.with_rows(new_rows_df)
+        snapshot.loaded_at = time.time()
+        snapshot.pending_rows = self.pending_rows + len(new_rows_df) + len(retired)
+        return snapshot, summary
+
+    def compacted(self, version):
+        """Snapshot rebuilt from scratch on the live postings only, dropping retired rows"""
+        tables = {
+            'internships': self.internships_df.iloc[self.scorer.live_positions].reset_index(drop=True),
+            'skills': self.skills_df,
+            'locations': self.locations_df,
+            'education': self.education_df,
+            'sectors': self.sectors_df,
+            'career_paths': self.career_paths_df,
+            'learning_resources': self.learning_resources_df
+        }
+        # Fitted on in-memory postings, so the engine persisted for the data files is kept
+        return CatalogSnapshot(version, self.data_dir, tables, persist=False)
+
+    def internship(self, internship_id):
+        """Live posting with an ID as a Series, or None"""
+        position = self.id_positions.get(_id_key(internship_id))
+        if position is None:
+            return None
+        return self.internships_df.iloc[position]
+
+    def summary(self):
+        """Version, load time and table sizes, for status endpoints"""
+        return {
+            'catalog_version': self.version,
+            'loaded_at': self.loaded_at,
+            'internships': len(self.scorer.live_positions),
+            'retired': self.scorer.size - len(self.scorer.live_positions),
+            'pending_rows': self.pending_rows,
+            'skills': len(self.skills_df),
+            'locations': len(self.locations_df)
+        }
@@ -0,0 +1,201 @@
+"""
+Columnar binary bundle of the catalog CSV files.
+
+compile_bundle converts the CSV files of a data directory into a bundle
+directory of NumPy .npy files: numeric columns are stored as they are, text
+columns dictionary-encoded as one UTF-8 buffer of their distinct values
+(with character offsets) plus one int32 code per row, so a repeated value
+is decoded once and shared by every row holding it. The files are opened
+with read-only memory mapping, so workers share them through the OS page
+cache, and loading skips CSV parsing and type inference altogether (the
+decoded strings themselves still live in each process).
+
+load_table / load_tables read a table from the bundle when it is up to
+date with its CSV file (same size and modification time as when it was
+compiled) and fall back to pandas.read_csv otherwise.
+"""
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Catalog tables, each read from <name>.csv
+CATALOG_TABLES = [
+    'internships', 'skills', 'locations', 'education', 'sectors', 'career_paths', 'learning_resources'
+]
+
+# Directory of the bundle inside the data directory
+BUNDLE_DIR = 'catalog.bundle'
+MANIFEST_FILE = 'manifest.json'
+
+# Bumping BUNDLE_VERSION makes existing bundles stale
+BUNDLE_VERSION = 1
+
+
+def _csv_path(data_dir, name):
+    return os.path.join(data_dir, f'{name}.csv')
+
+
+def _source_stamp(path):
+    """Size and modification time of a CSV file, recorded when it is compiled"""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _write_column(directory, prefix, series):
+    """Write one column; returns its manifest entry"""
+    if series.dtype.kind in 'biuf':
+        np.save(os.path.join(directory, f'{prefix}.npy'), series.to_numpy())
+        return {'kind': 'numeric'}
+
+    # Dictionary encoding: distinct values once, plus one code per row (-1 when missing)
+    codes, uniques = pd.factorize(series)
+    uniques = uniques.tolist()
+    for value in uniques:
+        if not isinstance(value, str):
+            raise ValueError(f"Column {series.name!r} mixes text and {type(value).__name__} values")
+
+    offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in uniques])
+    text = np.frombuffer(''.join(uniques).encode('utf-8'), dtype=np.uint8)
+    np.save(os.path.join(directory, f'{prefix}.text.npy'), text)
+    np.save(os.path.join(directory, f'{prefix}.offsets.npy'), offsets)
+    np.save(os.path.join(directory, f'{prefix}.codes.npy'), codes.astype(np.int32))
+    return {'kind': 'text'}
+
+
+def _read_column(directory, prefix, kind):
+    """Read one column written by _write_column"""
+    if kind == 'numeric':
+        # A plain ndarray view of the memory map, without copying it
+        return np.asarray(np.load(os.path.join(directory, f'{prefix}.npy'), mmap_mode='r'))
+
+    buffer = np.load(os.path.join(directory, f'{prefix}.text.npy'), mmap_mode='r')
+    offsets = np.load(os.path.join(directory, f'{prefix}.offsets.npy'), mmap_mode='r').tolist()
+    codes = np.load(os.path.join(directory, f'{prefix}.codes.npy'), mmap_mode='r')
+    # Decoded once per column; offsets count characters, not bytes
+    text = buffer.tobytes().decode('utf-8')
+    # The trailing NaN is picked by the missing-value code -1
+    values = np.empty(len(offsets), dtype=object)
+    values[:-1] = [text[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+    values[-1] = np.nan
+    return values[codes]
+
+
+def compile_bundle(data_dir='data', tables=CATALOG_TABLES):
+    """
+    Convert the catalog CSV files of a data directory into a binary bundle.
+
+    The bundle is written next to the CSV files and swapped in at the end, so
+    readers never see a partially written bundle.
+
+    Args:
+        data_dir (str): Directory holding the CSV files
+        tables (list): Table names to compile (missing CSV files are skipped)
+
+    Returns:
+        str: Path of the bundle directory
+    """
+    bundle_path = os.path.join(data_dir, BUNDLE_DIR)
+    temp_path = f'{bundle_path}.tmp-{os.getpid()}'
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+
+    manifest = {'version': BUNDLE_VERSION, 'tables': {}}
+    try:
+        for name in tables:
+            path = _csv_path(data_dir, name)
+            if not os.path.exists(path):
+                continue
+            stamp = _source_stamp(path)
+            df = pd.read_csv(path)
+            columns = []
+            for i, column in enumerate(df.columns):
+                entry = _write_column(temp_path, f'{name}.{i}', df[column])
+                entry['name'] = column
+                columns.append(entry)
+            manifest['tables'][name] = {'source': stamp, 'rows': len(df), 'columns': columns}
+
+        with open(os.path.join(temp_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+    except Exception:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+
+    old_path = f'{bundle_path}.old-{os.getpid()}'
+    if os.path.exists(bundle_path):
+        os.replace(bundle_path, old_path)
+    os.replace(temp_path, bundle_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return bundle_path
+
+
+def _read_manifest(bundle_path):
+    try:
+        with open(os.path.join(bundle_path, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != BUNDLE_VERSION:
+        return None
+    return manifest
+
+
+def _is_fresh(entry, csv_path):
+    """A bundled table is used unless its CSV file changed since it was compiled"""
+    if not os.path.exists(csv_path):
+        return True
+    return entry['source'] == _source_stamp(csv_path)
+
+
+def _read_bundled_table(bundle_path, name, entry):
+    """
+    Build a table from its bundled columns. Numeric columns stay backed by
+    their read-only memory maps (copy=False), so cells of a loaded table are
+    replaced by assigning whole columns, never written in place.
+    """
+    columns = {
+        column['name']: _read_column(bundle_path, f'{name}.{i}', column['kind'])
+        for i, column in enumerate(entry['columns'])
+    }
+    return pd.DataFrame(columns, index=pd.RangeIndex(entry['rows']), copy=False)
+
+
+def load_tables(data_dir='data', tables=CATALOG_TABLES):
+    """
+    Load catalog tables, from the bundle when it is up to date, else from CSV.
+
+    Args:
+        data_dir (str): Directory holding the CSV files and the bundle
+        tables (list): Table names to load
+
+    Returns:
+        dict: Table name -> DataFrame
+    """
+    bundle_path = os.path.join(data_dir, BUNDLE_DIR)
+    manifest = _read_manifest(bundle_path) if os.path.isdir(bundle_path) else None
+
+    loaded = {}
+    for name in tables:
+        csv_path = _csv_path(data_dir, name)
+        entry = manifest['tables'].get(name) if manifest else None
+        if entry is not None and _is_fresh(entry, csv_path):
+            try:
+                loaded[name] = _read_bundled_table(bundle_path, name, entry)
+                continue
+            except Exception as e:
+                logger.warning("Could not read %s from the catalog bundle, falling back to CSV: %s", name, e)
+        elif manifest:
+            logger.info("Catalog bundle is missing or stale for %s, reading %s", name, csv_path)
+        loaded[name] = pd.read_csv(csv_path)
+    return loaded
+
+
+def load_table(data_dir, name):
+    """Load one catalog table (see load_tables)"""
+    return load_tables(data_dir, [name])[name]
@@ -1,8 +1,39 @@
-import pandas as pd
-import os
-from models.recommender import get_recommendations, get_career_path, get_learning_resources
+import copy
+import hashlib
+import logging
+import threading
+import time
+from models.recommender import (
+    get_recommendations, get_batch_recommendations, get_career_path, get_batch_learning_resources,
+    hybrid_recommendation, normalize_sector, preprocess_skills
+)
+from services.catalog_snapshot import CatalogSnapshot
+from services.result_cache import LRUCache
+from services.resume_cache import ResumeParseCache, RESUME_CACHE_SIZE, upload_digest
+from utils.metrics import METRICS
+from utils.log import log_sampled
 from utils.resume_parser import parse_resume
-import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Number of profiles scored together by batch_recommend
+BATCH_CHUNK_SIZE = 32
+
+# apply_delta starts a background compaction once the postings appended or
+# retired since the last full build reach this share of the live catalog,
+# or once any are pending and the last full build is older than COMPACTION_INTERVAL seconds
+COMPACTION_PENDING_FRACTION = 0.2
+COMPACTION_INTERVAL = 3600
+
+
+def _copy_recommendations(recommendations):
+    """Deep copy of recommendations shared with the cache, so callers changing a result never alter it"""
+    return copy.deepcopy(recommendations)
+
+
+def _snapshot_attribute(name):
+    """Read-only attribute of the current catalog snapshot, e.g. service.internships_df"""
+    return property(lambda self: getattr(self._snapshot, name))
 
 class InternshipService:
     """
@@ -12,25 +43,54 @@ class InternshipService:
     2. Data processing and analysis
     3. Recommendation generation
     4. Career path planning and skill development suggestions
+    
+    The catalog tables and indexes live in an immutable CatalogSnapshot.
+    Methods read self.snapshot once per request (or take the snapshot to use),
+    so a concurrent reload never mixes two catalog versions in one response.
     """
-    def __init__(self, data_dir='data'):
-        """Initialize the internship service with data files"""
+    internships_df = _snapshot_attribute('internships_df')
+    skills_df = _snapshot_attribute('skills_df')
+    locations_df = _snapshot_attribute('locations_df')
+    education_df = _snapshot_attribute('education_df')
+    sectors_df = _snapshot_attribute('sectors_df')
+    career_paths_df = _snapshot_attribute('career_paths_df')
+    learning_resources_df = _snapshot_attribute('learning_resources_df')
+    scorer = _snapshot_attribute('scorer')
+    search_index = _snapshot_attribute('search_index')
+    tfidf_engine = _snapshot_attribute('tfidf_engine')
+    ann_index = _snapshot_attribute('ann_index')
+    
+    def __init__(self, data_dir='data', cache_size=1024, cache_ttl=300,
+                 resume_cache_size=RESUME_CACHE_SIZE, resume_cache_dir=None):
+        """Initialize the internship service with data files
+        
+        cache_size and cache_ttl bound the cache of recommendation results
+        for identical candidate profiles (entries, seconds).
+        resume_cache_size bounds the in-memory cache of parsed resumes, and
+        resume_cache_dir optionally persists it across restarts.
+        """
         self.data_dir = data_dir
+        self.recommendation_cache = LRUCache(max_size=cache_size, ttl=cache_ttl)
+        self.resume_cache = ResumeParseCache(max_size=resume_cache_size, cache_dir=resume_cache_dir)
+        
+        # Reloads build the next snapshot off to the side, one at a time
+        self._reload_lock = threading.Lock()
+        self.last_reload_error = None
         
         # Load all necessary data files
         try:
-            self.internships_df = pd.read_csv(os.path.join(data_dir, 'internships.csv'))
-            self.skills_df = pd.read_csv(os.path.join(data_dir, 'skills.csv'))
-            self.locations_df = pd.read_csv(os.path.join(data_dir, 'locations.csv'))
-            self.education_df = pd.read_csv(os.path.join(data_dir, 'education.csv'))
-            self.sectors_df = pd.read_csv(os.path.join(data_dir, 'sectors.csv'))
-            self.career_paths_df = pd.read_csv(os.path.join(data_dir, 'career_paths.csv'))
-            self.learning_resources_df = pd.read_csv(os.path.join(data_dir, 'learning_resources.csv'))
-            print(f"Successfully loaded all data files from {data_dir}")
+            # From the compiled catalog bundle when it is up to date, else from the CSV files
+            self._snapshot = CatalogSnapshot.load(data_dir, version=1)
+            logger.info("Successfully loaded all data files from %s", data_dir)
         except Exception as e:
-            print(f"Error loading data files: {e}")
+            logger.exception("Error loading data files: %s", e)
             raise
     
+    @property
+    def snapshot(self):
+        """The catalog snapshot currently served"""
+        return self._snapshot
+    
     def get_all_skills(self):
         """Get all skills from the skills database"""
         return self.skills_df['Skill'].tolist()
@@ -41,9 +101,10 @@ class InternshipService:
     
     def get_all_locations(self):
         """Get all locations from the locations database"""
+        locations_df = self.snapshot.locations_df
         locations = []
-        locations.extend(self.locations_df['State'].unique().tolist())
-        locations.extend(self.locations_df['City'].tolist())
+        locations.extend(locations_df['State'].unique().tolist())
+        locations.extend(locations_df['City'].tolist())
         return sorted(locations)
     
     def get_all_education(self):
@@ -59,7 +120,7 @@ class InternshipService:
         3. Extract Skills, Education, Location
         4. Build Candidate Profile
         """
-        print("Starting resume processing")
+        logger.debug("Starting resume processing")
         
         # Default resume data if anything fails
         default_resume_data = {
@@ -71,51 +132,54 @@ class InternshipService:
         
         # Step 1: Validate Resume File
         if not resume_file or not hasattr(resume_file, 'filename') or not resume_file.filename:
-            print("Error: Invalid resume file")
+            logger.warning("Invalid resume file")
             return default_resume_data
             
         # Only process PDF and DOCX files
         if not (resume_file.filename.lower().endswith('.pdf') or resume_file.filename.lower().endswith('.docx')):
-            print(f"Error: Unsupported file format: {resume_file.filename}")
+            logger.warning("Unsupported file format: %s", resume_file.filename)
             return default_resume_data
         
         try:
-            print(f"Processing resume: {resume_file.filename}")
-            
-            # Step 2: Save the uploaded file to a temporary file
-            temp_dir = tempfile.gettempdir()
-            temp_file_path = os.path.join(temp_dir, resume_file.filename)
-            resume_file.save(temp_file_path)
-            
-            # Check if file was saved successfully
-            if not os.path.exists(temp_file_path):
-                print(f"Error: Failed to save temporary file: {temp_file_path}")
-                return default_resume_data
-                
-            # Step 3: Parse the resume and extract information
-            print("Parsing resume content")
-            resume_data = parse_resume(temp_file_path, self.skills_df, self.education_df, self.locations_df)
-            
-            # Step 4: Clean up - Remove the temporary file
-            try:
-                os.unlink(temp_file_path)
-            except Exception as e:
-                print(f"Warning: Could not delete temporary file: {e}")
+            logger.debug("Processing resume: %s", resume_file.filename)
+            
+            # Step 2: Reuse the parse result of an identical earlier upload
+            content = resume_file.read()
+            digest = upload_digest(resume_file.filename, content)
+            snapshot = self.snapshot
+            resume_data = self.resume_cache.get(digest, snapshot.resume_tables_version)
+            if resume_data is not None:
+                logger.debug("Using cached parse result of an identical upload")
+                return resume_data
+            
+            # Step 3: Parse the upload in memory and extract information
+            logger.debug("Parsing resume content")
+            with METRICS.timer('resume_parse'):
+                resume_data = parse_resume(
+                    content, snapshot.skills_df, snapshot.education_df, snapshot.locations_df,
+                    filename=resume_file.filename
+                )
+            self.cache_parsed_resume(digest, snapshot, resume_data)
             
             # Print a summary of what was extracted
             skills_count = len(resume_data.get('skills', []))
             education_count = len(resume_data.get('education', []))
             locations_count = len(resume_data.get('locations', []))
             
-            print(f"Resume processed successfully. Extracted {skills_count} skills, "
-                  f"{education_count} education items, and {locations_count} locations")
+            logger.debug("Resume processed successfully. Extracted %d skills, %d education items, and %d locations",
+                         skills_count, education_count, locations_count)
             
             return resume_data
             
         except Exception as e:
-            print(f"Error processing resume: {e}")
+            logger.exception("Error processing resume: %s", e)
             return default_resume_data
     
+    def cache_parsed_resume(self, digest, snapshot, resume_data):
+        """Remember the parse result of an upload (only when text could be extracted)"""
+        if resume_data.get('full_text'):
+            self.resume_cache.put(digest, snapshot.resume_tables_version, resume_data)
+    
     def get_recommendations_from_form(self, form_data):
         """
         Get internship recommendations based on form data
@@ -127,11 +191,12 @@ class InternshipService:
         5. Career Path Planning and Skill Development
         """
         try:
-            print("Starting form-based recommendation process")
+            logger.debug("Starting form-based recommendation process")
+            snapshot = self.snapshot
             
             # Step 1: Input Validation
             if not isinstance(form_data, dict):
-                print(f"Error: form_data is not a dictionary: {form_data}")
+                logger.error("form_data is not a dictionary: %s", form_data)
                 return []
             
             # Step 2: Data Preprocessing - Create candidate profile
@@ -143,48 +208,55 @@ class InternshipService:
                 'full_text': ''  # No resume text for form-based input
             }
             
-            print(f"Processing candidate profile with {len(candidate['skills'])} skills, " 
-                  f"sector: {candidate['sector']}, location: {candidate['location']}")
+            logger.debug("Processing candidate profile with %d skills, sector: %s, location: %s",
+                         len(candidate['skills']), candidate['sector'], candidate['location'])
             
             # Step 3: Generate Recommendations
             try:
-                recommendations = get_recommendations(candidate, self.internships_df, self.locations_df)
-                print(f"Generated {len(recommendations)} initial recommendations")
+                recommendations = get_recommendations(
+                    candidate, snapshot.internships_df, snapshot.locations_df, scorer=snapshot.scorer,
+                    ann_index=snapshot.ann_index
+                )
+                logger.debug("Generated %d initial recommendations", len(recommendations))
             except Exception as e:
-                print(f"Error getting recommendations from form data: {e}")
+                logger.exception("Error getting recommendations from form data: %s", e)
                 return []
             
             # Step 4: Enhance with Career Path and Learning Resources
             enhanced_recommendations = []
-            for recommendation in recommendations:
+            # Learning resources of every recommendation in one lookup
+            learning_resources = get_batch_learning_resources(
+                [recommendation.get('missing_skills', []) for recommendation in recommendations],
+                snapshot.learning_resources_df,
+                snapshot.learning_resource_index
+            )
+            for recommendation, resources in zip(recommendations, learning_resources):
                 try:
                     missing_skills = recommendation.get('missing_skills', [])
-                    print(f"Found {len(missing_skills)} missing skills for internship: {recommendation['internship'].get('Title')}")
+                    logger.debug("Found %d missing skills for internship: %s", len(missing_skills), recommendation['internship'].get('Title'))
                     
-                    # Get learning resources for missing skills
-                    recommendation['learning_resources'] = get_learning_resources(
-                        missing_skills, 
-                        self.learning_resources_df
-                    )
+                    # Learning resources for missing skills
+                    recommendation['learning_resources'] = resources
                     
                     # Get career path if sector is provided
                     recommendation['career_path'] = get_career_path(
                         recommendation['internship']['Sector'], 
                         candidate['skills'],
-                        self.career_paths_df
+                        snapshot.career_paths_df,
+                        snapshot.career_path_index
                     )
                     
                     enhanced_recommendations.append(recommendation)
                 except Exception as e:
-                    print(f"Error enhancing recommendation: {e}")
+                    log_sampled(logger, logging.WARNING, 'enhance_recommendation', "Error enhancing recommendation: %s", e)
                     recommendation['learning_resources'] = []
                     recommendation['career_path'] = None
                     enhanced_recommendations.append(recommendation)
             
-            print(f"Returning {len(enhanced_recommendations)} enhanced recommendations")
+            logger.debug("Returning %d enhanced recommendations", len(enhanced_recommendations))
             return enhanced_recommendations
         except Exception as e:
-            print(f"Error processing form data: {e}")
+            logger.exception("Error processing form data: %s", e)
             return []
     
     def get_recommendations_from_resume(self, resume_data):
@@ -198,11 +270,12 @@ class InternshipService:
         5. Skill Development Suggestions
         """
         try:
-            print("Starting resume-based recommendation process")
+            logger.debug("Starting resume-based recommendation process")
+            snapshot = self.snapshot
             
             # Step 1: Validate resume data
             if not isinstance(resume_data, dict):
-                print(f"Error: resume_data is not a dictionary: {resume_data}")
+                logger.error("resume_data is not a dictionary: %s", resume_data)
                 return []
                 
             # Step 2: Build candidate profile from resume data
@@ -228,58 +301,67 @@ class InternshipService:
             if isinstance(candidate['education'], list) and len(candidate['education']) > 0:
                 candidate['education'] = candidate['education'][0]
             
-            print(f"Built candidate profile with {len(candidate['skills'])} skills, "
-                  f"location: {candidate['location']}, education: {candidate['education']}")
+            logger.debug("Built candidate profile with %d skills, location: %s, education: %s",
+                         len(candidate['skills']), candidate['location'], candidate['education'])
             
             # Step 3: Generate initial recommendations
             try:
-                recommendations = get_recommendations(candidate, self.internships_df, self.locations_df)
-                print(f"Generated {len(recommendations)} initial recommendations")
+                recommendations = get_recommendations(
+                    candidate, snapshot.internships_df, snapshot.locations_df, scorer=snapshot.scorer,
+                    ann_index=snapshot.ann_index
+                )
+                logger.debug("Generated %d initial recommendations", len(recommendations))
             except Exception as e:
-                print(f"Error getting recommendations from resume data: {e}")
+                logger.exception("Error getting recommendations from resume data: %s", e)
                 return []
             
             # Step 4: Enhance recommendations with career paths and learning resources
             enhanced_recommendations = []
-            for recommendation in recommendations:
+            # Learning resources of every recommendation in one lookup
+            learning_resources = get_batch_learning_resources(
+                [recommendation.get('missing_skills', []) for recommendation in recommendations],
+                snapshot.learning_resources_df,
+                snapshot.learning_resource_index
+            )
+            for recommendation, resources in zip(recommendations, learning_resources):
                 try:
                     # Identify skill gaps
                     missing_skills = recommendation.get('missing_skills', [])
-                    print(f"Found {len(missing_skills)} missing skills for internship: {recommendation['internship'].get('Title')}")
+                    logger.debug("Found %d missing skills for internship: %s", len(missing_skills), recommendation['internship'].get('Title'))
                     
-                    # Get learning resources for missing skills
-                    recommendation['learning_resources'] = get_learning_resources(
-                        missing_skills, 
-                        self.learning_resources_df
-                    )
+                    # Learning resources for missing skills
+                    recommendation['learning_resources'] = resources
                     
                     # Get career path based on the internship's sector
                     recommendation['career_path'] = get_career_path(
                         recommendation['internship']['Sector'], 
                         candidate['skills'],
-                        self.career_paths_df
+                        snapshot.career_paths_df,
+                        snapshot.career_path_index
                     )
                     
                     enhanced_recommendations.append(recommendation)
                 except Exception as e:
-                    print(f"Error enhancing recommendation: {e}")
+                    log_sampled(logger, logging.WARNING, 'enhance_recommendation', "Error enhancing recommendation: %s", e)
                     recommendation['learning_resources'] = []
                     recommendation['career_path'] = None
                     enhanced_recommendations.append(recommendation)
             
-            print(f"Returning {len(enhanced_recommendations)} enhanced recommendations")
+            logger.debug("Returning %d enhanced recommendations", len(enhanced_recommendations))
             return enhanced_recommendations
         except Exception as e:
-            print(f"Error processing resume data: {e}")
+            logger.exception("Error processing resume data: %s", e)
             return []
 
-    def integrated_recommendation_process(self, input_data, input_type='form'):
+    def integrated_recommendation_process(self, input_data, input_type='form', top_n=5, snapshot=None):
         """
         Integrated recommendation process that follows the complete system flow diagram
         
         Parameters:
         - input_data: The input data (form, resume, or voice)
-        - input_type: Type of input ('form', 'resume', 'voice')
+        - input_type: Type of input ('form', 'profile', 'resume', 'voice')
+        - top_n: Number of recommendations to return
+        - snapshot: Catalog snapshot to use (the current one by default)
         
         Flow:
         1. Input Collection & Processing
@@ -291,73 +373,241 @@ class InternshipService:
         7. Final Recommendation Generation
         """
         try:
-            print(f"Starting integrated recommendation process with input_type: {input_type}")
-            
-            # Step 1: Process input based on type
-            candidate = {}
-            if input_type == 'form':
-                candidate = {
-                    'skills': input_data.get('skills', []),
-                    'sector': input_data.get('sector', ''),
-                    'location': input_data.get('location', ''),
-                    'education': input_data.get('education', ''),
-                    'full_text': ''
-                }
-            elif input_type == 'resume':
-                # Extract from resume data
-                locations_list = input_data.get('locations', [])
-                education_list = input_data.get('education', [])
-                
-                candidate = {
-                    'skills': input_data.get('skills', []),
-                    'sector': input_data.get('sector', ''),
-                    'location': locations_list[0] if locations_list and len(locations_list) > 0 else '',
-                    'education': education_list[0] if education_list and len(education_list) > 0 else '',
-                    'full_text': input_data.get('full_text', '')
-                }
-            
-            print(f"Candidate profile created with {len(candidate.get('skills', []))} skills")
-            
-            # Step 2: Generate recommendations
-            raw_recommendations = get_recommendations(candidate, self.internships_df, self.locations_df)
-            print(f"Generated {len(raw_recommendations)} initial recommendations")
+            with METRICS.timer('request'):
+                return self._integrated_recommendation_process(input_data, input_type, top_n, snapshot)
+        except Exception as e:
+            logger.exception("Error in integrated recommendation process: %s", e)
+            return []
+    
+    def _integrated_recommendation_process(self, input_data, input_type, top_n, snapshot):
+        """Body of integrated_recommendation_process, timed as the request stage"""
+        logger.debug("Starting integrated recommendation process with input_type: %s", input_type)
+        METRICS.increment('recommendation_requests_total')
+        snapshot = snapshot or self.snapshot
+        
+        # Step 1: Process input based on type
+        with METRICS.timer('profile'):
+            candidate = self._candidate_from_input(input_data, input_type)
+            # Identical profiles reuse earlier results computed on the same catalog version
+            candidate, cache_key = self._canonical_profile(candidate)
+        
+        logger.debug("Candidate profile created with %d skills", len(candidate.get('skills', [])))
+        
+        cache_key = cache_key + (top_n, snapshot.version)
+        cached = self.recommendation_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Returning %d cached recommendations", len(cached))
+            return _copy_recommendations(cached)
+        
+        # Step 2: Generate recommendations
+        raw_recommendations = get_recommendations(
+            candidate, snapshot.internships_df, snapshot.locations_df, scorer=snapshot.scorer, top_n=top_n,
+            ann_index=snapshot.ann_index
+        )
+        logger.debug("Generated %d initial recommendations", len(raw_recommendations))
+        
+        # Step 3: Enhance recommendations with career paths and learning resources
+        enhanced_recommendations = self._enhance_recommendations(raw_recommendations, candidate, snapshot)
+        
+        self.recommendation_cache.put(cache_key, enhanced_recommendations)
+        logger.debug("Enhanced and returning %d recommendations", len(enhanced_recommendations))
+        return _copy_recommendations(enhanced_recommendations)
+    
+    def _candidate_from_input(self, input_data, input_type):
+        """Build a candidate profile dict from form, profile or resume input"""
+        candidate = {}
+        if input_type in ('form', 'profile'):
+            candidate = {
+                'skills': input_data.get('skills', []),
+                'sector': input_data.get('sector', ''),
+                'location': input_data.get('location', ''),
+                'education': input_data.get('education', ''),
+                'full_text': ''
+            }
+        elif input_type == 'resume':
+            # Extract from resume data
+            locations_list = input_data.get('locations', [])
+            education_list = input_data.get('education', [])
             
-            # Step 3: Enhance recommendations with career paths and learning resources
-            enhanced_recommendations = []
-            for rec in raw_recommendations:
-                # Skill gap analysis
-                missing_skills = rec.get('missing_skills', [])
-                
+            candidate = {
+                'skills': input_data.get('skills', []),
+                'sector': input_data.get('sector', ''),
+                'location': locations_list[0] if locations_list and len(locations_list) > 0 else '',
+                'education': education_list[0] if education_list and len(education_list) > 0 else '',
+                'full_text': input_data.get('full_text', '')
+            }
+        return candidate
+    
+    def _enhance_recommendations(self, raw_recommendations, candidate, snapshot):
+        """Add learning resources and a career path to each recommendation"""
+        enhanced_recommendations = []
+        # Learning resources for the skill gaps of every recommendation in one lookup
+        with METRICS.timer('learning_resources'):
+            learning_resources = get_batch_learning_resources(
+                [rec.get('missing_skills', []) for rec in raw_recommendations],
+                snapshot.learning_resources_df,
+                snapshot.learning_resource_index
+            )
+        with METRICS.timer('career_paths'):
+            for rec, resources in zip(raw_recommendations, learning_resources):
                 # Add learning resources
-                rec['learning_resources'] = get_learning_resources(
-                    missing_skills, 
-                    self.learning_resources_df
-                )
+                rec['learning_resources'] = resources
                 
                 # Add career path
                 rec['career_path'] = get_career_path(
                     rec['internship']['Sector'], 
                     candidate['skills'],
-                    self.career_paths_df
+                    snapshot.career_paths_df,
+                    snapshot.career_path_index
                 )
                 
                 enhanced_recommendations.append(rec)
-            
-            print(f"Enhanced and returning {len(enhanced_recommendations)} recommendations")
-            return enhanced_recommendations
-            
-        except Exception as e:
-            print(f"Error in integrated recommendation process: {e}")
-            return []
+        return enhanced_recommendations
+    
+    def batch_recommend(self, profiles, top_n=5, chunk_size=BATCH_CHUNK_SIZE, snapshot=None):
+        """
+        Recommend internships for many candidate profiles.
+        
+        Profiles are consumed lazily and scored chunk_size at a time with
+        get_batch_recommendations, so a whole cohort shares one pass over the
+        catalog matrices per chunk and memory stays bounded. Profiles already
+        in the recommendation cache are answered from it. The whole batch is
+        scored against one catalog snapshot.
+        
+        Args:
+            profiles (iterable): Profile dicts with skills, sector, location and education
+            top_n (int): Number of recommendations per profile
+            chunk_size (int): Number of profiles scored together
+            snapshot (CatalogSnapshot): Catalog snapshot to use (the current one by default)
+        
+        Yields:
+            dict: {'index', 'recommendations'} or {'index', 'error'} per profile, in input order
+        """
+        snapshot = snapshot or self.snapshot
+        chunk = []
+        for index, profile in enumerate(profiles):
+            chunk.append((index, profile))
+            if len(chunk) >= chunk_size:
+                yield from self._recommend_chunk(chunk, top_n, snapshot)
+                chunk = []
+        if chunk:
+            yield from self._recommend_chunk(chunk, top_n, snapshot)
+    
+    def _recommend_chunk(self, chunk, top_n, snapshot):
+        """Recommendations for one chunk of (index, profile) pairs, in chunk order"""
+        results = {}
+        pending = []
+        for index, profile in chunk:
+            if not isinstance(profile, dict):
+                results[index] = {'index': index, 'error': 'Profile must be an object'}
+                continue
+            if not any(profile.get(key) for key in ('skills', 'sector', 'location', 'education')):
+                results[index] = {
+                    'index': index,
+                    'error': 'Please provide at least one preference (skills, sector, location, or education)'
+                }
+                continue
+            try:
+                candidate, cache_key = self._canonical_profile(self._candidate_from_input(profile, 'profile'))
+            except (AttributeError, TypeError, ValueError) as e:
+                # e.g. non-string skills or an object as sector
+                results[index] = {'index': index, 'error': f'Invalid profile: {e}'}
+                continue
+            cache_key = cache_key + (top_n, snapshot.version)
+            cached = self.recommendation_cache.get(cache_key)
+            if cached is not None:
+                results[index] = {'index': index, 'recommendations': _copy_recommendations(cached)}
+            else:
+                pending.append((index, candidate, cache_key))
+        
+        if pending:
+            try:
+                batch_results = get_batch_recommendations(
+                    [candidate for _, candidate, _ in pending],
+                    snapshot.internships_df, snapshot.locations_df, scorer=snapshot.scorer, top_n=top_n
+                )
+                for (index, candidate, cache_key), raw_recommendations in zip(pending, batch_results):
+                    enhanced_recommendations = self._enhance_recommendations(raw_recommendations, candidate, snapshot)
+                    self.recommendation_cache.put(cache_key, enhanced_recommendations)
+                    results[index] = {
+                        'index': index,
+                        'recommendations': _copy_recommendations(enhanced_recommendations)
+                    }
+            except Exception as e:
+                logger.exception("Error in batch recommendation: %s", e)
+                for index, _, _ in pending:
+                    results.setdefault(index, {'index': index, 'error': 'Failed to generate recommendations'})
+        
+        for index, _ in chunk:
+            yield results[index]
+    
+    def _canonical_profile(self, candidate):
+        """
+        Canonicalize a candidate profile and build its cache key.
+        
+        Skills are scored as submitted (split and stripped) and keyed
+        lowercased, de-duplicated and sorted. The sector is normalized,
+        location/education are stripped and the location is keyed lowercased
+        (location matching ignores case), so equivalent form inputs share one
+        cache entry. The resume text is keyed by its hash.
+        
+        Returns:
+            tuple: (canonical candidate dict, cache key)
+        """
+        skills = [skill.strip() for skill in preprocess_skills(candidate.get('skills') or []) if skill and skill.strip()]
+        canonical = {
+            'skills': skills,
+            'sector': normalize_sector(candidate.get('sector') or ''),
+            'location': str(candidate.get('location') or '').strip(),
+            'education': str(candidate.get('education') or '').strip(),
+            'full_text': candidate.get('full_text') or ''
+        }
+        text_digest = hashlib.sha1(str(canonical['full_text']).encode('utf-8')).hexdigest() if canonical['full_text'] else ''
+        cache_key = (
+            tuple(sorted({skill.lower() for skill in skills})),
+            canonical['sector'],
+            canonical['location'].lower(),
+            canonical['education'],
+            text_digest
+        )
+        return canonical, cache_key
+    
+    def get_cache_stats(self):
+        """Hit/miss/eviction counters of the recommendation cache, and of the parsed-resume cache"""
+        stats = self.recommendation_cache.stats()
+        stats['resume_cache'] = self.resume_cache.stats()
+        return stats
+    
+    def get_metric_samples(self):
+        """Catalog and cache samples for the metrics endpoint, as (name, type, help, value)"""
+        snapshot = self.snapshot
+        recommendation = self.recommendation_cache.stats()
+        resume = self.resume_cache.stats()
+        resume_hits = resume['hits'] + resume['disk_hits']
+        resume_misses = resume['misses'] - resume['disk_hits']
+        return [
+            ('catalog_version', 'gauge', 'Version of the catalog snapshot served', snapshot.version),
+            ('catalog_internships', 'gauge', 'Live postings in the catalog', len(snapshot.scorer.live_positions)),
+            ('catalog_pending_rows', 'gauge', 'Postings changed by deltas since the last full build',
+             snapshot.pending_rows),
+            ('recommendation_cache_hits_total', 'counter', 'Recommendation cache hits', recommendation['hits']),
+            ('recommendation_cache_misses_total', 'counter', 'Recommendation cache misses', recommendation['misses']),
+            ('recommendation_cache_hit_rate', 'gauge', 'Share of recommendation requests served from the cache',
+             recommendation['hit_rate']),
+            ('resume_cache_hits_total', 'counter', 'Uploads served from the parsed-resume cache', resume_hits),
+            ('resume_cache_misses_total', 'counter', 'Uploads parsed from scratch', resume_misses),
+            ('resume_cache_hit_rate', 'gauge', 'Share of uploads served from the parsed-resume cache',
+             resume_hits / (resume_hits + resume_misses) if resume_hits + resume_misses else 0.0)
+        ]
     
     def store_feedback(self, feedback_data):
         """Store user feedback for analytics"""
         # In a real application, this would store data to a database
         # For now, we'll just print it
-        print(f"Feedback received: {feedback_data}")
+        logger.info("Feedback received", extra={'feedback': feedback_data})
         return True
     
-    def get_top_matches(self, user_profile, top_n=5):
+    def get_top_matches(self, user_profile, top_n=5, snapshot=None):
         """
         Get top matching internships for a user profile.
         This is the main matching function that integrates all recommendation logic.
@@ -365,37 +615,179 @@ class InternshipService:
         Args:
             user_profile (dict): User profile containing skills, education, sector, location
             top_n (int): Number of top recommendations to return
+            snapshot (CatalogSnapshot): Catalog snapshot to use (the current one by default)
             
         Returns:
             list: Top matching internships with scores and explanations
         """
         try:
-            print(f"Getting top {top_n} matches for user profile")
+            logger.debug("Getting top %d matches for user profile", top_n)
             
             # Use the integrated recommendation process
-            recommendations = self.integrated_recommendation_process(user_profile, input_type='profile')
+            recommendations = self.integrated_recommendation_process(
+                user_profile, input_type='profile', top_n=top_n, snapshot=snapshot
+            )
+            
+            return recommendations if recommendations else []
             
-            # Return only the requested number of recommendations
-            return recommendations[:top_n] if recommendations else []
+        except Exception as e:
+            logger.exception("Error getting top matches: %s", e)
+            return []
+    
+    def get_hybrid_recommendations(self, user_profile, top_n=5):
+        """
+        Rule-based recommendations re-ranked with TF-IDF similarity.
+        
+        Falls back to the rule-based ranking when TF-IDF is not available.
+        
+        Args:
+            user_profile (dict): User profile containing skills, education, sector, location and
+                                 optionally full_text
+            top_n (int): Number of top recommendations to return
             
+        Returns:
+            list: Recommendations with score, rule_score and tfidf_score
+        """
+        try:
+            snapshot = self.snapshot
+            engine = snapshot.tfidf_engine
+            candidate = dict(user_profile)
+            recommendations = hybrid_recommendation(
+                candidate, snapshot.internships_df, snapshot.locations_df, top_n=top_n,
+                use_tfidf=engine is not None, scorer=snapshot.scorer, engine=engine
+            )
+            return self._enhance_recommendations(recommendations, candidate, snapshot)
         except Exception as e:
-            print(f"Error getting top matches: {e}")
+            logger.exception("Error getting hybrid recommendations: %s", e)
             return []
     
     def load_internship_data(self):
         """
-        Reload internship data from CSV files.
+        Reload every catalog table from the data directory and publish it as a new snapshot.
         Useful for refreshing data without restarting the application.
+        
+        The new snapshot is built and validated while the current one keeps
+        serving, then swapped in with one reference assignment; requests in
+        flight finish on the snapshot they started with. Postings changed
+        through apply_delta are replaced by the content of the files.
+        
+        Returns:
+            bool: Whether a new snapshot was published
+        """
+        with self._reload_lock:
+            return self._publish_next_snapshot(
+                lambda version: CatalogSnapshot.load(self.data_dir, version), 'reloading catalog data'
+            )
+    
+    def start_reload(self):
+        """
+        Reload the catalog in a background thread (see load_internship_data).
+        
+        Returns:
+            bool: False when a reload, compaction or delta is already running
+        """
+        return self._start_background(
+            lambda version: CatalogSnapshot.load(self.data_dir, version), 'reloading catalog data'
+        )
+    
+    def apply_delta(self, upserts=(), deletes=()):
         """
+        Add, update or retire individual postings without rebuilding the catalog.
+        
+        The next snapshot is derived from the current one in time proportional
+        to the delta (see CatalogSnapshot.with_delta) and published like a
+        reload. Replaced and deleted postings stay in place as retired rows
+        until a compaction rebuilds the catalog from the live postings; one is
+        started in the background once enough rows are pending.
+        
+        Args:
+            upserts (list): Full postings (dicts with the internship columns, ID required)
+            deletes (list): IDs of postings to retire
+            
+        Returns:
+            dict: catalog_version plus the inserted, updated, deleted and not_found
+                IDs, or None when a reload, compaction or delta is already running
+            
+        Raises:
+            ValueError: When an upserted posting is invalid (nothing is applied then)
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return None
+        try:
+            current = self._snapshot
+            snapshot, summary = current.with_delta(upserts, deletes, version=current.version + 1)
+            self._publish(snapshot)
+        finally:
+            self._reload_lock.release()
+        
+        live = len(snapshot.scorer.live_positions)
+        if snapshot.pending_rows >= COMPACTION_PENDING_FRACTION * max(live, 1) or \
+                (snapshot.pending_rows and time.time() - snapshot.built_at >= COMPACTION_INTERVAL):
+            self.start_compaction()
+        return dict(summary, catalog_version=snapshot.version)
+    
+    def compact(self):
+        """
+        Rebuild the catalog from its live postings, dropping retired rows and
+        refitting the TF-IDF engine and ANN index on the postings added since.
+        
+        Returns:
+            bool: Whether a new snapshot was published
+        """
+        with self._reload_lock:
+            return self._publish_next_snapshot(lambda version: self._snapshot.compacted(version), 'compacting catalog')
+    
+    def start_compaction(self):
+        """
+        Compact the catalog in a background thread (see compact).
+        
+        Returns:
+            bool: False when a reload, compaction or delta is already running
+        """
+        return self._start_background(lambda version: self._snapshot.compacted(version), 'compacting catalog')
+    
+    def _start_background(self, build, action):
+        """Build and publish the next snapshot in a background thread, unless an update is running"""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        
+        def run():
+            try:
+                self._publish_next_snapshot(build, action)
+            finally:
+                self._reload_lock.release()
+        
+        threading.Thread(target=run, name='catalog-update', daemon=True).start()
+        return True
+    
+    def _publish_next_snapshot(self, build, action):
+        """Build, validate and publish the next snapshot; the caller holds the reload lock"""
         try:
-            self.internships_df = pd.read_csv(os.path.join(self.data_dir, 'internships.csv'))
-            print(f"Reloaded {len(self.internships_df)} internships")
-            return True
+            snapshot = build(self._snapshot.version + 1)
         except Exception as e:
-            print(f"Error reloading internship data: {e}")
+            self.last_reload_error = str(e)
+            logger.error("Error %s, still serving version %d: %s", action, self._snapshot.version, e)
             return False
+        self._publish(snapshot)
+        self.last_reload_error = None
+        return True
+    
+    def _publish(self, snapshot):
+        """Swap in a new snapshot; the caller holds the reload lock"""
+        self._snapshot = snapshot
+        # Cached results were computed against the previous catalog
+        self.recommendation_cache.clear()
+        logger.info("Published catalog version %d with %d internships", snapshot.version, len(snapshot.scorer.live_positions),
+                    extra={'catalog_version': snapshot.version})
+    
+    def get_catalog_status(self):
+        """Version and size of the served catalog, and the state of reloads"""
+        status = self.snapshot.summary()
+        status['reloading'] = self._reload_lock.locked()
+        status['last_reload_error'] = self.last_reload_error
+        return status
     
-    def get_internship_by_id(self, internship_id):
+    def get_internship_by_id(self, internship_id, snapshot=None):
         """
         Get a specific internship by its ID.
         
@@ -406,48 +798,32 @@ class InternshipService:
             dict: Internship details or None if not found
         """
         try:
-            internship = self.internships_df[self.internships_df['ID'] == str(internship_id)]
-            if not internship.empty:
-                return internship.iloc[0].to_dict()
+            internship = (snapshot or self.snapshot).internship(internship_id)
+            if internship is not None:
+                return internship.to_dict()
             return None
         except Exception as e:
-            print(f"Error getting internship by ID {internship_id}: {e}")
+            logger.exception("Error getting internship by ID %s: %s", internship_id, e)
             return None
     
-    def search_internships(self, query, filters=None):
+    def search_internships(self, query, filters=None, top_k=None, snapshot=None):
         """
         Search internships by query and optional filters.
         
         Args:
-            query (str): Search query
+            query (str): Search query, ranked with BM25 over title, description and skills
             filters (dict): Optional filters for sector, location, etc.
+            top_k (int): Maximum number of results (all matches when None)
+            snapshot (CatalogSnapshot): Catalog snapshot to use (the current one by default)
             
         Returns:
-            list: Matching internships
+            list: Matching internships, best match first
         """
         try:
-            df = self.internships_df.copy()
-            
-            # Apply filters if provided
-            if filters:
-                if 'sector' in filters and filters['sector']:
-                    df = df[df['Sector'].str.contains(filters['sector'], case=False, na=False)]
-                if 'location' in filters and filters['location']:
-                    df = df[df['Location'].str.contains(filters['location'], case=False, na=False)]
-                if 'education' in filters and filters['education']:
-                    df = df[df['Education_Required'].str.contains(filters['education'], case=False, na=False)]
-            
-            # Search in title and description
-            if query:
-                query_mask = (
-                    df['Title'].str.contains(query, case=False, na=False) |
-                    df['Description'].str.contains(query, case=False, na=False) |
-                    df['Skills_Required'].str.contains(query, case=False, na=False)
-                )
-                df = df[query_mask]
-            
-            return df.to_dict('records')
+            search_index = (snapshot or self.snapshot).search_index
+            results = search_index.search(query, filters, top_k=top_k)
+            return [search_index.record(row_id) for row_id, _ in results]
             
         except Exception as e:
-            print(f"Error searching internships: {e}")
+            logger.exception("Error searching internships: %s", e)
             return []
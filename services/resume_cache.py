@@ -0,0 +1,91 @@
+"""
+Cache of parsed resumes keyed by the content of the upload.
+
+Students often upload the same file again while changing their
+preferences. The parse result of an upload is keyed by the SHA-256 of its
+bytes (and extension, which selects the parser) plus a fingerprint of the
+skills, education and locations tables it was extracted with, so a repeat
+upload skips text and entity extraction, and a catalog reload with changed
+vocabularies does not serve stale results. Entries live in a bounded
+in-memory LRU and, optionally, as JSON files in a directory so they survive
+restarts.
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from services.result_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Parsed resumes kept in memory
+RESUME_CACHE_SIZE = 256
+
+
+def upload_digest(filename, content):
+    """SHA-256 of an upload's bytes and (lowercased) extension"""
+    digest = hashlib.sha256(os.path.splitext(filename)[1].lower().encode('utf-8') + b'\0')
+    digest.update(content)
+    return digest.hexdigest()
+
+
+class ResumeParseCache:
+    """
+    Parsed resumes by upload digest and parser tables version.
+
+    Args:
+        max_size (int): Entries kept in memory
+        cache_dir (str): Optional directory persisting every entry as a JSON file
+    """
+    def __init__(self, max_size=RESUME_CACHE_SIZE, cache_dir=None):
+        self.memory = LRUCache(max_size=max_size, ttl=None)
+        self.cache_dir = cache_dir
+        self.disk_hits = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, digest, tables_version):
+        """Parse result for an upload, or None; callers get their own copy"""
+        key = f'{digest}-{tables_version}'
+        resume_data = self.memory.get(key)
+        if resume_data is None and self.cache_dir:
+            try:
+                with open(self._path(key), encoding='utf-8') as f:
+                    resume_data = json.load(f)
+            except (OSError, ValueError):
+                return None
+            self.disk_hits += 1
+            self.memory.put(key, resume_data)
+        return copy.deepcopy(resume_data) if resume_data is not None else None
+
+    def put(self, digest, tables_version, resume_data):
+        """Store the parse result of an upload"""
+        key = f'{digest}-{tables_version}'
+        resume_data = copy.deepcopy(resume_data)
+        self.memory.put(key, resume_data)
+        if not self.cache_dir:
+            return
+        # Written next to its final name and renamed, so readers never see a partial file
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(resume_data, f)
+            os.replace(temp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Could not persist parsed resume: %s", e)
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def stats(self):
+        """Counters of the in-memory LRU, plus hits served from disk"""
+        stats = self.memory.stats()
+        stats['disk_hits'] = self.disk_hits
+        stats['persistent'] = bool(self.cache_dir)
+        return stats
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.json')
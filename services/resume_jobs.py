@@ -0,0 +1,291 @@
+"""
+Asynchronous resume processing.
+
+ResumeJobQueue takes uploaded resumes off the request thread: text
+extraction (pdfplumber / PyPDF2 / python-docx) and skill, education and
+location extraction run in a bounded pool of worker processes, and the
+parsed profile is then scored against the catalog in a background thread of
+the web process. Uploads parsed before are served from the service's
+parsed-resume cache without reaching the worker processes. submit returns a
+job at once, whose status and result are polled by id; when
+RESUME_QUEUE_SIZE jobs are already queued or running, submit refuses new
+ones so callers can apply back-pressure.
+"""
+import os
+import logging
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from services.resume_cache import upload_digest
+from utils.metrics import METRICS
+from utils.resume_parser import parse_resume
+
+logger = logging.getLogger(__name__)
+
+# Resume parsing processes (leaving a core to the web workers)
+RESUME_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+# Jobs queued or running at once; further uploads are refused until one finishes
+RESUME_QUEUE_SIZE = 32
+
+# Seconds a finished job (and its result) stays available, and the most finished jobs kept
+RESUME_JOB_TTL = 600
+RESUME_JOBS_KEPT = 1000
+
+# File types text can be extracted from
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+# Uploads up to this many bytes are handed to the worker processes in memory;
+# larger ones are spilled to a temporary file and passed by path
+RESUME_SPILL_THRESHOLD = 2 * 1024 * 1024
+
+
+# Resume tables of a worker process, set by _init_worker
+_tables = None
+
+
+def _init_worker(skills_df, education_df, locations_df):
+    """Process pool initializer: keep the snapshot's resume tables for every job of the worker"""
+    global _tables
+    _tables = (skills_df, education_df, locations_df)
+
+
+def _parse_upload(source, filename):
+    """
+    Process pool task: parse an upload from its bytes or its spilled file.
+
+    Returns the parse result and the stage timings observed while parsing,
+    to be replayed in the web process.
+    """
+    skills_df, education_df, locations_df = _tables
+    observations = METRICS.capture()
+    try:
+        return parse_resume(source, skills_df, education_df, locations_df, filename=filename), observations
+    finally:
+        METRICS.stop_capture()
+
+
+class ResumeJob:
+    """
+    One uploaded resume on its way through the pipeline.
+
+    status goes from 'queued' to 'parsing' and 'scoring', and ends as
+    'done' (profile and recommendations are set) or 'failed' (error is set).
+    """
+    def __init__(self, filename, top_n):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.top_n = top_n
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.finished_at = None
+        self.profile = None
+        self.recommendations = None
+        self.error = None
+        self._finished = threading.Event()
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the job finished; returns False on timeout"""
+        return self._finished.wait(timeout)
+
+    def to_dict(self):
+        """Status of the job, without the recommendations"""
+        return {
+            'job_id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'profile': self.profile,
+            'error': self.error
+        }
+
+
+class ResumeJobQueue:
+    """
+    Bounded queue of resume jobs for an InternshipService.
+
+    The worker threads and processes are started with the first job. Worker
+    processes receive the skill, education and location tables once, when
+    they start, and keep them (and their compiled skill matchers) between
+    jobs; the process pool is replaced when a catalog reload changes those
+    tables.
+
+    Args:
+        service (InternshipService): Service scoring the parsed profiles
+        workers (int): Number of parsing processes
+        max_pending (int): Jobs queued or running at once
+        job_ttl (float): Seconds a finished job stays available
+    """
+    def __init__(self, service, workers=RESUME_WORKERS, max_pending=RESUME_QUEUE_SIZE, job_ttl=RESUME_JOB_TTL):
+        self.service = service
+        self.workers = workers
+        self.max_pending = max_pending
+        self.job_ttl = job_ttl
+        self._jobs = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._processes = None
+        self._tables_version = None
+        self._threads = None
+
+    def submit(self, filename, content, top_n=5):
+        """
+        Queue an uploaded resume for parsing and recommendation.
+
+        The upload is parsed from memory; only uploads larger than
+        RESUME_SPILL_THRESHOLD are written to a temporary file first.
+
+        Args:
+            filename (str): Name of the uploaded file (its extension selects the parser)
+            content (bytes): Content of the file
+            top_n (int): Number of recommendations to compute
+
+        Returns:
+            ResumeJob: The queued job, or None when the queue is full
+        """
+        with self._lock:
+            self._prune()
+            if self._pending >= self.max_pending:
+                METRICS.increment('resume_jobs_rejected_total')
+                return None
+            self._pending += 1
+            job = ResumeJob(filename, top_n)
+            self._jobs[job.id] = job
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='resume-job')
+
+        try:
+            source = self._spill(filename, content) if len(content) > RESUME_SPILL_THRESHOLD else content
+            self._threads.submit(self._run, job, source, upload_digest(filename, content))
+        except Exception as e:
+            self._finish(job, 'failed', error=str(e))
+        return job
+
+    def get(self, job_id):
+        """Job with an id, or None when unknown or expired"""
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        """Queue occupancy, for status endpoints"""
+        with self._lock:
+            return {'pending': self._pending, 'max_pending': self.max_pending, 'workers': self.workers}
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads and processes"""
+        with self._lock:
+            threads, processes = self._threads, self._processes
+            self._threads = self._processes = None
+        if threads is not None:
+            threads.shutdown(wait=wait)
+        if processes is not None:
+            processes.shutdown(wait=wait)
+
+    def _spill(self, filename, content):
+        """Write the upload to a private temporary file named with its (lowercased) extension"""
+        extension = os.path.splitext(filename)[1].lower()
+        fd, path = tempfile.mkstemp(prefix='resume-', suffix=extension)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        return path
+
+    def _submit_parse(self, source, filename, snapshot):
+        """
+        Submit a parse to the process pool whose workers hold the resume
+        tables of snapshot, starting that pool first when the tables changed
+        (jobs already submitted to the previous pool finish there).
+        """
+        retired = None
+        with self._lock:
+            if self._processes is None or self._tables_version != snapshot.resume_tables_version:
+                retired = self._processes
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker,
+                    initargs=(snapshot.skills_df, snapshot.education_df, snapshot.locations_df)
+                )
+                self._tables_version = snapshot.resume_tables_version
+            processes = self._processes
+            try:
+                future = processes.submit(_parse_upload, source, filename)
+            except BrokenProcessPool:
+                self._processes = None
+                raise
+        if retired is not None:
+            retired.shutdown(wait=False)
+        return processes, future
+
+    def _run(self, job, source, digest):
+        """Worker thread: parse in the process pool (unless the upload was parsed before), then score in this thread"""
+        try:
+            snapshot = self.service.snapshot
+            METRICS.observe('stage_seconds', time.time() - job.created_at, 'resume_queue_wait')
+            job.status = 'parsing'
+            resume_data = self.service.resume_cache.get(digest, snapshot.resume_tables_version)
+            if resume_data is None:
+                with METRICS.timer('resume_parse'):
+                    resume_data = self._parse(source, job.filename, snapshot)
+                self.service.cache_parsed_resume(digest, snapshot, resume_data)
+
+            job.status = 'scoring'
+            recommendations = self.service.integrated_recommendation_process(
+                resume_data, input_type='resume', top_n=job.top_n, snapshot=snapshot
+            )
+            job.profile = {
+                'skills': resume_data.get('skills', []),
+                'education': resume_data.get('education', []),
+                'locations': resume_data.get('locations', [])
+            }
+            self._finish(job, 'done', recommendations=recommendations)
+        except Exception as e:
+            logger.exception("Error processing resume job %s: %s", job.id, e, extra={'job_id': job.id})
+            self._finish(job, 'failed', error=str(e))
+        finally:
+            if isinstance(source, str):
+                try:
+                    os.unlink(source)
+                except OSError:
+                    pass
+
+    def _parse(self, source, filename, snapshot):
+        processes = None
+        try:
+            processes, future = self._submit_parse(source, filename, snapshot)
+            resume_data, observations = future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. on a malformed file); the next job gets a fresh pool
+            with self._lock:
+                if processes is not None and self._processes is processes:
+                    self._processes = None
+            raise RuntimeError("Resume parser crashed")
+        METRICS.replay(observations)
+        return resume_data
+
+    def _finish(self, job, status, recommendations=None, error=None):
+        job.recommendations = recommendations
+        job.error = error
+        job.finished_at = time.time()
+        job.status = status
+        with self._lock:
+            self._pending -= 1
+        job._finished.set()
+
+    def _prune(self):
+        """Drop expired finished jobs, and the oldest ones beyond RESUME_JOBS_KEPT; the caller holds the lock"""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished]
+        excess = len(finished) - RESUME_JOBS_KEPT
+        for job in finished:
+            if excess > 0 or now - job.finished_at > self.job_ttl:
+                del self._jobs[job.id]
+                excess -= 1
@@ -0,0 +1,243 @@
+"""
+In-memory inverted index over the internship catalog.
+
+Built once when the catalog is loaded. Postings map each token of an
+internship's Title, Description and Skills_Required to the rows it appears
+in with term frequencies, so queries are ranked with BM25 without scanning
+the whole DataFrame. Sector, location and education filters are answered
+from precomputed per-row value codes. Postings can be appended and retired
+without rebuilding the index (see with_delta).
+"""
+import bisect
+import copy
+import heapq
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+# Fields that are searched by the free-text query
+SEARCH_FIELDS = ['Title', 'Description', 'Skills_Required']
+
+# Filter name -> catalog column
+FILTER_COLUMNS = {
+    'sector': 'Sector',
+    'location': 'Location',
+    'education': 'Education_Required'
+}
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Shortest last query term implicitly treated as a prefix ('c++' must not match every 'c...' token);
+# explicit 'term*' prefixes have no minimum
+MIN_PREFIX_LENGTH = 3
+
+
+def tokenize(text):
+    """Lowercase word tokens of a text"""
+    if text is None or pd.isna(text):
+        return []
+    return re.findall(r'\w+', str(text).lower())
+
+
+class InternshipSearchIndex:
+    """
+    Inverted index with BM25 ranking, prefix search and filter bitmaps.
+
+    Args:
+        internships_df (DataFrame): Internship catalog
+    """
+    def __init__(self, internships_df):
+        self.columns = list(internships_df.columns)
+        self._row_values = internships_df.values
+        self.size = len(internships_df)
+        # Retired rows keep their row id and postings until the index is rebuilt
+        self.live = np.ones(self.size, dtype=bool)
+        self.live_count = self.size
+
+        self.postings = {}
+        self.doc_lengths = np.zeros(0, dtype=np.float64)
+        self._add_postings(internships_df, 0)
+        # Sorted vocabulary for prefix lookups
+        self.vocabulary = sorted(self.postings)
+        self.average_length = self.doc_lengths.mean() if self.size else 0.0
+
+        self.filter_values = {name: {} for name in FILTER_COLUMNS}
+        self.filter_codes = {name: np.zeros(0, dtype=np.int64) for name in FILTER_COLUMNS}
+        self._add_filter_codes(internships_df)
+
+    def with_delta(self, new_rows_df, retired_positions=()):
+        """
+        New index with rows appended and rows retired, leaving this one unchanged.
+
+        Only the appended rows are tokenized, and only the posting lists of
+        their tokens are extended; retired rows are masked out of every result.
+
+        Args:
+            new_rows_df (DataFrame): Postings to append, with this catalog's columns
+            retired_positions (array): Row ids of the rows to retire
+
+        Returns:
+            InternshipSearchIndex: Index of the updated catalog
+        """
+        index = copy.copy(self)
+        index._row_values = np.concatenate([self._row_values, new_rows_df[self.columns].values])
+        index.size = self.size + len(new_rows_df)
+        index.live = np.concatenate([self.live, np.ones(len(new_rows_df), dtype=bool)])
+        index.live[np.asarray(retired_positions, dtype=np.int64)] = False
+        index.live_count = int(np.count_nonzero(index.live))
+
+        index.postings = dict(self.postings)
+        new_tokens = index._add_postings(new_rows_df, self.size)
+        if new_tokens:
+            index.vocabulary = list(heapq.merge(self.vocabulary, sorted(new_tokens)))
+        index.average_length = index.doc_lengths[index.live].mean() if index.live_count else 0.0
+
+        index.filter_values = {name: dict(values) for name, values in self.filter_values.items()}
+        index._add_filter_codes(new_rows_df)
+        return index
+
+    def _add_postings(self, internships_df, start):
+        """
+        Add token -> (row ids, term frequencies) postings for rows numbered from start.
+
+        Returns:
+            list: Tokens that were not in the vocabulary yet
+        """
+        postings = {}
+        doc_lengths = np.zeros(len(internships_df), dtype=np.float64)
+        fields = [internships_df[field].tolist() if field in internships_df.columns else [None] * len(internships_df)
+                  for field in SEARCH_FIELDS]
+
+        for i, values in enumerate(zip(*fields)):
+            frequencies = {}
+            for value in values:
+                for token in tokenize(value):
+                    frequencies[token] = frequencies.get(token, 0) + 1
+            doc_lengths[i] = sum(frequencies.values())
+            for token, frequency in frequencies.items():
+                rows, counts = postings.setdefault(token, ([], []))
+                rows.append(start + i)
+                counts.append(frequency)
+
+        new_tokens = []
+        for token, (rows, counts) in postings.items():
+            rows, counts = np.asarray(rows, dtype=np.int64), np.asarray(counts, dtype=np.float64)
+            existing = self.postings.get(token)
+            if existing is None:
+                new_tokens.append(token)
+            else:
+                rows, counts = np.concatenate([existing[0], rows]), np.concatenate([existing[1], counts])
+            self.postings[token] = (rows, counts)
+        self.doc_lengths = np.concatenate([self.doc_lengths, doc_lengths])
+        return new_tokens
+
+    def _add_filter_codes(self, internships_df):
+        """Encode the filter columns of appended rows as codes of their distinct (lowercased) values"""
+        for name, column in FILTER_COLUMNS.items():
+            values = self.filter_values[name]
+            codes = np.full(len(internships_df), -1, dtype=np.int64)
+            if column in internships_df.columns:
+                for i, value in enumerate(internships_df[column].tolist()):
+                    if value is None or pd.isna(value):
+                        continue
+                    codes[i] = values.setdefault(str(value).lower(), len(values))
+            self.filter_codes[name] = np.concatenate([self.filter_codes[name], codes])
+
+    def expand_term(self, term, prefix=False):
+        """Vocabulary tokens matched by a query term (itself, or all tokens sharing the prefix)"""
+        if not prefix:
+            return [term] if term in self.postings else []
+        start = bisect.bisect_left(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + '\uffff')
+        return self.vocabulary[start:end]
+
+    def filter_mask(self, filters):
+        """
+        Boolean mask of rows passing all filters.
+
+        A filter value matches every distinct column value that contains it,
+        case-insensitively, as the previous str.contains scan did.
+        """
+        mask = self.live.copy()
+        for name, value in (filters or {}).items():
+            if not value or name not in self.filter_codes:
+                continue
+            needle = str(value).lower()
+            matching = [code for key, code in self.filter_values[name].items() if needle in key]
+            if not matching:
+                return np.zeros(self.size, dtype=bool)
+            mask &= np.isin(self.filter_codes[name], matching)
+        return mask
+
+    def _bm25(self, token):
+        """BM25 contribution of one token to the rows in its posting list"""
+        rows, frequencies = self.postings[token]
+        # Retired rows are left out of the document counts
+        n_rows = len(rows) if self.live_count == self.size else int(np.count_nonzero(self.live[rows]))
+        idf = math.log(1 + (self.live_count - n_rows + 0.5) / (n_rows + 0.5))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[rows] / (self.average_length or 1))
+        return rows, idf * frequencies * (BM25_K1 + 1) / (frequencies + norm)
+
+    def search(self, query, filters=None, top_k=None, prefix=True):
+        """
+        Rank internships for a free-text query.
+
+        Every query term must match the Title, Description or Skills_Required
+        of a result. Terms ending in '*', and the last term when prefix is
+        True and it has at least MIN_PREFIX_LENGTH characters, also match any
+        token starting with them.
+
+        Args:
+            query (str): Search query
+            filters (dict): Optional sector, location and education filters
+            top_k (int): Maximum number of results (all matches when None)
+            prefix (bool): Treat the last query term as a prefix
+
+        Returns:
+            list: (row id, score) pairs, best match first
+        """
+        if top_k is not None and top_k <= 0:
+            return []
+
+        mask = self.filter_mask(filters)
+        terms = re.findall(r'\w+\*?', (query or '').lower())
+
+        if not terms:
+            # No query: filtered rows in catalog order
+            row_ids = np.flatnonzero(mask)
+            if top_k is not None:
+                row_ids = row_ids[:top_k]
+            return [(int(row_id), 0.0) for row_id in row_ids]
+
+        scores = np.zeros(self.size, dtype=np.float64)
+        for position, term in enumerate(terms):
+            is_prefix = term.endswith('*') or (
+                prefix and position == len(terms) - 1 and len(term) >= MIN_PREFIX_LENGTH
+            )
+            tokens = self.expand_term(term.rstrip('*'), prefix=is_prefix)
+            matched = np.zeros(self.size, dtype=bool)
+            for token in tokens:
+                rows, token_scores = self._bm25(token)
+                scores[rows] += token_scores
+                matched[rows] = True
+            mask &= matched
+
+        row_ids = np.flatnonzero(mask)
+        if not len(row_ids):
+            return []
+
+        row_scores = scores[row_ids]
+        if top_k is not None and top_k < len(row_ids):
+            # Partial selection of the k best rows, then sort only those
+            selected = np.argpartition(-row_scores, top_k - 1)[:top_k]
+            row_ids, row_scores = row_ids[selected], row_scores[selected]
+        order = np.lexsort((row_ids, -row_scores))
+        return [(int(row_ids[i]), float(row_scores[i])) for i in order]
+
+    def record(self, row_id):
+        """Internship row as a dict"""
+        return dict(zip(self.columns, self._row_values[row_id]))
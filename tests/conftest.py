@@ -0,0 +1,31 @@
+"""Shared fixtures: the catalog tables of data/, read once per test session."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_ROOT, 'data')
+
+# The app's packages are imported from the repository root
+sys.path.insert(0, REPO_ROOT)
+
+
+def _table(name):
+    return pd.read_csv(os.path.join(DATA_DIR, f'{name}.csv'))
+
+
+@pytest.fixture(scope='session')
+def internships_df():
+    return _table('internships')
+
+
+@pytest.fixture(scope='session')
+def locations_df():
+    return _table('locations')
+
+
+@pytest.fixture(scope='session')
+def skills_df():
+    return _table('skills')
@@ -0,0 +1,42 @@
+"""
+Tables loaded from the compiled catalog bundle must equal the CSV files, and
+their numeric columns must stay backed by the bundle's memory maps.
+"""
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.catalog_store import CATALOG_TABLES, compile_bundle, load_tables
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def _memmap_backed(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+@pytest.fixture(scope='module')
+def bundle_dir(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp('catalog')
+    for name in CATALOG_TABLES:
+        shutil.copy2(os.path.join(DATA_DIR, f'{name}.csv'), data_dir)
+    compile_bundle(str(data_dir))
+    return str(data_dir)
+
+
+def test_bundled_tables_match_csv(bundle_dir):
+    for name, df in load_tables(bundle_dir).items():
+        pd.testing.assert_frame_equal(df, pd.read_csv(os.path.join(bundle_dir, f'{name}.csv')), check_dtype=False)
+
+
+def test_numeric_columns_stay_memory_mapped(bundle_dir):
+    internships_df = load_tables(bundle_dir, ['internships'])['internships']
+    for column in ['ID', 'Stipend']:
+        assert _memmap_backed(internships_df[column].to_numpy()), column
@@ -0,0 +1,125 @@
+"""
+CatalogScorer and get_recommendations must reproduce the original per-row scoring.
+
+tests/data/baseline_recommendations.json was computed once with the
+original row-by-row recommender (before CatalogScorer) on data/*.csv: for
+each profile, the skill, sector, location and text scores of every posting
+and the top 5 recommendations with their reasons and missing skills. The
+frozen values catch a change made to the scorer and the calculate_*
+functions alike. Skills are comma-separated strings there, since the
+original recommender failed on lists of several skills.
+
+Seeded random profiles, lists included, are also checked against the
+current calculate_* functions.
+"""
+import json
+import os
+import random
+import re
+
+import pytest
+
+from models.recommender import (
+    calculate_location_match, calculate_sector_match, calculate_skill_match, calculate_text_similarity,
+    get_recommendations, normalize_sector
+)
+from models.scoring import CatalogScorer
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'baseline_recommendations.json')
+
+SCORE_NAMES = ['skill_match', 'sector_match', 'location_match', 'text_similarity']
+
+N_PROFILES = 100
+
+EXTRA_SKILLS = [
+    'js', 'nodejs', 'k8s', 'ai', 'ml', 'mysql', 'Data', 'Research', 'python3', 'Marketing',
+    'Data Analytics', 'Communication Skills', 'html5'
+]
+SECTORS = ['', 'IT', 'pharmacy', 'tech', 'Business', 'design', 'Research', 'xyz', 'Legal', 'Architecture']
+LOCATIONS = ['', 'Bengaluru', 'Karnataka', 'Bihar', 'Gaya', 'Mumbai', 'Maharashtra', 'nowhere', 'delhi']
+TEXTS = [
+    '',
+    'I know python and sql, worked on data science and machine learning projects with a REST api',
+    'Designed social media campaigns, wrote content and analysed market research for a retail brand',
+    'the a an'
+]
+
+with open(BASELINE_FILE, encoding='utf-8') as f:
+    BASELINE = json.load(f)
+
+
+def _total(scores):
+    """The original weighted total"""
+    return (scores['skill_match'] * 2.5) + (scores['sector_match'] * 2) + \
+        (scores['location_match'] * 1.5) + (scores['text_similarity'] * 1)
+
+
+def _split_reason(reason):
+    """The reason text and its matched skills, which are listed in set (hash) order"""
+    match = re.search(r'Your skills in (.*?) match', reason)
+    if not match:
+        return reason, set()
+    return reason.replace(match.group(1), '', 1), set(match.group(1).split(', '))
+
+
+def _normalized(profile):
+    return dict(profile, sector=normalize_sector(profile['sector']) if profile['sector'] else '')
+
+
+@pytest.fixture(scope='module')
+def scorer(internships_df, locations_df):
+    return CatalogScorer(internships_df, locations_df)
+
+
+@pytest.mark.parametrize('case', BASELINE, ids=lambda case: case['profile']['skills'] or case['profile']['location'])
+def test_scores_match_baseline(case, scorer, internships_df):
+    scores = scorer.score(_normalized(case['profile']))
+    for position, internship_id in enumerate(internships_df['ID']):
+        expected = dict(zip(SCORE_NAMES, case['scores'][str(internship_id)]))
+        for name in SCORE_NAMES:
+            assert scores[name][position] == expected[name], (name, internship_id)
+        assert scores['total_score'][position] == _total(expected), internship_id
+
+
+@pytest.mark.parametrize('case', BASELINE, ids=lambda case: case['profile']['skills'] or case['profile']['location'])
+def test_recommendations_match_baseline(case, scorer, internships_df, locations_df):
+    got = get_recommendations(dict(case['profile']), internships_df, locations_df, scorer=scorer)
+    assert [int(rec['internship']['ID']) for rec in got] == [rec['id'] for rec in case['recommendations']]
+    for rec, expected in zip(got, case['recommendations']):
+        assert rec['scores'] == expected['scores']
+        assert rec['total_score'] == expected['total_score']
+        assert _split_reason(rec['reason']) == _split_reason(expected['reason'])
+        assert rec['missing_skills'] == expected['missing_skills']
+
+
+def _random_profiles(skills):
+    rng = random.Random(0)
+    profiles = []
+    for _ in range(N_PROFILES):
+        candidate_skills = rng.sample(skills + EXTRA_SKILLS, rng.randint(0, 8))
+        if rng.random() < 0.2:
+            candidate_skills = ', '.join(candidate_skills)
+        profiles.append({
+            'skills': candidate_skills,
+            'sector': rng.choice(SECTORS),
+            'location': rng.choice(LOCATIONS),
+            'full_text': rng.choice(TEXTS),
+            'education': rng.choice(['', 'B.Tech'])
+        })
+    return profiles
+
+
+def test_scores_match_per_row_functions(scorer, internships_df, locations_df, skills_df):
+    for profile in _random_profiles(skills_df['Skill'].dropna().tolist()):
+        candidate = _normalized(profile)
+        scores = scorer.score(candidate)
+        for position, (_, internship) in enumerate(internships_df.iterrows()):
+            expected = {
+                'skill_match': calculate_skill_match(candidate['skills'], internship['Skills_Required']),
+                'sector_match': calculate_sector_match(candidate['sector'], internship['Sector']),
+                'location_match': calculate_location_match(candidate['location'], internship['Location'], locations_df),
+                'text_similarity': calculate_text_similarity(candidate['full_text'], internship['Description'])
+            }
+            for name in SCORE_NAMES:
+                assert scores[name][position] == expected[name], (name, position, profile)
+            assert scores['total_score'][position] == _total(expected), (position, profile)
@@ -0,0 +1,152 @@
+"""
+extract_skills (one Aho-Corasick pass via SkillMatcher) must find exactly
+the skills, in the same order, as the per-skill regex extractor it replaced.
+
+The reference below is that original extractor. Sample texts mix every
+skill of data/skills.csv with the aliases and abbreviations it recognizes,
+punctuation and bullet delimiters, plus the project's own documents. Fixed
+cases pin down skills that overlap and skills next to punctuation.
+"""
+import os
+import random
+import re
+import string
+
+import pytest
+
+from utils.resume_parser import extract_skills
+
+N_TEXTS = 300
+
+VARIANTS = [
+    'js', 'node.js', 'nodejs', 'cpp', 'c plus plus', 'csharp', 'py', 'openjdk', 'reactjs', 'vue.js', 'mysql',
+    'ml', 'ai', 'ui', 'ux', 'apis', 'html5', 'css3', 'restful', 'C++', 'C#', 'Ph.D', 'B.Tech', 'Python3',
+    'PyTorch', 'data-science', 'machine_learning', 'résumé', 'e-commerce', 'UI/UX', 'ci/cd', 'Go-lang', 'R',
+    'go', 'sql-server', '•', '-', '/', '(', ')', ',', ';', '|', '\n', '\t', '  '
+]
+SEPARATORS = [' ', ', ', '\n', '', '.', ' • ', '/']
+DOCUMENTS = ['README.md', 'PROJECT_REPORT.md', 'FEATURES_AND_USES.txt']
+
+# Skills whose names or aliases contain one another; every one that matches is reported,
+# in skills.csv order, as the original extractor did
+OVERLAPPING_CASES = [
+    ('MySQL and PostgreSQL, some NoSQL', ['SQL', 'PostgreSQL', 'MySQL', 'NoSQL']),
+    ('JavaScript only', ['Java', 'JavaScript']),
+    ('AutoCAD drafting', ['AutoCAD']),
+    ('Google Cloud', ['Google Cloud']),
+    ('Vue.js, React.js', ['JavaScript', 'React', 'Vue.js']),
+    ('Express.js', ['JavaScript', 'Express.js']),
+    ('Scikit-learn/PyTorch', ['PyTorch', 'Scikit-learn'])
+]
+# Skills next to punctuation, inside longer words or without separators
+BOUNDARY_CASES = [
+    ('Languages: C++, Python.', ['Python']),
+    ('(Node.js)', ['JavaScript', 'Node.js']),
+    ('CI/CD; Docker!', ['Docker', 'CI/CD']),
+    ('Skills:Python,SQL', ['Python', 'SQL']),
+    ('-java-', ['Java']),
+    ('"Go"', ['Go']),
+    ('python3', ['Python']),
+    ('rusty', ['Rust']),
+    ('Email campaigns', []),
+    ('e-commerce and ASP.NET', ['ASP.NET', 'E-commerce'])
+]
+
+SKILL_PATTERNS = {
+    'javascript': ['js', 'javascript', 'node.js', 'nodejs'],
+    'c++': ['c++', 'cpp', 'c plus plus'],
+    'c#': ['c#', 'csharp', 'c sharp'],
+    'python': ['python', 'py'],
+    'java': ['java', 'openjdk'],
+    'react': ['react', 'reactjs', 'react.js'],
+    'angular': ['angular', 'angularjs'],
+    'vue': ['vue', 'vuejs', 'vue.js'],
+    'sql': ['sql', 'mysql', 'postgresql', 'sqlite']
+}
+SKILL_ABBREVIATIONS = {
+    'machine learning': ['ml', 'machine learning'],
+    'artificial intelligence': ['ai', 'artificial intelligence'],
+    'user interface': ['ui', 'user interface'],
+    'user experience': ['ux', 'user experience'],
+    'application programming interface': ['api', 'apis'],
+    'hyper text markup language': ['html', 'html5'],
+    'cascading style sheets': ['css', 'css3'],
+    'structured query language': ['sql'],
+    'representational state transfer': ['rest', 'restful']
+}
+
+
+def _reference_extract_skills(text, skills_df):
+    """The original extractor: every skill tested with its own regexes and token scan"""
+    skills_found = []
+    text_lower = text.lower()
+    tokens = re.split(r'[,;|\n\t\s•·▪▫◦⁃‣⁌⁍]+', text_lower)
+    tokens = [token.strip(string.punctuation + ' ') for token in tokens if token.strip()]
+    text_no_punctuation = re.sub(r'[^\w\s]', ' ', text_lower)
+    text_cleaned = ' '.join(text_no_punctuation.split())
+
+    for skill in skills_df['Skill'].tolist():
+        skill_lower = skill.lower().strip()
+        if not skill_lower:
+            continue
+        skill_found = False
+        if re.search(r'\b' + re.escape(skill_lower) + r'\b', text_cleaned):
+            skill_found = True
+        skill_words = skill_lower.replace('-', ' ').replace('_', ' ').split()
+        if len(skill_words) > 1 and all(word in text_cleaned for word in skill_words):
+            skill_found = True
+        for token in tokens:
+            if skill_lower == token or (len(skill_lower) > 3 and skill_lower in token):
+                skill_found = True
+                break
+        for pattern in SKILL_PATTERNS.get(skill_lower, ()):
+            if re.search(r'\b' + re.escape(pattern) + r'\b', text_cleaned):
+                skill_found = True
+                break
+        for abbreviation in SKILL_ABBREVIATIONS.get(skill_lower, ()):
+            if re.search(r'\b' + re.escape(abbreviation) + r'\b', text_cleaned):
+                skill_found = True
+                break
+        if skill_found and skill not in skills_found:
+            skills_found.append(skill)
+    return skills_found
+
+
+def _sample_texts(skills):
+    rng = random.Random(3)
+    pieces = skills + VARIANTS
+    texts = ['', 'no skills here']
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for name in DOCUMENTS:
+        path = os.path.join(repo_root, name)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                texts.append(f.read())
+    for _ in range(N_TEXTS):
+        texts.append(''.join(
+            rng.choice(pieces) + rng.choice(SEPARATORS) for _ in range(rng.randint(0, 80))
+        ))
+    return texts
+
+
+@pytest.fixture(scope='module')
+def sample_texts(skills_df):
+    return _sample_texts(skills_df['Skill'].dropna().tolist())
+
+
+def test_extract_skills_matches_reference_extractor(sample_texts, skills_df):
+    for text in sample_texts:
+        assert extract_skills(text, skills_df) == _reference_extract_skills(text, skills_df), text[:200]
+
+
+@pytest.mark.parametrize('text, expected', OVERLAPPING_CASES + BOUNDARY_CASES)
+def test_extract_skills_overlaps_and_boundaries(text, expected, skills_df):
+    found = extract_skills(text, skills_df)
+    assert found == expected
+    assert found == _reference_extract_skills(text, skills_df)
+
+
+def test_extract_skills_finds_aliases(skills_df):
+    found = extract_skills('Built REST APIs in nodejs and MySQL; some ML with py', skills_df)
+    assert found == _reference_extract_skills('Built REST APIs in nodejs and MySQL; some ML with py', skills_df)
+    assert {'Python', 'SQL'} <= set(found)
@@ -0,0 +1,141 @@
+"""
+Structured, non-blocking logging.
+
+Modules log through logging.getLogger(__name__) with lazy %-style
+arguments, so a disabled level costs a single level check. configure_logging
+puts a queue handler on the root logger: request threads only enqueue
+records, and a listener thread formats them (one JSON object per line by
+default) and writes them to stderr. Levels are set globally with LOG_LEVEL
+and per module with LOG_LEVELS, e.g.
+LOG_LEVELS="models.recommender=DEBUG,services.catalog_store=WARNING".
+
+Messages that can fire once per posting go through log_sampled, which lets
+through at most SAMPLED_LOG_LIMIT per call site and SAMPLED_LOG_INTERVAL
+seconds and reports how many were suppressed in between.
+"""
+import atexit
+import copy
+import datetime
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# Messages let through per call site and interval by log_sampled
+SAMPLED_LOG_LIMIT = 5
+SAMPLED_LOG_INTERVAL = 60.0
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+_configure_lock = threading.Lock()
+
+_sample_state = {}
+_sample_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, extra fields and exception"""
+    def format(self, record):
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    """Enqueues records with their message rendered, keeping extra fields and the traceback apart"""
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _parse_levels(spec):
+    """'a.b=DEBUG,c=WARNING' -> {'a.b': 'DEBUG', 'c': 'WARNING'}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level=None, module_levels=None, json_format=None):
+    """
+    Route every log record through a background queue listener (once per process).
+
+    Args:
+        level (str): Root level (LOG_LEVEL, default INFO)
+        module_levels (dict): Logger name -> level (LOG_LEVELS)
+        json_format (bool): JSON lines, or plain text (LOG_FORMAT=text)
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return
+        level = level or os.environ.get('LOG_LEVEL', 'INFO')
+        if module_levels is None:
+            module_levels = _parse_levels(os.environ.get('LOG_LEVELS'))
+        if json_format is None:
+            json_format = os.environ.get('LOG_FORMAT', 'json').lower() != 'text'
+
+        output = logging.StreamHandler()
+        output.setFormatter(JsonFormatter() if json_format else
+                            logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        records = queue.SimpleQueue()
+        _listener = QueueListener(records, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        root = logging.getLogger()
+        root.handlers = [_QueueHandler(records)]
+        root.setLevel(level.upper())
+        # Forked workers (resume parsing, bulk matching) have no listener thread: they write directly
+        os.register_at_fork(after_in_child=lambda: setattr(root, 'handlers', [output]))
+        for name, module_level in module_levels.items():
+            logging.getLogger(name).setLevel(module_level)
+
+
+def log_sampled(logger, level, key, msg, *args):
+    """
+    Log at most SAMPLED_LOG_LIMIT messages per key and SAMPLED_LOG_INTERVAL seconds.
+
+    The first message after a quiet period carries the number of messages
+    suppressed before it in its 'suppressed' field.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    now = time.monotonic()
+    with _sample_lock:
+        state = _sample_state.get(key)
+        suppressed = 0
+        if state is None or now - state[0] >= SAMPLED_LOG_INTERVAL:
+            suppressed = state[2] if state is not None else 0
+            state = _sample_state[key] = [now, 0, 0]
+        if state[1] >= SAMPLED_LOG_LIMIT:
+            state[2] += 1
+            return
+        state[1] += 1
+    extra = {'sample_key': key}
+    if suppressed:
+        extra['suppressed'] = suppressed
+    logger.log(level, msg, *args, extra=extra)
@@ -0,0 +1,179 @@
+"""
+Lightweight in-process metrics for the request hot path.
+
+Stages are timed with time.perf_counter and recorded in fixed log-scale
+histograms: an observation is one bucket increment, nothing is stored per
+request, so the instrumentation can stay on in production. render writes
+the Prometheus text format, with each histogram exposed as a summary
+(p50/p95/p99, _sum and _count per stage) plus the counters and gauges passed
+in. Quantiles are bucket upper bounds, within one bucket (about 19%) of the
+exact value.
+
+Work done in worker processes is captured there with capture() and
+replayed into the web process's registry with replay().
+"""
+import math
+import threading
+import time
+
+# Histogram resolution: buckets per doubling of the value
+BUCKETS_PER_DOUBLING = 4
+
+# Quantiles exposed for every histogram
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Prefix of every exposed metric
+METRIC_PREFIX = 'internship_recommender_'
+
+# Histograms: name -> (help text, smallest and largest distinguished values)
+HISTOGRAMS = {
+    'stage_seconds': ('Latency of each stage of the recommendation and resume pipelines', 1e-5, 100.0),
+    'postings_scored': ('Postings scored per recommendation request', 1.0, 1e7)
+}
+
+
+class Histogram:
+    """Counts of observations in log-scale buckets between min_value and max_value"""
+    def __init__(self, min_value, max_value):
+        self.min_value = min_value
+        self.size = int(math.ceil(math.log2(max_value / min_value) * BUCKETS_PER_DOUBLING)) + 1
+        self.counts = [0] * (self.size + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        if value <= self.min_value:
+            bucket = 0
+        else:
+            bucket = min(self.size, int(math.ceil(math.log2(value / self.min_value) * BUCKETS_PER_DOUBLING)))
+        with self._lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (capped at the largest value seen)"""
+        with self._lock:
+            if not self.count:
+                return float('nan')
+            target = q * self.count
+            seen = 0
+            for bucket, count in enumerate(self.counts):
+                seen += count
+                if seen >= target and count:
+                    return min(self.min_value * 2 ** (bucket / BUCKETS_PER_DOUBLING), self.max)
+            return self.max
+
+
+class _Timer:
+    """Context manager recording its duration under a stage"""
+    __slots__ = ('metrics', 'stage', 'start')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe('stage_seconds', time.perf_counter() - self.start, self.stage)
+        return False
+
+
+class Metrics:
+    """Registry of labelled histograms and counters"""
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def timer(self, stage):
+        """with METRICS.timer('scoring'): ... records the block's duration"""
+        return _Timer(self, stage)
+
+    def observe(self, name, value, stage):
+        """Record one observation of a histogram from HISTOGRAMS"""
+        captured = getattr(self._local, 'captured', None)
+        if captured is not None:
+            captured.append((name, value, stage))
+            return
+        histogram = self._histograms.get((name, stage))
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.get((name, stage))
+                if histogram is None:
+                    _, min_value, max_value = HISTOGRAMS[name]
+                    histogram = self._histograms[(name, stage)] = Histogram(min_value, max_value)
+        histogram.observe(value)
+
+    def increment(self, name, value=1):
+        """Add to a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def capture(self):
+        """
+        Collect the observations made by this thread until stop_capture,
+        instead of recording them (they are meant to be replayed elsewhere).
+
+        Returns:
+            list: (name, value, stage) tuples, filled as observations are made
+        """
+        self._local.captured = []
+        return self._local.captured
+
+    def stop_capture(self):
+        self._local.captured = None
+
+    def replay(self, observations):
+        """Record observations captured in another process"""
+        for name, value, stage in observations:
+            self.observe(name, value, stage)
+
+    def render(self, gauges=()):
+        """
+        Prometheus text exposition of every metric.
+
+        Args:
+            gauges (list): Extra (name, type, help, value) samples, e.g. cache
+                           counters and the catalog version, read at scrape time
+        """
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        rendered = set()
+        for (name, stage), histogram in histograms:
+            metric = METRIC_PREFIX + name
+            if name not in rendered:
+                rendered.add(name)
+                lines.append(f'# HELP {metric} {HISTOGRAMS[name][0]}')
+                lines.append(f'# TYPE {metric} summary')
+            for q in QUANTILES:
+                lines.append(f'{metric}{{stage="{stage}",quantile="{q}"}} {histogram.quantile(q):.6g}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram.sum:.6g}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {histogram.count}')
+
+        for name, value in counters:
+            metric = METRIC_PREFIX + name
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+
+        for name, kind, help_text, value in gauges:
+            metric = METRIC_PREFIX + name
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} {kind}')
+            lines.append(f'{metric} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+# Shared registry of the process
+METRICS = Metrics()
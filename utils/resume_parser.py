@@ -1,7 +1,15 @@
 import pandas as pd
+import io
+import logging
 import re
 import os
+import string
 import warnings
+from functools import lru_cache
+from utils.skill_matcher import SkillMatcher
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
 
 # Handle potential missing dependencies gracefully
 try:
@@ -48,88 +56,115 @@ spacy_available = False
 nlp = None
 warnings.warn("Advanced NLP features disabled. Named Entity Recognition will not be available.")
 
+def _as_stream(source):
+    """Paths and file-like objects are passed through, byte buffers wrapped in memory"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
 def extract_text_from_pdf(pdf_path):
     """
     Extract text from a PDF file using the best available method.
     First tries pdfplumber (more reliable), then falls back to PyPDF2.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path (str, bytes or file-like): Path to the PDF file, its content,
+                                            or a seekable binary stream
         
     Returns:
         str: Extracted text from the PDF
     """
     text = ""
+    source = _as_stream(pdf_path)
     
     # Try pdfplumber first (more reliable)
     if pdfplumber_available:
         try:
             import pdfplumber
-            with pdfplumber.open(pdf_path) as pdf:
+            with pdfplumber.open(source) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
                     if page_text:
                         text += page_text + "\n"
-            print(f"Successfully extracted text using pdfplumber: {len(text)} characters")
+            logger.debug("Successfully extracted text using pdfplumber: %d characters", len(text))
             return text
         except Exception as e:
-            print(f"Error with pdfplumber, falling back to PyPDF2: {e}")
+            logger.warning("Error with pdfplumber, falling back to PyPDF2: %s", e)
     
     # Fallback to PyPDF2
     if PyPDF2 is None:
-        print("No PDF parsing libraries available.")
+        logger.error("No PDF parsing libraries available.")
         return text
         
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(pdf_reader.pages)):
-                page_text = pdf_reader.pages[page_num].extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        print(f"Successfully extracted text using PyPDF2: {len(text)} characters")
+        if isinstance(source, str):
+            with open(source, 'rb') as file:
+                text += _extract_text_with_pypdf2(file)
+        else:
+            # Rewind what pdfplumber may have consumed
+            source.seek(0)
+            text += _extract_text_with_pypdf2(source)
+        logger.debug("Successfully extracted text using PyPDF2: %d characters", len(text))
     except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
+        logger.warning("Error extracting text from PDF: %s", e)
     
     return text
 
+def _extract_text_with_pypdf2(file):
+    text = ""
+    pdf_reader = PyPDF2.PdfReader(file)
+    for page_num in range(len(pdf_reader.pages)):
+        page_text = pdf_reader.pages[page_num].extract_text()
+        if page_text:
+            text += page_text + "\n"
+    return text
+
 def extract_text_from_docx(docx_path):
-    """Extract text from a DOCX file"""
+    """Extract text from a DOCX file (a path, its content or a seekable binary stream)"""
     text = ""
     if docx is None:
-        print("python-docx is not installed. Cannot extract text from DOCX.")
+        logger.error("python-docx is not installed. Cannot extract text from DOCX.")
         return text
         
     try:
-        doc = docx.Document(docx_path)
+        doc = docx.Document(_as_stream(docx_path))
         for paragraph in doc.paragraphs:
             text += paragraph.text + "\n"
     except Exception as e:
-        print(f"Error extracting text from DOCX: {e}")
+        logger.warning("Error extracting text from DOCX: %s", e)
     return text
 
-def extract_text_from_resume(file_path):
-    """Extract text from resume based on file extension"""
-    if file_path.endswith('.pdf'):
+def extract_text_from_resume(file_path, filename=None):
+    """
+    Extract text from resume based on file extension.
+    
+    file_path may also be the content of the file or a binary stream, parsed
+    in memory; the extension is then taken from filename (or the stream's name).
+    """
+    name = filename or (file_path if isinstance(file_path, str) else getattr(file_path, 'name', None)) or ''
+    name = str(name).lower()
+    if name.endswith('.pdf'):
         return extract_text_from_pdf(file_path)
-    elif file_path.endswith('.docx'):
+    elif name.endswith('.docx'):
         return extract_text_from_docx(file_path)
     else:
         return ""
 
+@lru_cache(maxsize=8)
+def _get_skill_matcher(skills):
+    """Build the skill automaton once per distinct skills list"""
+    return SkillMatcher(skills)
+
 def extract_skills(text, skills_df):
     """Enhanced skill extraction from text using the skills database with advanced matching"""
-    skills_found = []
-    
-    # Convert skills dataframe to a list of all skills
-    all_skills = skills_df['Skill'].tolist()
+    # The automaton over all skills, aliases and abbreviations is built once
+    matcher = _get_skill_matcher(tuple(skills_df['Skill'].tolist()))
     
     # Clean and prepare the text
     text_lower = text.lower()
     
     # Tokenize the text more comprehensively
     # Split by common delimiters and clean tokens
-    import string
     tokens = re.split(r'[,;|\n\t\s•·▪▫◦⁃‣⁌⁍]+', text_lower)
     tokens = [token.strip(string.punctuation + ' ') for token in tokens if token.strip()]
     
@@ -137,84 +172,8 @@ def extract_skills(text, skills_df):
     text_no_punctuation = re.sub(r'[^\w\s]', ' ', text_lower)
     text_cleaned = ' '.join(text_no_punctuation.split())
     
-    # Check for each skill in the text using multiple methods
-    for skill in all_skills:
-        skill_lower = skill.lower().strip()
-        if not skill_lower:
-            continue
-            
-        try:
-            skill_found = False
-            
-            # Method 1: Exact word boundary matching
-            if re.search(r'\b' + re.escape(skill_lower) + r'\b', text_cleaned):
-                skill_found = True
-            
-            # Method 2: Check for skill variations (remove common connectors)
-            skill_words = skill_lower.replace('-', ' ').replace('_', ' ').split()
-            if len(skill_words) > 1:
-                # Check if all words of multi-word skill are present
-                if all(word in text_cleaned for word in skill_words):
-                    skill_found = True
-            
-            # Method 3: Check in individual tokens for partial matches
-            for token in tokens:
-                if skill_lower == token or (len(skill_lower) > 3 and skill_lower in token):
-                    skill_found = True
-                    break
-            
-            # Method 4: Handle common programming languages and frameworks
-            skill_patterns = {
-                'javascript': ['js', 'javascript', 'node.js', 'nodejs'],
-                'c++': ['c++', 'cpp', 'c plus plus'],
-                'c#': ['c#', 'csharp', 'c sharp'],
-                'python': ['python', 'py'],
-                'java': ['java', 'openjdk'],
-                'react': ['react', 'reactjs', 'react.js'],
-                'angular': ['angular', 'angularjs'],
-                'vue': ['vue', 'vuejs', 'vue.js'],
-                'sql': ['sql', 'mysql', 'postgresql', 'sqlite']
-            }
-            
-            if skill_lower in skill_patterns:
-                for pattern in skill_patterns[skill_lower]:
-                    if re.search(r'\b' + re.escape(pattern) + r'\b', text_cleaned):
-                        skill_found = True
-                        break
-            
-            # Method 5: Common skill abbreviations and acronyms
-            skill_abbreviations = {
-                'machine learning': ['ml', 'machine learning'],
-                'artificial intelligence': ['ai', 'artificial intelligence'],
-                'user interface': ['ui', 'user interface'],
-                'user experience': ['ux', 'user experience'],
-                'application programming interface': ['api', 'apis'],
-                'hyper text markup language': ['html', 'html5'],
-                'cascading style sheets': ['css', 'css3'],
-                'structured query language': ['sql'],
-                'representational state transfer': ['rest', 'restful']
-            }
-            
-            if skill_lower in skill_abbreviations:
-                for abbrev in skill_abbreviations[skill_lower]:
-                    if re.search(r'\b' + re.escape(abbrev) + r'\b', text_cleaned):
-                        skill_found = True
-                        break
-            
-            if skill_found and skill not in skills_found:
-                skills_found.append(skill)
-                
-        except Exception as e:
-            print(f"Error processing skill '{skill}': {e}")
-            continue
-    
-    # Remove duplicates while preserving order
-    unique_skills = []
-    for skill in skills_found:
-        if skill not in unique_skills:
-            unique_skills.append(skill)
-    
-    return unique_skills
+    # Find every skill in one pass over the cleaned text and one over the tokens
+    return matcher.extract(text_cleaned, tokens)
 
 def extract_education(text, education_df):
     """Enhanced education information extraction from text"""
@@ -323,14 +282,20 @@ def extract_location(text, locations_df):
     
     return unique_locations
 
-def parse_resume(file_path, skills_df, education_df, locations_df):
-    """Parse a resume and extract relevant information"""
+def parse_resume(file_path, skills_df, education_df, locations_df, filename=None):
+    """
+    Parse a resume and extract relevant information.
+    
+    file_path is a path, the content of the file or a binary stream; for the
+    last two, filename gives the extension that selects the parser.
+    """
     try:
         # Extract text from resume
-        text = extract_text_from_resume(file_path)
+        with METRICS.timer('text_extraction'):
+            text = extract_text_from_resume(file_path, filename)
         
         if not text:
-            print("Warning: No text extracted from resume")
+            logger.warning("No text extracted from resume")
             return {
                 'skills': [],
                 'education': [],
@@ -340,21 +305,24 @@ def parse_resume(file_path, skills_df, education_df, locations_df):
         
         # Extract skills, education, and location
         try:
-            skills = extract_skills(text, skills_df)
+            with METRICS.timer('skill_extraction'):
+                skills = extract_skills(text, skills_df)
         except Exception as e:
-            print(f"Error extracting skills: {e}")
+            logger.exception("Error extracting skills: %s", e)
             skills = []
             
         try:
-            education = extract_education(text, education_df)
+            with METRICS.timer('education_extraction'):
+                education = extract_education(text, education_df)
         except Exception as e:
-            print(f"Error extracting education: {e}")
+            logger.exception("Error extracting education: %s", e)
             education = []
             
         try:
-            locations = extract_location(text, locations_df)
+            with METRICS.timer('location_extraction'):
+                locations = extract_location(text, locations_df)
         except Exception as e:
-            print(f"Error extracting locations: {e}")
+            logger.exception("Error extracting locations: %s", e)
             locations = []
         
         return {
@@ -365,7 +333,7 @@ def parse_resume(file_path, skills_df, education_df, locations_df):
         }
         
     except Exception as e:
-        print(f"Error parsing resume: {e}")
+        logger.exception("Error parsing resume: %s", e)
         return {
             'skills': [],
             'education': [],
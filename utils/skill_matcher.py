@@ -0,0 +1,192 @@
+"""
+Multi-pattern skill matching for resume parsing.
+
+An Aho-Corasick automaton is built once over every skill in skills.csv, every
+word of multi-word skills, and the known aliases and abbreviations. Resume
+text is then scanned in linear time instead of running one regex (and one
+token loop) per skill. The matching rules are the same as the original
+per-skill checks in utils.resume_parser.extract_skills.
+"""
+import re
+from collections import deque
+
+# Common programming languages and frameworks with their written variations
+SKILL_PATTERNS = {
+    'javascript': ['js', 'javascript', 'node.js', 'nodejs'],
+    'c++': ['c++', 'cpp', 'c plus plus'],
+    'c#': ['c#', 'csharp', 'c sharp'],
+    'python': ['python', 'py'],
+    'java': ['java', 'openjdk'],
+    'react': ['react', 'reactjs', 'react.js'],
+    'angular': ['angular', 'angularjs'],
+    'vue': ['vue', 'vuejs', 'vue.js'],
+    'sql': ['sql', 'mysql', 'postgresql', 'sqlite']
+}
+
+# Common skill abbreviations and acronyms
+SKILL_ABBREVIATIONS = {
+    'machine learning': ['ml', 'machine learning'],
+    'artificial intelligence': ['ai', 'artificial intelligence'],
+    'user interface': ['ui', 'user interface'],
+    'user experience': ['ux', 'user experience'],
+    'application programming interface': ['api', 'apis'],
+    'hyper text markup language': ['html', 'html5'],
+    'cascading style sheets': ['css', 'css3'],
+    'structured query language': ['sql'],
+    'representational state transfer': ['rest', 'restful']
+}
+
+# A pattern can only match on word boundaries of the cleaned text if it is
+# made of word characters separated by single spaces
+_CLEANED_TEXT_PATTERN = re.compile(r'\w+( \w+)*')
+
+# Separator used to scan all tokens in one pass; tokens never contain it
+_TOKEN_SEPARATOR = '\n'
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a fixed list of string patterns.
+
+    Args:
+        patterns (list): Patterns to search for; the position in the list is the pattern id
+    """
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._outputs = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._outputs.append([])
+                node = next_node
+            self._outputs[node].append(pattern_id)
+
+        # Breadth-first pass to compute failure links and merge suffix outputs
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def iter_matches(self, text):
+        """
+        Yield (start, end, pattern_id) for every occurrence of every pattern,
+        overlapping occurrences included. end is exclusive.
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        patterns = self.patterns
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern_id in outputs[node]:
+                yield position + 1 - len(patterns[pattern_id]), position + 1, pattern_id
+
+
+class SkillMatcher:
+    """
+    Precompiled skill extractor built from the skills dataframe.
+
+    Args:
+        skills (list): Skill names in the order of skills.csv
+    """
+    def __init__(self, skills):
+        self.skills = list(skills)
+        self._pattern_ids = {}
+
+        # (skill, lowercased skill, skill pattern id, word pattern ids, alias pattern ids) per skill
+        self._rules = []
+        for skill in self.skills:
+            if not isinstance(skill, str):
+                continue
+            skill_lower = skill.lower().strip()
+            if not skill_lower:
+                continue
+
+            skill_words = skill_lower.replace('-', ' ').replace('_', ' ').split()
+            word_ids = [self._add_pattern(word) for word in skill_words] if len(skill_words) > 1 else []
+            aliases = SKILL_PATTERNS.get(skill_lower, []) + SKILL_ABBREVIATIONS.get(skill_lower, [])
+            alias_ids = [self._add_pattern(alias) for alias in aliases]
+            self._rules.append((skill, skill_lower, self._add_pattern(skill_lower), word_ids, alias_ids))
+
+        self._patterns = sorted(self._pattern_ids, key=self._pattern_ids.get)
+        self._boundary_eligible = [bool(_CLEANED_TEXT_PATTERN.fullmatch(pattern)) for pattern in self._patterns]
+        self.automaton = AhoCorasick(self._patterns)
+
+    def _add_pattern(self, pattern):
+        return self._pattern_ids.setdefault(pattern, len(self._pattern_ids))
+
+    def _scan_cleaned_text(self, text_cleaned):
+        """Return (pattern ids found anywhere, pattern ids found on word boundaries)"""
+        present = set()
+        bounded = set()
+        length = len(text_cleaned)
+        for start, end, pattern_id in self.automaton.iter_matches(text_cleaned):
+            present.add(pattern_id)
+            if pattern_id in bounded or not self._boundary_eligible[pattern_id]:
+                continue
+            # The cleaned text only holds word characters and single spaces
+            if (start == 0 or text_cleaned[start - 1] == ' ') and (end == length or text_cleaned[end] == ' '):
+                bounded.add(pattern_id)
+        return present, bounded
+
+    def _scan_tokens(self, tokens):
+        """Return (pattern ids found inside a token, pattern ids equal to a whole token)"""
+        joined = _TOKEN_SEPARATOR.join(tokens)
+        length = len(joined)
+        inside = set()
+        whole = set()
+        for start, end, pattern_id in self.automaton.iter_matches(joined):
+            inside.add(pattern_id)
+            if (start == 0 or joined[start - 1] == _TOKEN_SEPARATOR) and \
+               (end == length or joined[end] == _TOKEN_SEPARATOR):
+                whole.add(pattern_id)
+        return inside, whole
+
+    def extract(self, text_cleaned, tokens):
+        """
+        Find skills in a resume.
+
+        Args:
+            text_cleaned (str): Lowercased text with punctuation replaced and whitespace collapsed
+            tokens (list): Lowercased tokens with surrounding punctuation stripped
+
+        Returns:
+            list: Matching skills in skills.csv order, without duplicates
+        """
+        present, bounded = self._scan_cleaned_text(text_cleaned)
+        inside_token, whole_token = self._scan_tokens(tokens)
+
+        skills_found = []
+        seen = set()
+        for skill, skill_lower, skill_id, word_ids, alias_ids in self._rules:
+            if skill in seen:
+                continue
+            # Method 1: Exact word boundary matching
+            # Method 2: All words of a multi-word skill are present
+            # Method 3: Token equality, or substring of a token for longer skills
+            # Methods 4 and 5: Known variations and abbreviations on word boundaries
+            if skill_id in bounded or \
+               (word_ids and all(word_id in present for word_id in word_ids)) or \
+               skill_id in whole_token or \
+               (len(skill_lower) > 3 and skill_id in inside_token) or \
+               any(alias_id in bounded for alias_id in alias_ids):
+                skills_found.append(skill)
+                seen.add(skill)
+        return skills_found